@@ -0,0 +1 @@
+"""Бенчмарки анализатора и генераторов на синтетических репозиториях."""
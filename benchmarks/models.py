@@ -0,0 +1,98 @@
+"""Бенчмарк создания моделей зависимостей.
+
+Сравнивает способы собрать ``Dependencies`` с большим списком ``libs``:
+``Lib(...)`` на каждую зависимость, ``Lib.model_construct`` и
+``libs_from`` — одну валидацию всего списка, которой пользуются
+анализаторы. Для каждого способа замеряется время и пик выделенной
+памяти (``tracemalloc``).
+
+Запуск:
+    python -m benchmarks.models
+    python -m benchmarks.models --libs 50000 --repeat 7
+"""
+
+import argparse
+import statistics
+import sys
+import time
+import tracemalloc
+import typing as tp
+
+from larek.models import Dependencies, Lib, libs_from
+
+Parsed = list[tuple[str, tp.Optional[str]]]
+
+STRATEGIES: dict[str, tp.Callable[[Parsed], list[Lib]]] = {
+    "validate": lambda parsed: [Lib(name=n, version=v) for n, v in parsed],
+    "model_construct": lambda parsed: [
+        Lib.model_construct(name=n, version=v) for n, v in parsed
+    ],
+    "libs_from": libs_from,
+}
+
+
+def _parsed(count: int) -> Parsed:
+    """Name/version pairs as a manifest parser would produce them."""
+    return [
+        (f"org.example.group{i % 97}:artifact-{i}", None if i % 5 == 0 else f"1.{i}.0")
+        for i in range(count)
+    ]
+
+
+def _build(make: tp.Callable[[Parsed], list[Lib]], parsed: Parsed) -> Dependencies:
+    # Lib instances pass Dependencies validation as they are, without a copy
+    return Dependencies(packet_manager="maven", libs=make(parsed))
+
+
+def _peak(fn: tp.Callable[[], tp.Any]) -> int:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(count: int, repeat: int) -> list[dict[str, tp.Any]]:
+    parsed = _parsed(count)
+    reference = _build(STRATEGIES["validate"], parsed).model_dump()
+    results = []
+    for strategy, make in STRATEGIES.items():
+        assert _build(make, parsed).model_dump() == reference, strategy
+        runs = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            _build(make, parsed)
+            runs.append(time.perf_counter() - start)
+        results.append(
+            {
+                "strategy": strategy,
+                "libs": count,
+                "min": min(runs),
+                "median": statistics.median(runs),
+                "peak_bytes": _peak(lambda: _build(make, parsed)),
+            }
+        )
+    return results
+
+
+def main(argv: tp.Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Бенчмарк создания моделей larek")
+    parser.add_argument("--libs", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    results = run(args.libs, args.repeat)
+    base = results[0]
+    for r in results:
+        print(
+            f"{r['strategy']:<16} min {r['min'] * 1000:8.2f} ms  "
+            f"median {r['median'] * 1000:8.2f} ms  "
+            f"peak {r['peak_bytes'] / 1024:9.0f} KiB  "
+            f"x{r['median'] / base['median']:.2f} time  "
+            f"x{r['peak_bytes'] / base['peak_bytes']:.2f} memory"
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
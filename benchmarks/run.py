@@ -0,0 +1,189 @@
+"""Запуск бенчмарков на синтетических репозиториях.
+
+Замеряются ``RepoAnalyzer.analyze`` (без кэша и с прогретым кэшем),
+``Composer.get_dockerfile`` для всех сервисов и
+``PipelineComposer.generate_from_schema``. Результаты сохраняются в JSON,
+чтобы сравнивать их между коммитами. Сеть не используется.
+
+Запуск:
+    python -m benchmarks.run
+    python -m benchmarks.run --scale small --scale medium --repeat 5
+    python -m benchmarks.run --baseline benchmarks/results/abc1234.json
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import typing as tp
+from pathlib import Path
+
+from larek.analyzer import go, java, javascript, kotlin, python, repo
+from larek.composer.builder import Composer
+from larek.models import RepoSchema
+from larek.pipeliner.builder import PipelineComposer
+
+from benchmarks.synthetic import SCALES, SHAPES, generate
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def _repo_analyzer(use_cache: bool = False) -> repo.RepoAnalyzer:
+    repo_analyzer = repo.RepoAnalyzer(use_cache=use_cache)
+    repo_analyzer.register_analyzer(go.GoAnalyzer)
+    repo_analyzer.register_analyzer(java.JavaAnalyzer)
+    repo_analyzer.register_analyzer(kotlin.KotlinAnalyzer)
+    repo_analyzer.register_analyzer(javascript.JavaScriptAnalyzer)
+    repo_analyzer.register_analyzer(python.PythonAnalyze)
+    return repo_analyzer
+
+
+def _time(fn: tp.Callable[[], tp.Any], repeat: int) -> list[float]:
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - start)
+    return runs
+
+
+def _dockerfiles(schema: RepoSchema) -> None:
+    composer = Composer()
+    for service in schema.services:
+        try:
+            composer.get_dockerfile(service)
+        except ValueError:
+            # no Dockerfile template for the language (java, kotlin)
+            continue
+
+
+def _pipeline(schema: RepoSchema) -> None:
+    PipelineComposer().generate_from_schema(schema)
+
+
+def _git_revision() -> tp.Optional[str]:
+    try:
+        res = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return res.stdout.strip() or None
+
+
+def run(
+    scales: list[str], shapes: list[str], repeat: int, seed: int
+) -> dict[str, tp.Any]:
+    results = []
+    for scale_name in scales:
+        scale = SCALES[scale_name]
+        for shape in shapes:
+            with tempfile.TemporaryDirectory(prefix=f"larek-bench-{shape}-") as tmp:
+                root = Path(tmp) / "repo"
+                files = generate(root, shape, scale, seed)
+                schema = _repo_analyzer().analyze(root)
+                _repo_analyzer(use_cache=True).analyze(root)  # warm the cache
+
+                targets: dict[str, tp.Callable[[], tp.Any]] = {
+                    "analyze": lambda: _repo_analyzer().analyze(root),
+                    "analyze_warm_cache": lambda: _repo_analyzer(
+                        use_cache=True
+                    ).analyze(root),
+                    "dockerfiles": lambda: _dockerfiles(schema),
+                    "pipeline": lambda: _pipeline(schema),
+                }
+                for target, fn in targets.items():
+                    runs = _time(fn, repeat)
+                    results.append(
+                        {
+                            "scale": scale_name,
+                            "shape": shape,
+                            "target": target,
+                            "files": files,
+                            "services": len(schema.services),
+                            "min": min(runs),
+                            "median": statistics.median(runs),
+                            "runs": runs,
+                        }
+                    )
+                    print(
+                        f"{scale_name:>6} {shape:<15} {target:<19} "
+                        f"min {min(runs) * 1000:9.2f} ms  "
+                        f"median {statistics.median(runs) * 1000:9.2f} ms"
+                    )
+    return {
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare(current: dict[str, tp.Any], baseline: dict[str, tp.Any]) -> None:
+    """Print the median ratio against a baseline run for matching measurements."""
+    key = lambda r: (r["scale"], r["shape"], r["target"])  # noqa: E731
+    base = {key(r): r for r in baseline["results"]}
+    print(f"\nСравнение с {baseline.get('revision') or 'baseline'}:")
+    for result in current["results"]:
+        if (old := base.get(key(result))) is None:
+            continue
+        ratio = result["median"] / old["median"] if old["median"] else float("inf")
+        print(
+            f"{result['scale']:>6} {result['shape']:<15} {result['target']:<19} "
+            f"x{ratio:.2f}"
+        )
+
+
+def main(argv: tp.Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Бенчмарки larek на синтетических репозиториях"
+    )
+    parser.add_argument(
+        "--scale",
+        action="append",
+        choices=sorted(SCALES),
+        help="по умолчанию small и medium",
+    )
+    parser.add_argument(
+        "--shape", action="append", choices=SHAPES, help="по умолчанию все формы"
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help="по умолчанию benchmarks/results/<ревизия>.json",
+    )
+    parser.add_argument(
+        "--baseline", type=Path, help="JSON прошлого запуска для сравнения"
+    )
+    args = parser.parse_args(argv)
+
+    report = run(
+        args.scale or ["small", "medium"],
+        args.shape or list(SHAPES),
+        args.repeat,
+        args.seed,
+    )
+
+    output = args.output or RESULTS_DIR / f"{report['revision'] or 'local'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"\nРезультаты записаны в {output}")
+
+    if args.baseline is not None:
+        compare(report, json.loads(args.baseline.read_text(encoding="utf-8")))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
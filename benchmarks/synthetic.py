@@ -0,0 +1,228 @@
+"""Детерминированный генератор синтетических репозиториев для бенчмарков.
+
+Формы репозиториев:
+
+* ``polyglot`` — N сервисов на разных языках в корне монорепозитория;
+* ``deep`` — те же сервисы, вложенные на несколько уровней
+  (``group0/domain1/svc2``);
+* ``huge_manifests`` — JS и Java сервисы с огромными ``package.json`` и
+  ``pom.xml``;
+* ``python_heavy`` — один Python-проект с большим числом ``.py`` файлов.
+
+Одинаковые параметры и ``seed`` всегда дают одно и то же дерево.
+"""
+
+import json
+import random
+import typing as tp
+from dataclasses import dataclass
+from pathlib import Path
+
+LANGUAGES = ("go", "python", "javascript", "java", "kotlin")
+SHAPES = ("polyglot", "deep", "huge_manifests", "python_heavy")
+
+
+@dataclass(frozen=True)
+class Scale:
+    name: str
+    services: int
+    files: int  # source files per service
+    deps: int  # dependencies per manifest
+    huge_deps: int  # dependencies per manifest for huge_manifests
+
+
+SCALES = {
+    "small": Scale("small", services=4, files=20, deps=20, huge_deps=500),
+    "medium": Scale("medium", services=16, files=100, deps=50, huge_deps=5000),
+    "large": Scale("large", services=64, files=300, deps=100, huge_deps=20000),
+}
+
+
+def _write(path: Path, content: str) -> int:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+    return 1
+
+
+def _name(rng: random.Random, prefix: str) -> str:
+    return f"{prefix}{rng.randrange(10**6):06d}"
+
+
+def _go_service(root: Path, files: int, deps: int, rng: random.Random) -> int:
+    requires = "\n".join(
+        f"\tgithub.com/{_name(rng, 'org')}/{_name(rng, 'lib')} v1.{i % 10}.0"
+        for i in range(deps)
+    )
+    count = _write(
+        root / "go.mod",
+        f"module {root.name}\n\ngo 1.22\n\nrequire (\n{requires}\n)\n",
+    )
+    count += _write(
+        root / "cmd" / root.name / "main.go", "package main\n\nfunc main() {}\n"
+    )
+    for i in range(files):
+        body = "".join(
+            f"func F{j}() int {{ return {j} }}\n" for j in range(rng.randint(5, 40))
+        )
+        count += _write(
+            root / "internal" / f"pkg{i % 8}" / f"file{i}.go",
+            f"package pkg{i % 8}\n\n{body}",
+        )
+    return count
+
+
+def _python_service(root: Path, files: int, deps: int, rng: random.Random) -> int:
+    requirements = "".join(
+        f"{_name(rng, 'pkg')}=={i % 5}.{i % 7}.0\n" for i in range(deps)
+    )
+    count = _write(root / "requirements.txt", requirements)
+    count += _write(
+        root / "app.py",
+        "import sys\n\n\nif __name__ == '__main__':\n    sys.exit(0)\n",
+    )
+    features = (
+        "if (n := len(sys.argv)) > 1:\n    pass\n",
+        "def f(a, /, b):\n    return a\n",
+        "def g(x) -> int | None:\n    return x\n",
+        "match sys.argv:\n    case []:\n        pass\n",
+    )
+    for i in range(files):
+        body = "".join(
+            f"def func_{j}(x):\n    return x * {j}\n\n\n"
+            for j in range(rng.randint(5, 40))
+        )
+        body = "import sys\n\n" + rng.choice(features) + "\n\n" + body
+        count += _write(root / root.name / f"mod_{i % 8}" / f"m{i}.py", body)
+    count += _write(root / "tests" / "test_app.py", "def test_app():\n    assert True\n")
+    return count
+
+
+def _package_json(root: Path, deps: int, rng: random.Random) -> int:
+    package = {
+        "name": root.name,
+        "version": "1.0.0",
+        "engines": {"node": ">=20"},
+        "scripts": {"build": "tsc", "test": "jest", "lint": "eslint ."},
+        "dependencies": {
+            _name(rng, "pkg-"): f"^{i % 10}.{i % 7}.0" for i in range(deps)
+        },
+        "devDependencies": {"typescript": "^5.4.0", "jest": "^29.0.0"},
+    }
+    return _write(root / "package.json", json.dumps(package, indent=2))
+
+
+def _javascript_service(
+    root: Path, files: int, deps: int, rng: random.Random
+) -> int:
+    count = _package_json(root, deps, rng)
+    count += _write(root / "package-lock.json", "{}\n")
+    count += _write(root / "tsconfig.json", '{"compilerOptions": {"strict": true}}\n')
+    count += _write(root / "src" / "index.ts", "export const main = () => 0;\n")
+    for i in range(files):
+        body = "".join(
+            f"export function f{j}(x: number) {{ return x * {j}; }}\n"
+            for j in range(rng.randint(5, 40))
+        )
+        count += _write(root / "src" / f"module{i % 8}" / f"file{i}.ts", body)
+    return count
+
+
+def _pom(root: Path, deps: int, rng: random.Random) -> int:
+    dependencies = "".join(
+        "    <dependency>\n"
+        f"      <groupId>com.{_name(rng, 'org')}</groupId>\n"
+        f"      <artifactId>{_name(rng, 'lib')}</artifactId>\n"
+        f"      <version>{i % 5}.{i % 9}.0</version>\n"
+        "    </dependency>\n"
+        for i in range(deps)
+    )
+    return _write(
+        root / "pom.xml",
+        '<project xmlns="http://maven.apache.org/POM/4.0.0">\n'
+        "  <modelVersion>4.0.0</modelVersion>\n"
+        f"  <artifactId>{root.name}</artifactId>\n"
+        "  <properties>\n    <java.version>17</java.version>\n  </properties>\n"
+        f"  <dependencies>\n{dependencies}  </dependencies>\n</project>\n",
+    )
+
+
+def _java_service(root: Path, files: int, deps: int, rng: random.Random) -> int:
+    count = _pom(root, deps, rng)
+    src = root / "src" / "main" / "java" / "com" / "example"
+    count += _write(
+        src / "Application.java",
+        "package com.example;\n\npublic class Application {\n"
+        "    public static void main(String[] args) {}\n}\n",
+    )
+    for i in range(files):
+        body = "".join(
+            f"    public int m{j}() {{ return {j}; }}\n"
+            for j in range(rng.randint(5, 40))
+        )
+        count += _write(
+            src / f"pkg{i % 8}" / f"C{i}.java",
+            f"package com.example.pkg{i % 8};\n\npublic class C{i} {{\n{body}}}\n",
+        )
+    return count
+
+
+def _kotlin_service(root: Path, files: int, deps: int, rng: random.Random) -> int:
+    libs = "".join(
+        f'    implementation("com.{_name(rng, "org")}:{_name(rng, "lib")}:{i % 5}.0.0")\n'
+        for i in range(deps)
+    )
+    count = _write(
+        root / "build.gradle.kts",
+        'plugins {\n    kotlin("jvm") version "1.9.22"\n}\n\n'
+        "kotlin {\n    jvmToolchain(17)\n}\n\n"
+        f"dependencies {{\n{libs}}}\n",
+    )
+    src = root / "src" / "main" / "kotlin"
+    count += _write(src / "Main.kt", "fun main() {\n    println(\"ok\")\n}\n")
+    for i in range(files):
+        body = "".join(
+            f"fun f{i}_{j}(x: Int) = x * {j}\n" for j in range(rng.randint(5, 40))
+        )
+        count += _write(
+            src / f"pkg{i % 8}" / f"File{i}.kt", f"package pkg{i % 8}\n\n{body}"
+        )
+    return count
+
+
+WRITERS: dict[str, tp.Callable[[Path, int, int, random.Random], int]] = {
+    "go": _go_service,
+    "python": _python_service,
+    "javascript": _javascript_service,
+    "java": _java_service,
+    "kotlin": _kotlin_service,
+}
+
+
+def generate(root: Path, shape: str, scale: Scale, seed: int = 0) -> int:
+    """Generate a repository of the given shape under root and return its file count."""
+    rng = random.Random(f"{shape}:{scale.name}:{seed}")
+    root.mkdir(parents=True, exist_ok=True)
+    count = _write(root / "README.md", f"# {shape} ({scale.name})\n")
+
+    if shape == "python_heavy":
+        files = scale.files * scale.services
+        return count + _python_service(root, files, scale.deps, rng)
+
+    for i in range(scale.services):
+        if shape == "huge_manifests":
+            lang = ("javascript", "java")[i % 2]
+            deps = scale.huge_deps
+        else:
+            lang = LANGUAGES[i % len(LANGUAGES)]
+            deps = scale.deps
+        name = f"svc{i}-{lang}"
+        if shape == "deep":
+            service_root = root / f"group{i % 3}" / f"domain{i % 2}" / name
+        elif shape in ("polyglot", "huge_manifests"):
+            service_root = root / name
+        else:
+            raise ValueError(f"Unknown shape: {shape}")
+        count += WRITERS[lang](service_root, scale.files, deps, rng)
+        if i % 2 == 0:
+            count += _write(service_root / "Dockerfile", "FROM scratch\n")
+    return count
@@ -1,11 +1,36 @@
-import subprocess
-import pandas as pd
+"""Загрузка корпуса репозиториев для оценки анализатора.
+
+Репозитории из датасета (``data/data/*.csv``) клонируются параллельно
+в ``sample/<язык>/<репозиторий>``. Клоны неглубокие (``--depth 1``), без
+истории блобов (``--filter=blob:none``) и только одной ветки, поэтому
+сеть тратится лишь на файлы последнего коммита. Уже склонированные
+репозитории пропускаются, неудачные попытки повторяются, а итог каждого
+репозитория записывается в манифест, так что прерванную загрузку можно
+просто запустить ещё раз.
+
+Запуск:
+    python clone.py
+    python clone.py --lang go --lang python --jobs 16
+"""
+
+import argparse
+import json
 import os
+import shutil
+import subprocess
+import time
+import typing as tp
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+import pandas as pd
 
 MAX_REPO_SIZE = 2000
 MAX_COUNT_REPOS = 100
+CLONE_JOBS = 8
+CLONE_RETRIES = 2
+CLONE_TIMEOUT = 600
+MANIFEST_FILE = Path("sample/manifest.json")
 
 
 repos_path_prefix = Path("data/data/")
@@ -19,6 +44,16 @@ lang_repo = {
     "kotlin": Path("kotlin_repos.csv"),
 }
 
+CLONE_ARGS = [
+    "clone",
+    "--quiet",
+    "--depth",
+    "1",
+    "--filter=blob:none",
+    "--single-branch",
+    "--no-tags",
+]
+
 
 def load_repos(lang: str) -> pd.DataFrame:
     repo_path = repos_path_prefix / lang_repo[lang]
@@ -26,29 +61,174 @@ def load_repos(lang: str) -> pd.DataFrame:
     return df
 
 
-def clone_repo(repo_url: str, target_dir: Path) -> None:
-    repo_name = repo_url.split("/")[-1].replace(".git", "")
-    clone_path = target_dir / repo_name
-    if not clone_path.exists():
-        subprocess.run(["git", "clone", repo_url, str(clone_path)])
-        print(f"Cloned {repo_name} into {clone_path}")
+def select_repos(
+    df: pd.DataFrame, max_size: int = MAX_REPO_SIZE, max_count: int = MAX_COUNT_REPOS
+) -> list[str]:
+    """URLs of the first max_count repositories no larger than max_size.
+
+    Zero disables the corresponding limit.
+    """
+    if max_size:
+        df = df[df["size"] <= max_size]
+    if max_count:
+        df = df.head(max_count)
+    return df["url"].tolist()
+
+
+def repo_name(repo_url: str) -> str:
+    return repo_url.rstrip("/").split("/")[-1].removesuffix(".git")
+
+
+def clone_repo(
+    repo_url: str,
+    target_dir: Path,
+    retries: int = CLONE_RETRIES,
+    backoff: float = 2.0,
+    timeout: float = CLONE_TIMEOUT,
+) -> dict[str, tp.Any]:
+    """Clone one repository into target_dir and describe the outcome.
+
+    The clone goes to a hidden ".<name>.partial" directory that is renamed
+    only on success, so an interrupted run never leaves a half cloned
+    repository that a later run would take as present.
+    """
+    name = repo_name(repo_url)
+    clone_path = target_dir / name
+    result: dict[str, tp.Any] = {"url": repo_url, "path": str(clone_path)}
+    if clone_path.exists():
+        return {**result, "status": "present", "attempts": 0}
+
+    partial = target_dir / f".{name}.partial"
+    started = time.perf_counter()
+    error = ""
+    for attempt in range(1, retries + 2):
+        shutil.rmtree(partial, ignore_errors=True)
+        try:
+            subprocess.run(
+                ["git", *CLONE_ARGS, repo_url, str(partial)],
+                check=True,
+                capture_output=True,
+                text=True,
+                timeout=timeout,
+                env={**os.environ, "GIT_TERMINAL_PROMPT": "0"},
+            )
+        except subprocess.CalledProcessError as e:
+            error = e.stderr.strip() or f"git exited with {e.returncode}"
+        except subprocess.TimeoutExpired:
+            error = f"timed out after {timeout:.0f} s"
+        else:
+            partial.rename(clone_path)
+            return {
+                **result,
+                "status": "cloned",
+                "attempts": attempt,
+                "seconds": time.perf_counter() - started,
+            }
+        if attempt <= retries:
+            time.sleep(backoff * 2 ** (attempt - 1))
+
+    shutil.rmtree(partial, ignore_errors=True)
+    return {
+        **result,
+        "status": "failed",
+        "attempts": retries + 1,
+        "seconds": time.perf_counter() - started,
+        "error": error,
+    }
+
+
+def load_manifest(path: Path) -> dict[str, dict[str, tp.Any]]:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def write_manifest(path: Path, manifest: dict[str, dict[str, tp.Any]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(
+        json.dumps(dict(sorted(manifest.items())), indent=2), encoding="utf-8"
+    )
+    tmp.replace(path)
+
+
+def clone_many(
+    jobs_by_lang: dict[str, list[str]],
+    target_root: Path = Path("sample"),
+    manifest_path: Path = MANIFEST_FILE,
+    jobs: int = CLONE_JOBS,
+    retries: int = CLONE_RETRIES,
+    backoff: float = 2.0,
+) -> dict[str, dict[str, tp.Any]]:
+    """Clone repositories of all languages through one bounded pool.
+
+    The manifest is keyed by "<lang>/<name>" and rewritten after every
+    finished repository.
+    """
+    manifest = load_manifest(manifest_path)
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = {}
+        for lang, urls in jobs_by_lang.items():
+            target_dir = target_root / lang
+            target_dir.mkdir(parents=True, exist_ok=True)
+            for url in urls:
+                future = pool.submit(
+                    clone_repo, url, target_dir, retries=retries, backoff=backoff
+                )
+                futures[future] = f"{lang}/{repo_name(url)}"
+
+        for future in as_completed(futures):
+            key = futures[future]
+            result = future.result()
+            if result["status"] == "present" and key in manifest:
+                continue
+            manifest[key] = result
+            write_manifest(manifest_path, manifest)
+            if result["status"] == "failed":
+                print(f"Failed to clone {key}: {result['error']}")
+            elif result["status"] == "cloned":
+                print(f"Cloned {key} in {result['seconds']:.1f} s")
+    return manifest
 
 
 def main():
-    for lang in lang_repo:
-        repos = load_repos(lang)
-        target_path = Path(f"sample/{lang}")
-        os.makedirs(target_path, exist_ok=True)
-        print(f"Cloning {lang} repositories...")
-        cnt = 0
-        for _, repo in repos.iterrows():
-            if cnt >= MAX_COUNT_REPOS:
-                break
-
-            if repo["size"] <= MAX_REPO_SIZE:
-                cnt += 1
-                repo_url = repo["url"]
-                clone_repo(repo_url, target_path)
+    parser = argparse.ArgumentParser(description="Загрузка корпуса репозиториев")
+    parser.add_argument(
+        "--lang", action="append", choices=sorted(lang_repo), dest="langs"
+    )
+    parser.add_argument("--jobs", "-j", type=int, default=CLONE_JOBS)
+    parser.add_argument("--retries", type=int, default=CLONE_RETRIES)
+    parser.add_argument("--max-size", type=int, default=MAX_REPO_SIZE)
+    parser.add_argument("--max-repos", type=int, default=MAX_COUNT_REPOS)
+    parser.add_argument("--target", type=Path, default=Path("sample"))
+    parser.add_argument("--manifest", type=Path, default=MANIFEST_FILE)
+    args = parser.parse_args()
+
+    jobs_by_lang = {
+        lang: select_repos(load_repos(lang), args.max_size, args.max_repos)
+        for lang in args.langs or lang_repo
+    }
+    print(
+        f"Cloning {sum(map(len, jobs_by_lang.values()))} repositories "
+        f"with {args.jobs} workers..."
+    )
+    started = time.perf_counter()
+    manifest = clone_many(
+        jobs_by_lang,
+        target_root=args.target,
+        manifest_path=args.manifest,
+        jobs=args.jobs,
+        retries=args.retries,
+    )
+
+    counts: dict[str, int] = {}
+    for entry in manifest.values():
+        counts[entry["status"]] = counts.get(entry["status"], 0) + 1
+    print(
+        f"Done in {time.perf_counter() - started:.1f} s: "
+        + ", ".join(f"{status} {n}" for status, n in sorted(counts.items()))
+        + f". Manifest: {args.manifest}"
+    )
 
 
 if __name__ == "__main__":
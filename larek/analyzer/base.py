@@ -4,26 +4,90 @@ import typing as tp
 from abc import ABC, abstractmethod
 from pathlib import Path
 from ..models import Service
+from .cache import AnalysisCache
+from .index import FileIndex, ensure_index, find_repo_root
+from .profiling import AnalysisProfiler, profiled
+from .sniff import ContentSniffer
+
+T = tp.TypeVar("T")
 
 
 class BaseAnalyzer(ABC):
     """Абстрактный базовый класс для шаблонов сервисов"""
 
+    # Shared repository index, set by RepoAnalyzer before analyze() is called.
+    index: tp.Optional[FileIndex] = None
+    # Persistent per-file facts cache, enabled by RepoAnalyzer(use_cache=True).
+    cache: tp.Optional[AnalysisCache] = None
+    # Bounded content reader shared by all analyzers of one RepoAnalyzer run.
+    sniffer: tp.Optional[ContentSniffer] = None
+    # Set by RepoAnalyzer(profile=True); methods marked @profiled report to it.
+    profiler: tp.Optional[AnalysisProfiler] = None
+
+    # Language-specific names skipped on top of the shared IgnoreRules
+    # (build outputs, lockfiles and the like).
+    ignored_dirs: frozenset[str] = frozenset()
+    ignored_files: frozenset[str] = frozenset()
+
+    # File names at the service root that make analyze() worth running.
+    # An empty set means the analyzer cannot be ruled out from a listing.
+    manifests: frozenset[str] = frozenset()
+
+    # Files relative to the service root that pin the dependencies, in order
+    # of preference; the ones present are recorded in Service.lockfiles.
+    lockfiles: tuple[str, ...] = ()
+
+    # Glob patterns of the file names whose content analyze() may open.
+    # RepoAnalyzer.analyze_git writes only these files, and the ones
+    # source_reads() picks, out of git objects; None means any file may be read.
+    reads: tp.Optional[frozenset[str]] = None
+
+    @classmethod
+    def detect(cls, names: tp.AbstractSet[str]) -> bool:
+        """Cheap pre-check on the file names of a directory, before instantiation."""
+        return not cls.manifests or not cls.manifests.isdisjoint(names)
+
     @abstractmethod
     def analyze(self, root: Path) -> tp.Optional[Service]: ...
 
+    def source_reads(self, root: Path) -> tp.Iterable[Path]:
+        """Source files outside reads that analyze(root) may open, from the index."""
+        return ()
+
+    def _file_index(self, root: Path) -> FileIndex:
+        """Return the shared file index, building one for root if it is not covered."""
+        self.index = ensure_index(self.index, root)
+        return self.index
+
+    def _sniffer(self) -> ContentSniffer:
+        if self.sniffer is None:
+            self.sniffer = ContentSniffer()
+        return self.sniffer
+
+    def _cached(self, file: Path, fact: str, compute: tp.Callable[[Path], T]) -> T:
+        """Compute a per-file fact, reusing the persistent cache when it is enabled."""
+        if self.cache is None:
+            return compute(file)
+        return self.cache.get(file, fact, compute)
+
+    @profiled("walk")
+    def _scan(self, root: Path) -> None:
+        """Feed every file under root that passes the filters to _parse_file."""
+        visited = 0
+        for f in self._file_index(root).walk(root, self._dir_filter, self._file_filter):
+            self._parse_file(f)
+            visited += 1
+        if self.profiler is not None:
+            self.profiler.add_files(visited)
+
+    def _file_filter(self, file: Path) -> bool:
+        return file.name not in self.ignored_files
+
+    def _dir_filter(self, directory: Path) -> bool:
+        return directory.name not in self.ignored_dirs
+
+    def _parse_file(self, file: Path) -> None: ...
+
     def _find_repo_root(self, start_path: Path) -> tp.Optional[Path]:
         """Find the repository root by walking up the directory tree looking for .git"""
-        current = start_path if start_path.is_dir() else start_path.parent
-        max_depth = 10
-        depth = 0
-
-        while depth < max_depth:
-            if (current / ".git").exists():
-                return current
-            if current.parent == current:
-                return None
-            current = current.parent
-            depth += 1
-
-        return None
+        return find_repo_root(start_path)
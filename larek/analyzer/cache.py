@@ -0,0 +1,162 @@
+"""Персистентный кэш результатов анализа отдельных файлов."""
+
+import hashlib
+import json
+import os
+import typing as tp
+from pathlib import Path
+
+from larek import models
+
+# Bump whenever analyzer logic changes the meaning of cached facts.
+CACHE_VERSION = 3
+CACHE_DIR = Path(".larek") / "cache"
+CACHE_FILE = "analysis.json"
+
+T = tp.TypeVar("T")
+
+# (size, mtime_ns, sha1 or None)
+Fingerprint = tuple[int, int, tp.Optional[str]]
+
+
+def _encode(value: tp.Any) -> tp.Any:
+    if isinstance(value, models.Lib):
+        return {"__lib__": [value.name, value.version]}
+    if isinstance(value, (list, tuple)):
+        return [_encode(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _encode(v) for k, v in value.items()}
+    return value
+
+
+def _is_lib(value: tp.Any) -> bool:
+    return isinstance(value, dict) and len(value) == 1 and "__lib__" in value
+
+
+def _decode(value: tp.Any) -> tp.Any:
+    if isinstance(value, list):
+        if value and all(_is_lib(v) for v in value):
+            # dependency lists are validated in one call
+            return models.libs_from(tuple(v["__lib__"]) for v in value)
+        return [_decode(v) for v in value]
+    if isinstance(value, dict):
+        if _is_lib(value):
+            name, version = value["__lib__"]
+            return models.Lib(name=name, version=version)
+        return {k: _decode(v) for k, v in value.items()}
+    return value
+
+
+class AnalysisCache:
+    """Кэш фактов о файлах (точка входа, разобранный манифест и т.п.).
+
+    Записи хранятся в ``.larek/cache/analysis.json`` в корне репозитория и
+    привязаны к отпечатку файла: размер, mtime и, опционально, SHA-1
+    содержимого. Повторный анализ разбирает заново только изменившиеся файлы.
+    Директория кэша закрыта собственным ``.gitignore`` и не попадает в git.
+    """
+
+    def __init__(self, root: Path, use_hash: bool = False) -> None:
+        self.root = root
+        self.use_hash = use_hash
+        self.path = root / CACHE_DIR / CACHE_FILE
+        self._entries: dict[str, dict[str, tp.Any]] = {}
+        self._touched: dict[str, dict[str, tp.Any]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, root: Path, use_hash: bool = False) -> "AnalysisCache":
+        """Load the cache stored under root, starting empty if it is missing or stale."""
+        cache = cls(root, use_hash)
+        try:
+            data = json.loads(cache.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return cache
+        if data.get("version") == CACHE_VERSION and isinstance(data.get("files"), dict):
+            cache._entries = data["files"]
+        return cache
+
+    def save(self) -> None:
+        """Persist entries used during this run; entries of vanished files are dropped."""
+        data = {"version": CACHE_VERSION, "files": self._touched}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            ignore = self.path.parent / ".gitignore"
+            if not ignore.exists():
+                ignore.write_text("*\n", encoding="utf-8")
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+    def subset(self, path: Path) -> "AnalysisCache":
+        """Copy of the cache holding only entries below path, for worker processes."""
+        sub = AnalysisCache(self.root, self.use_hash)
+        prefix = self._key(path)
+        if prefix is not None:
+            prefix = "" if prefix == "." else prefix + "/"
+            sub._entries = {
+                k: v for k, v in self._entries.items() if k.startswith(prefix)
+            }
+        return sub
+
+    def touched(self) -> dict[str, dict[str, tp.Any]]:
+        return self._touched
+
+    def merge(self, entries: dict[str, dict[str, tp.Any]]) -> None:
+        """Merge entries produced by a worker process."""
+        self._touched.update(entries)
+        self._entries.update(entries)
+
+    def _key(self, file: Path) -> tp.Optional[str]:
+        try:
+            return Path(file).relative_to(self.root).as_posix()
+        except ValueError:
+            return None
+
+    def _fingerprint(self, file: Path, st: os.stat_result) -> Fingerprint:
+        digest = None
+        if self.use_hash:
+            digest = hashlib.sha1(file.read_bytes()).hexdigest()
+        return (st.st_size, st.st_mtime_ns, digest)
+
+    def _lookup(self, key: str, file: Path) -> dict[str, tp.Any]:
+        """Return the up-to-date entry for file, resetting it when the file changed."""
+        if key in self._touched:
+            return self._touched[key]
+        st = os.stat(file)
+        entry = self._entries.get(key)
+        if entry is not None:
+            size, mtime_ns, digest = entry["fp"]
+            if size == st.st_size and mtime_ns == st.st_mtime_ns:
+                self._touched[key] = entry
+                return entry
+            if self.use_hash and size == st.st_size:
+                fp = self._fingerprint(file, st)
+                if fp[2] == digest:
+                    entry["fp"] = list(fp)
+                    self._touched[key] = entry
+                    return entry
+        entry = {"fp": list(self._fingerprint(file, st)), "facts": {}}
+        self._touched[key] = entry
+        return entry
+
+    def get(self, file: Path, fact: str, compute: tp.Callable[[Path], T]) -> T:
+        """Return the cached fact for file, computing and storing it on a miss."""
+        key = self._key(file)
+        if key is None:
+            return compute(file)
+        try:
+            entry = self._lookup(key, file)
+        except OSError:
+            return compute(file)
+        facts = entry["facts"]
+        if fact in facts:
+            self.hits += 1
+            return _decode(facts[fact])
+        self.misses += 1
+        value = compute(file)
+        facts[fact] = _encode(value)
+        return value
@@ -0,0 +1,264 @@
+"""Чтение дерева коммита из объектов git без рабочей копии."""
+
+import os
+import subprocess
+import typing as tp
+from fnmatch import fnmatchcase
+from pathlib import Path
+
+from .ignore import IGNORE_FILES
+from .index import GITLINK_MODE, FileIndex, _iter_nul_separated
+
+# (mode, object id, path parts) of one ``git ls-tree -r`` record
+TreeEntry = tuple[bytes, bytes, tuple[str, ...]]
+# Returns the content of the requested blobs; unavailable ones are left out.
+BlobFetcher = tp.Callable[[list[bytes]], tp.Mapping[bytes, bytes]]
+# Picks more files that need their content from the index of the laid out tree.
+Selector = tp.Callable[[FileIndex], tp.Iterable[Path]]
+
+
+class GitError(Exception):
+    pass
+
+
+def _git(repo: Path, *args: str, **kwargs: tp.Any) -> subprocess.CompletedProcess:
+    try:
+        return subprocess.run(
+            ["git", "-C", str(repo), *args],
+            capture_output=True,
+            check=True,
+            **kwargs,
+        )
+    except (OSError, subprocess.CalledProcessError) as e:
+        stderr = getattr(e, "stderr", b"") or b""
+        raise GitError(
+            f"git {args[0]}: {os.fsdecode(stderr).strip() or e}"
+        ) from None
+
+
+def list_tree(repo: Path, rev: str) -> list[TreeEntry]:
+    """List every file of rev, recursively, with its mode and object id."""
+    proc = subprocess.Popen(
+        ["git", "-C", str(repo), "ls-tree", "-r", "-z", "--full-tree", rev],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    entries: list[TreeEntry] = []
+    assert proc.stdout is not None and proc.stderr is not None
+    with proc.stdout, proc.stderr:
+        for record in _iter_nul_separated(proc.stdout):
+            meta, _, raw_path = record.partition(b"\t")
+            mode, _, oid = meta.split(b" ")
+            entries.append((mode, oid, tuple(os.fsdecode(raw_path).split("/"))))
+        stderr = proc.stderr.read()
+    if proc.wait() != 0:
+        raise GitError(f"git ls-tree: {os.fsdecode(stderr).strip()}")
+    return entries
+
+
+class GitObjectReader:
+    """Чтение блобов через один долгоживущий процесс ``git cat-file --batch``.
+
+    Процесс запускается при первом чтении и переиспользуется для всех
+    последующих. В частичном клоне (``--filter=blob:none``) недостающие
+    блобы git догружает сам; ``prefetch`` позволяет запросить их у
+    удалённого репозитория одним fetch вместо отдельного запроса на
+    каждый блоб.
+    """
+
+    def __init__(self, repo: Path) -> None:
+        self.repo = repo
+        self.blobs_read = 0
+        self.bytes_read = 0
+        self._proc: tp.Optional[subprocess.Popen] = None
+
+    def __enter__(self) -> "GitObjectReader":
+        return self
+
+    def __exit__(self, *exc: tp.Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._proc is None:
+            return
+        assert self._proc.stdin is not None and self._proc.stdout is not None
+        self._proc.stdin.close()
+        self._proc.stdout.close()
+        self._proc.wait()
+        self._proc = None
+
+    def read(self, oid: bytes) -> tp.Optional[bytes]:
+        """Return the content of a blob, or None when it is not available."""
+        if self._proc is None:
+            self._proc = subprocess.Popen(
+                ["git", "-C", str(self.repo), "cat-file", "--batch"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+            )
+        assert self._proc.stdin is not None and self._proc.stdout is not None
+        self._proc.stdin.write(oid + b"\n")
+        self._proc.stdin.flush()
+        header = self._proc.stdout.readline()
+        if not header:
+            raise GitError(f"git cat-file exited while reading {oid.decode()}")
+        fields = header.split()
+        if len(fields) != 3:
+            # "<oid> missing" or "<oid> ambiguous"
+            return None
+        size = int(fields[2])
+        data = self._proc.stdout.read(size)
+        self._proc.stdout.read(1)  # trailing newline
+        self.blobs_read += 1
+        self.bytes_read += size
+        return data
+
+    def prefetch(self, rev: str, oids: tp.Iterable[bytes]) -> None:
+        """Fetch blobs of rev missing from a partial clone in a single request.
+
+        Does nothing outside partial clones. Failures are ignored: read()
+        still falls back to git's own per-object fetch.
+        """
+        wanted = set(oids)
+        remote = self._promisor_remote() if wanted else None
+        if remote is None:
+            return
+        wanted &= self._missing(rev)
+        if not wanted:
+            return
+        try:
+            _git(
+                self.repo,
+                "-c",
+                "fetch.negotiationAlgorithm=noop",
+                "fetch",
+                remote,
+                "--no-tags",
+                "--no-write-fetch-head",
+                "--recurse-submodules=no",
+                "--filter=blob:none",
+                "--stdin",
+                input=b"\n".join(sorted(wanted)) + b"\n",
+            )
+        except GitError:
+            pass
+
+    def _promisor_remote(self) -> tp.Optional[str]:
+        try:
+            res = _git(self.repo, "config", "--get-regexp", r"^remote\..*\.promisor$")
+        except GitError:
+            return None
+        for line in res.stdout.decode().splitlines():
+            key, _, value = line.partition(" ")
+            if value.strip() == "true":
+                return key[len("remote.") : -len(".promisor")]
+        return None
+
+    def _missing(self, rev: str) -> set[bytes]:
+        # --missing=print lists absent objects of the tree without fetching them
+        res = _git(
+            self.repo, "rev-list", "--objects", "--no-walk", "--missing=print", rev
+        )
+        return {
+            line[1:]
+            for line in res.stdout.splitlines()
+            if line.startswith(b"?")
+        }
+
+
+def checkout_name(repo: Path) -> str:
+    """Directory name a checkout of repo would get: project for project.git."""
+    path = repo.resolve()
+    if path.name == ".git":
+        path = path.parent
+    return path.name.removesuffix(".git") or "repo"
+
+
+def resolve(repo: Path, rev: str) -> str:
+    """Full commit id of rev."""
+    res = _git(repo, "rev-parse", "--verify", f"{rev}^{{commit}}")
+    return res.stdout.decode().strip()
+
+
+def materialize(
+    repo: Path,
+    rev: str,
+    dest: Path,
+    reads: tp.Optional[tp.AbstractSet[str]] = None,
+    reader: tp.Optional[GitObjectReader] = None,
+    select: tp.Optional[Selector] = None,
+) -> FileIndex:
+    """Lay out the tree of rev of a local repository under dest (see write_tree)."""
+    entries = list_tree(repo, rev)
+    own_reader = reader is None
+    reader = reader or GitObjectReader(repo)
+
+    def fetch(oids: list[bytes]) -> dict[bytes, bytes]:
+        reader.prefetch(rev, oids)
+        return {oid: data for oid in oids if (data := reader.read(oid)) is not None}
+
+    try:
+        return write_tree(entries, dest, reads, fetch, select)
+    finally:
+        if own_reader:
+            reader.close()
+
+
+def write_tree(
+    entries: tp.Sequence[TreeEntry],
+    dest: Path,
+    reads: tp.Optional[tp.AbstractSet[str]],
+    fetch: BlobFetcher,
+    select: tp.Optional[Selector] = None,
+) -> FileIndex:
+    """Lay out a tree listing under dest and return its index.
+
+    Directories are created for the whole tree, minus ignored ones. Files
+    whose name matches a glob pattern from reads, or that select picks from
+    the index, get their content through fetch; every other file is created
+    empty, so existence checks and listings behave as in a checkout while
+    blobs that no analyzer opens are never read. reads=None writes the
+    content of every file. An empty ``.git`` directory marks dest as a
+    repository root.
+    """
+    dest.mkdir(parents=True, exist_ok=True)
+    (dest / ".git").mkdir(exist_ok=True)
+    oids = {parts: oid for mode, oid, parts in entries if mode != GITLINK_MODE}
+    patterns = None if reads is None else tuple(reads) + IGNORE_FILES
+
+    # the root .larekignore must be in place before the index applies it
+    ignore_files = [(name,) for name in IGNORE_FILES if (name,) in oids]
+    blobs = fetch([oids[parts] for parts in ignore_files])
+    for parts in ignore_files:
+        dest.joinpath(*parts).write_bytes(blobs.get(oids[parts], b""))
+    index = FileIndex.from_tracked(
+        dest, ((parts, mode == GITLINK_MODE) for mode, _, parts in entries)
+    )
+    for d in _dirs(index, dest):
+        d.mkdir(exist_ok=True)
+
+    wanted: dict[Path, bytes] = {}
+    for path in index.walk(dest):
+        parts = path.relative_to(dest).parts
+        if parts in ignore_files:
+            continue
+        if patterns is None or any(fnmatchcase(path.name, p) for p in patterns):
+            wanted[path] = oids[parts]
+        else:
+            path.touch()
+    if patterns is not None and select is not None:
+        for path in select(index):
+            wanted.setdefault(path, oids[path.relative_to(dest).parts])
+
+    blobs = fetch(list(dict.fromkeys(wanted.values())))
+    for path, oid in wanted.items():
+        path.write_bytes(blobs.get(oid, b""))
+    return index
+
+
+def _dirs(index: FileIndex, root: Path) -> tp.Iterator[Path]:
+    """Every directory of the index in pre-order, including empty submodules."""
+    stack = [root]
+    while stack:
+        for d in index.dirs(stack.pop()):
+            yield d
+            stack.append(d)
@@ -2,10 +2,17 @@ import typing as tp
 from pathlib import Path
 from larek.analyzer import BaseAnalyzer
 from larek import models
+from larek.analyzer.profiling import profiled
 import re
 
 
 class GoAnalyzer(BaseAnalyzer):
+    ignored_dirs = frozenset({"mock", "mocks"})
+    ignored_files = frozenset({".gitignore"})
+    manifests = frozenset({"go.mod"})
+    lockfiles = ("go.sum", "go.mod")
+    reads = frozenset({"go.mod"})
+
     def __init__(self) -> None:
         self.is_go_service: bool = False
 
@@ -26,7 +33,7 @@ class GoAnalyzer(BaseAnalyzer):
         if not go_mod_file.exists():
             return None
 
-        self.go_version, self.libs = self._parse_go_mod(go_mod_file)
+        self.go_version, self.libs = self._cached(go_mod_file, "go.mod", self._parse_go_mod)
         if self.go_version == "":
             raise ValueError("inconsistent go.mod")
         self.is_go_service = True
@@ -53,34 +60,6 @@ class GoAnalyzer(BaseAnalyzer):
             linters=self._linters(self.linters, root),
         )
 
-    def _scan(self, root: Path):
-        for f in root.glob("*"):
-            if f.is_file() and self._file_filter(f):
-                self._parse_file(f)
-            elif f.is_dir() and self._dir_filter(f):
-                self._scan(f)
-
-    def _file_filter(self, file: Path) -> bool:
-        match file.name:
-            case ".gitignore":
-                return False
-        return True
-
-    def _dir_filter(self, dir: Path) -> bool:
-        match dir.name:
-            case (
-                "vendor"
-                | "node_modules"
-                | "__pycache__"
-                | ".idea"
-                | ".git"
-                | ".vscode"
-                | "mock"
-                | "mocks"
-            ):
-                return False
-        return True
-
     def _parse_file(self, file: Path):
         match file.name:
             case "main.go":
@@ -138,10 +117,11 @@ class GoAnalyzer(BaseAnalyzer):
                         )
                     )
 
+    @profiled("manifest", reads_file=True)
     def _parse_go_mod(self, go_mod_file: Path) -> tuple[str, list[models.Lib]]:
         go_version_pattern = re.compile(r"\d.\d*")
         version = ""
-        libs: list[models.Lib] = []
+        libs: list[models.LibSpec] = []
         with go_mod_file.open() as f:
             parsing_libs = False
             for line in f.readlines():
@@ -159,15 +139,11 @@ class GoAnalyzer(BaseAnalyzer):
 
                 if parsing_libs:
                     lib_data = line.split()
-                    libs.append(
-                        models.Lib(
-                            name=lib_data[0],
-                            version=lib_data[1],
-                        )
-                    )
+                    libs.append((lib_data[0], lib_data[1]))
 
-        return version, libs
+        return version, models.libs_from(libs)
 
+    @profiled("linters")
     def _linters(
         self, found_linters: list[models.Linter], root: Path
     ) -> list[models.Linter]:
@@ -175,7 +151,7 @@ class GoAnalyzer(BaseAnalyzer):
             return found_linters
 
         linters: list[models.Linter] = []
-        golangci_configs = [cfg for cfg in root.glob(".golangci.y*ml")]
+        golangci_configs = self._file_index(root).files(root, ".golangci.y*ml")
         if len(golangci_configs) > 0:
             for config in golangci_configs:
                 linters.append(
@@ -0,0 +1,202 @@
+"""Единый движок игнорирования директорий для обхода репозитория."""
+
+import re
+import typing as tp
+from pathlib import Path
+
+# Vendored, generated and tool directories that are never worth analyzing.
+DEFAULT_PATTERNS = (
+    ".git/",
+    ".hg/",
+    ".svn/",
+    ".idea/",
+    ".vscode/",
+    ".larek/",
+    "node_modules/",
+    "vendor/",
+    "__pycache__/",
+    ".venv/",
+    "venv/",
+    ".pytest_cache/",
+    ".mypy_cache/",
+    ".ruff_cache/",
+    ".tox/",
+    ".nox/",
+    ".eggs/",
+    "*.egg-info/",
+    ".gradle/",
+)
+
+IGNORE_FILES = (".gitignore", ".larekignore")
+
+_LITERAL = re.compile(r"^[^*?\[\\/]+$")
+
+
+def _translate(pattern: str) -> str:
+    """Translate a gitignore glob into a regular expression body."""
+    res: list[str] = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "*":
+            if pattern.startswith("**/", i):
+                res.append("(?:.*/)?")
+                i += 3
+                continue
+            if pattern.startswith("**", i):
+                res.append(".*")
+                i += 2
+                continue
+            res.append("[^/]*")
+        elif c == "?":
+            res.append("[^/]")
+        elif c == "[":
+            j = pattern.find("]", i + 2)
+            if j == -1:
+                res.append(re.escape(c))
+            else:
+                body = pattern[i + 1 : j]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                res.append("[" + body.replace("\\", "\\\\") + "]")
+                i = j
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            res.append(re.escape(pattern[i]))
+        else:
+            res.append(re.escape(c))
+        i += 1
+    return "".join(res)
+
+
+class IgnoreSpec:
+    """Правила одного ignore-файла, скомпилированные в быстрый матчер.
+
+    Буквальные имена без слэшей и масок проверяются через множество, остальные
+    шаблоны объединяются в одно регулярное выражение. Если в файле есть
+    отрицания (``!pattern``), правила проверяются по порядку, как в git.
+    """
+
+    def __init__(self, lines: tp.Iterable[str]) -> None:
+        self.rules: list[tuple[re.Pattern[str], bool, bool]] = []
+        literals: dict[str, bool] = {}
+        regexes: list[str] = []
+        dir_regexes: list[str] = []
+        has_negation = False
+
+        for raw in lines:
+            line = raw.rstrip("\n")
+            if not line.endswith("\\ "):
+                line = line.rstrip()
+            if not line or line.startswith("#"):
+                continue
+            negated = line.startswith("!")
+            if negated:
+                line = line[1:]
+                has_negation = True
+            elif line.startswith("\\"):
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            if not line:
+                continue
+
+            if "/" in line:
+                body = "^" + _translate(line.lstrip("/")) + "$"
+            else:
+                body = "^(?:.*/)?" + _translate(line) + "$"
+            self.rules.append((re.compile(body), negated, dir_only))
+
+            if negated:
+                continue
+            if _LITERAL.match(line):
+                literals[line] = literals.get(line, True) and dir_only
+            elif dir_only:
+                dir_regexes.append(body)
+            else:
+                regexes.append(body)
+
+        self.ordered = has_negation
+        # name -> dir_only; a name listed both with and without "/" matches files too
+        self._literals = literals
+        self._regex = re.compile("|".join(regexes)) if regexes else None
+        self._dir_regex = re.compile("|".join(dir_regexes)) if dir_regexes else None
+
+    @classmethod
+    def from_file(cls, path: Path) -> tp.Optional["IgnoreSpec"]:
+        try:
+            text = path.read_text(encoding="utf-8", errors="ignore")
+        except OSError:
+            return None
+        spec = cls(text.splitlines())
+        return spec if spec.rules else None
+
+    def match(self, rel: str, is_dir: bool) -> tp.Optional[bool]:
+        """True if rel is ignored, False if re-included by a negation, None if no rule matches."""
+        if self.ordered:
+            for regex, negated, dir_only in reversed(self.rules):
+                if dir_only and not is_dir:
+                    continue
+                if regex.match(rel):
+                    return not negated
+            return None
+
+        name = rel.rsplit("/", 1)[-1]
+        dir_only = self._literals.get(name)
+        if dir_only is not None and (is_dir or not dir_only):
+            return True
+        if self._regex is not None and self._regex.match(rel):
+            return True
+        if is_dir and self._dir_regex is not None and self._dir_regex.match(rel):
+            return True
+        return None
+
+
+class IgnoreRules:
+    """Набор правил игнорирования для обхода репозитория.
+
+    Объединяет встроенные шаблоны, ``.gitignore`` и ``.larekignore`` корня и
+    вложенные ``.gitignore``. Правила применяются к директориям: совпавшая
+    директория отсекается целиком вместе с поддеревом. Файлы не фильтруются,
+    так как анализаторам нужны в том числе игнорируемые ``.env`` и локальные
+    конфиги.
+    """
+
+    def __init__(
+        self,
+        specs: tp.Sequence[tuple[tuple[str, ...], IgnoreSpec]],
+        gitignore: bool = True,
+    ) -> None:
+        self.specs = tuple(specs)
+        self.gitignore = gitignore
+
+    @classmethod
+    def load(cls, root: Path, gitignore: bool = True) -> "IgnoreRules":
+        """Compile the built-in defaults plus the ignore files found at root."""
+        specs: list[tuple[tuple[str, ...], IgnoreSpec]] = [
+            ((), IgnoreSpec(DEFAULT_PATTERNS))
+        ]
+        for name in IGNORE_FILES:
+            if name == ".gitignore" and not gitignore:
+                continue
+            spec = IgnoreSpec.from_file(root / name)
+            if spec is not None:
+                specs.append(((), spec))
+        return cls(specs, gitignore)
+
+    def nested(self, base: tuple[str, ...], path: Path) -> "IgnoreRules":
+        """Rules extended with a .gitignore found in a subdirectory."""
+        spec = IgnoreSpec.from_file(path)
+        if spec is None:
+            return self
+        return IgnoreRules(self.specs + ((base, spec),), self.gitignore)
+
+    def ignored(self, key: tuple[str, ...], is_dir: bool = True) -> bool:
+        """Check a path given as parts relative to the repository root."""
+        for base, spec in reversed(self.specs):
+            if key[: len(base)] != base:
+                continue
+            verdict = spec.match("/".join(key[len(base) :]), is_dir)
+            if verdict is not None:
+                return verdict
+        return False
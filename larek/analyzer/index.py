@@ -0,0 +1,297 @@
+"""Общий индекс файлов репозитория, собираемый за один обход файловой системы."""
+
+import os
+import subprocess
+import typing as tp
+from fnmatch import fnmatchcase
+from pathlib import Path
+
+from .ignore import IgnoreRules
+
+# A directory listing sorted by name: (name, is_dir) pairs.
+Listing = list[tuple[str, bool]]
+
+# git index modes: gitlinks (submodules) have no tracked content of their own.
+GITLINK_MODE = b"160000"
+
+
+def find_repo_root(start_path: Path, max_depth: int = 10) -> tp.Optional[Path]:
+    """Find the repository root by walking up the directory tree looking for .git"""
+    current = start_path if start_path.is_dir() else start_path.parent
+    depth = 0
+
+    while depth < max_depth:
+        if (current / ".git").exists():
+            return current
+        if current.parent == current:
+            return None
+        current = current.parent
+        depth += 1
+
+    return None
+
+
+def _iter_nul_separated(stream: tp.IO[bytes], chunk_size: int = 1 << 16) -> tp.Iterator[bytes]:
+    tail = b""
+    while chunk := stream.read(chunk_size):
+        records = (tail + chunk).split(b"\0")
+        tail = records.pop()
+        yield from records
+    if tail:
+        yield tail
+
+
+def _tracked_entries(stream: tp.IO[bytes]) -> tp.Iterator[tuple[tuple[str, ...], bool]]:
+    """Parse ``git ls-files -z --stage`` or ``git ls-tree -r -z`` records.
+
+    Both start with the file mode and end with a tab and the path.
+    """
+    for record in _iter_nul_separated(stream):
+        meta, _, raw_path = record.partition(b"\t")
+        yield tuple(os.fsdecode(raw_path).split("/")), meta.startswith(GITLINK_MODE)
+
+
+class FileIndex:
+    """Индекс файлов репозитория.
+
+    Строится одним обходом через ``os.scandir``: тип каждой записи
+    определяется один раз по закэшированной информации ``DirEntry``.
+    Листинги отсортированы по имени, поэтому порядок файлов не зависит от
+    файловой системы и от того, собран индекс обходом или из git.
+    Директории, попавшие под ``IgnoreRules``, отсекаются во время обхода
+    и в листинги не попадают. Все анализаторы и ``RepoAnalyzer`` читают
+    листинги из индекса вместо повторных обходов дерева.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self._listings: dict[tuple[str, ...], Listing] = {}
+
+    @classmethod
+    def build(cls, root: Path, ignore: tp.Optional[IgnoreRules] = None) -> "FileIndex":
+        """Walk the tree under root once, pruning ignored directories."""
+        index = cls(root)
+        rules = ignore if ignore is not None else IgnoreRules.load(root)
+        stack: list[tuple[str, tuple[str, ...], IgnoreRules]] = [(str(root), (), rules)]
+        while stack:
+            path, key, rules = stack.pop()
+            listing, subdirs = index._scandir(path)
+            if key and rules.gitignore and (".gitignore", False) in listing:
+                rules = rules.nested(key, Path(path, ".gitignore"))
+            ignored = {
+                name
+                for name, is_dir in listing
+                if is_dir and rules.ignored(key + (name,))
+            }
+            if ignored:
+                listing = [entry for entry in listing if entry[0] not in ignored]
+            index._listings[key] = listing
+            for name in reversed(subdirs):
+                if name not in ignored:
+                    stack.append((os.path.join(path, name), key + (name,), rules))
+        return index
+
+    @classmethod
+    def from_git(cls, root: Path) -> tp.Optional["FileIndex"]:
+        """Build the index from the git index by streaming ``git ls-files -z``.
+
+        Only tracked files are listed, so untracked build outputs and ignored
+        trees never reach the analyzers. Returns None when root is not inside
+        a git checkout or nothing under it is tracked.
+        """
+        if find_repo_root(root) is None:
+            return None
+        try:
+            proc = subprocess.Popen(
+                ["git", "-C", str(root), "ls-files", "-z", "--stage"],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError:
+            return None
+
+        assert proc.stdout is not None
+        with proc.stdout:
+            index = cls.from_tracked(root, _tracked_entries(proc.stdout))
+        if proc.wait() != 0 or not index._listings[()]:
+            return None
+        return index
+
+    @classmethod
+    def from_tracked(
+        cls, root: Path, entries: tp.Iterable[tuple[tuple[str, ...], bool]]
+    ) -> "FileIndex":
+        """Build the index from tracked paths given as (parts, is_gitlink) pairs.
+
+        Directories are implied by the paths. Ignored ones are pruned with
+        the built-in and .larekignore rules of root: git already drops
+        ignored untracked files, so .gitignore is not consulted.
+        """
+        index = cls(root)
+        rules = IgnoreRules.load(root, gitignore=False)
+        index._listings[()] = []
+        seen: set[tuple[str, ...]] = set()
+        for parts, is_gitlink in entries:
+            index._add_tracked(parts, is_gitlink, seen, rules)
+        # git orders full paths, so "a/x" sorts after "a.txt" but before "a0"
+        for listing in index._listings.values():
+            listing.sort()
+        return index
+
+    def _add_tracked(
+        self,
+        parts: tuple[str, ...],
+        is_gitlink: bool,
+        seen: set[tuple[str, ...]],
+        rules: IgnoreRules,
+    ) -> None:
+        key: tuple[str, ...] = ()
+        for i, name in enumerate(parts):
+            sub = key + (name,)
+            is_dir = is_gitlink or i < len(parts) - 1
+            if sub not in seen:
+                seen.add(sub)
+                if is_dir and rules.ignored(sub):
+                    return
+                self._listings[key].append((name, is_dir))
+                if is_dir and not is_gitlink:
+                    self._listings[sub] = []
+            if sub not in self._listings:
+                return
+            key = sub
+
+    @classmethod
+    def collect(cls, root: Path, use_git: bool = False) -> "FileIndex":
+        """Build the index from git when requested and possible, walking the tree otherwise."""
+        index = cls.from_git(root) if use_git else None
+        return index if index is not None else cls.build(root)
+
+    @staticmethod
+    def _scandir(path: str) -> tuple[Listing, list[str]]:
+        """List one directory, returning its entries and the subdirectories to descend into.
+
+        Symlinked directories are listed but never descended into to avoid cycles.
+        """
+        listing: Listing = []
+        subdirs: list[str] = []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir():
+                            listing.append((entry.name, True))
+                            if not entry.is_symlink():
+                                subdirs.append(entry.name)
+                        elif entry.is_file():
+                            listing.append((entry.name, False))
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        listing.sort()
+        subdirs.sort()
+        return listing, subdirs
+
+    def _key(self, path: Path) -> tp.Optional[tuple[str, ...]]:
+        try:
+            return Path(path).relative_to(self.root).parts
+        except ValueError:
+            return None
+
+    def covers(self, path: Path) -> bool:
+        """Check whether the directory was visited while building the index."""
+        key = self._key(path)
+        return key is not None and key in self._listings
+
+    def listing(self, path: Path) -> Listing:
+        key = self._key(path)
+        if key is None:
+            return []
+        return self._listings.get(key, [])
+
+    def files(self, path: Path, pattern: tp.Optional[str] = None) -> list[Path]:
+        """Files directly inside path, optionally filtered by a glob pattern."""
+        return [
+            path / name
+            for name, is_dir in self.listing(path)
+            if not is_dir and (pattern is None or fnmatchcase(name, pattern))
+        ]
+
+    def dirs(self, path: Path) -> list[Path]:
+        """Subdirectories directly inside path."""
+        return [path / name for name, is_dir in self.listing(path) if is_dir]
+
+    def walk(
+        self,
+        path: Path,
+        dir_filter: tp.Optional[tp.Callable[[Path], bool]] = None,
+        file_filter: tp.Optional[tp.Callable[[Path], bool]] = None,
+    ) -> tp.Iterator[Path]:
+        """Yield files under path depth first, each directory in name order."""
+        key = self._key(path)
+        if key is None:
+            return
+        stack: list[tp.Iterator[tuple[str, bool]]] = []
+        dirs: list[tuple[Path, tuple[str, ...]]] = [(path, key)]
+        current = iter(self._listings.get(key, []))
+        while True:
+            for name, is_dir in current:
+                entry = dirs[-1][0] / name
+                if not is_dir:
+                    if file_filter is None or file_filter(entry):
+                        yield entry
+                    continue
+                sub_key = dirs[-1][1] + (name,)
+                if sub_key not in self._listings:
+                    continue
+                if dir_filter is not None and not dir_filter(entry):
+                    continue
+                stack.append(current)
+                dirs.append((entry, sub_key))
+                current = iter(self._listings[sub_key])
+                break
+            else:
+                if not stack:
+                    return
+                current = stack.pop()
+                dirs.pop()
+
+    def find_dirs(self, path: Path, names: tp.AbstractSet[str]) -> list[Path]:
+        """Directories below path directly holding a file from names, in walk order."""
+        top = self._key(path)
+        if top is None:
+            return []
+        found: list[Path] = []
+        stack: list[tuple[Path, tuple[str, ...]]] = [(path, top)]
+        while stack:
+            current, key = stack.pop()
+            listing = self._listings.get(key, [])
+            if key != top and any(
+                not is_dir and name in names for name, is_dir in listing
+            ):
+                found.append(current)
+            for name, is_dir in reversed(listing):
+                if is_dir and key + (name,) in self._listings:
+                    stack.append((current / name, key + (name,)))
+        return found
+
+    def subtree(self, path: Path) -> "FileIndex":
+        """Return an index rooted at path holding only the listings below it."""
+        sub = FileIndex(path)
+        key = self._key(path)
+        if key is None:
+            return sub
+        n = len(key)
+        sub._listings = {k[n:]: v for k, v in self._listings.items() if k[:n] == key}
+        return sub
+
+    def rglob(self, path: Path, pattern: str) -> list[Path]:
+        """Files anywhere under path whose name matches the glob pattern."""
+        return [f for f in self.walk(path) if fnmatchcase(f.name, pattern)]
+
+
+def ensure_index(index: tp.Optional[FileIndex], root: Path) -> FileIndex:
+    """Return index if it already covers root, otherwise build a fresh one."""
+    if index is not None and index.covers(root):
+        return index
+    return FileIndex.build(root)
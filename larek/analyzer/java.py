@@ -2,14 +2,31 @@ import typing as tp
 from pathlib import Path
 from larek.analyzer import BaseAnalyzer
 from larek import models
+from larek.analyzer.probes import ProbeSet
+from larek.analyzer.profiling import profiled
 import re
 import xml.etree.ElementTree as ET
 from typing import Optional
 
+GRADLE_LOCKFILES = (
+    "gradle.lockfile",
+    "gradle/libs.versions.toml",
+    "build.gradle.kts",
+    "build.gradle",
+    "settings.gradle.kts",
+    "settings.gradle",
+)
+JAVA_PROBES = ProbeSet(literals={"main_method": [b"public static void main"]})
+
 
 class JavaAnalyzer(BaseAnalyzer):
     """Анализатор Java проектов (Maven и Gradle)."""
 
+    ignored_dirs = frozenset({"build", "target", "out", ".mvn"})
+    manifests = frozenset({"pom.xml", "build.gradle", "build.gradle.kts"})
+    lockfiles = GRADLE_LOCKFILES + ("pom.xml",)
+    reads = frozenset({"pom.xml", "*.gradle", "*.gradle.kts"})
+
     def __init__(self) -> None:
         self.is_java_service: bool = False
         self.build_tool: str = ""  # "maven" or "gradle"
@@ -36,7 +53,7 @@ class JavaAnalyzer(BaseAnalyzer):
 
         if pom_file.exists():
             self.build_tool = "maven"
-            self.java_version, self.libs = self._parse_pom(pom_file)
+            self.java_version, self.libs = self._cached(pom_file, "pom.xml", self._parse_pom)
             self.is_java_service = True
         elif gradle_file.exists():
             self.build_tool = "gradle"
@@ -80,6 +97,7 @@ class JavaAnalyzer(BaseAnalyzer):
             android=self.android_config,
         )
 
+    @profiled("manifest")
     def _parse_all_gradle_files(self, root: Path) -> tuple[str, list[models.Lib]]:
         """Parse all build.gradle and build.gradle.kts files in the project."""
         java_version = ""
@@ -97,8 +115,9 @@ class JavaAnalyzer(BaseAnalyzer):
             root_variables = self._extract_variables(root_gradle_kts)
 
         # Find all gradle files
-        gradle_files = list(root.glob("**/build.gradle")) + list(
-            root.glob("**/build.gradle.kts")
+        index = self._file_index(root)
+        gradle_files = index.rglob(root, "build.gradle") + index.rglob(
+            root, "build.gradle.kts"
         )
 
         for gradle_file in gradle_files:
@@ -145,6 +164,7 @@ class JavaAnalyzer(BaseAnalyzer):
             pass
         return variables
 
+    @profiled("tests")
     def _get_test_command(self, root: Path) -> str:
         if self.build_tool == "maven":
             if (root / "mvnw").exists():
@@ -155,28 +175,13 @@ class JavaAnalyzer(BaseAnalyzer):
                 return "./gradlew test"
             return "gradle test"
 
-    def _scan(self, root: Path):
-        for f in root.glob("*"):
-            if f.is_file() and self._file_filter(f):
-                self._parse_file(f)
-            elif f.is_dir() and self._dir_filter(f):
-                self._scan(f)
-
-    def _file_filter(self, file: Path) -> bool:
-        return True
-
-    def _dir_filter(self, directory: Path) -> bool:
-        excluded = {
-            ".git",
-            ".idea",
-            ".gradle",
-            "build",
-            "target",
-            "out",
-            ".mvn",
-            "node_modules",
-        }
-        return directory.name not in excluded
+    def source_reads(self, root: Path) -> tp.Iterator[Path]:
+        """Java files probed for a main method: the ones without Main in the name."""
+        for file in self._file_index(root).walk(
+            root, self._dir_filter, self._file_filter
+        ):
+            if file.suffix == ".java" and "Main" not in file.name:
+                yield file
 
     def _parse_file(self, file: Path):
         match file.name:
@@ -223,13 +228,8 @@ class JavaAnalyzer(BaseAnalyzer):
                 if file.suffix == ".java" and "Main" in file.name:
                     self.entrypoints.append(str(file))
                 elif file.suffix == ".java":
-                    # Check if file contains main method
-                    try:
-                        content = file.read_text(errors="ignore")
-                        if "public static void main" in content:
-                            self.entrypoints.append(str(file))
-                    except Exception:
-                        pass
+                    if self._cached(file, "entrypoint", self._has_main_method):
+                        self.entrypoints.append(str(file))
 
                 # Config files
                 if (
@@ -258,10 +258,16 @@ class JavaAnalyzer(BaseAnalyzer):
                         )
                     )
 
+    @profiled("entrypoints")
+    def _has_main_method(self, file: Path) -> bool:
+        """Check if a Java source file declares a main method."""
+        return bool(self._sniffer().scan(file, JAVA_PROBES, full=True))
+
+    @profiled("manifest", reads_file=True)
     def _parse_pom(self, pom_file: Path) -> tuple[str, list[models.Lib]]:
         """Parse Maven pom.xml file."""
         java_version = ""
-        libs: list[models.Lib] = []
+        libs: list[models.LibSpec] = []
 
         try:
             tree = ET.parse(pom_file)
@@ -298,19 +304,19 @@ class JavaAnalyzer(BaseAnalyzer):
                     if group_id is not None and artifact_id is not None:
                         lib_name = f"{group_id.text}:{artifact_id.text}"
                         lib_version = version.text if version is not None else None
-                        libs.append(models.Lib(name=lib_name, version=lib_version))
+                        libs.append((lib_name, lib_version))
 
         except ET.ParseError:
             pass
 
-        return java_version, libs
+        return java_version, models.libs_from(libs)
 
     def _parse_gradle(
         self, gradle_file: Path, root_variables: dict[str, str] = None
     ) -> tuple[str, list[models.Lib]]:
         """Parse Gradle build.gradle file."""
         java_version = ""
-        libs: list[models.Lib] = []
+        libs: list[models.LibSpec] = []
         variables: dict[str, str] = root_variables.copy() if root_variables else {}
 
         try:
@@ -356,12 +362,7 @@ class JavaAnalyzer(BaseAnalyzer):
                     group_id, artifact_id, version = match.groups()
                     # Resolve variable references like $kotlin_version or ${kotlin_version}
                     version = self._resolve_variable(version, variables)
-                    libs.append(
-                        models.Lib(
-                            name=f"{group_id}:{artifact_id}",
-                            version=version,
-                        )
-                    )
+                    libs.append((f"{group_id}:{artifact_id}", version))
 
             # Pattern for no version (managed by BOM or platform): 'group:artifact'
             dep_patterns_no_version = [
@@ -375,23 +376,18 @@ class JavaAnalyzer(BaseAnalyzer):
                     group_id, artifact_id = match.groups()
                     # Skip if this looks like it has a version (already matched above)
                     if not artifact_id.endswith(("'", '"')):
-                        libs.append(
-                            models.Lib(
-                                name=f"{group_id}:{artifact_id}",
-                                version=None,
-                            )
-                        )
+                        libs.append((f"{group_id}:{artifact_id}", None))
 
             # Also scan app/build.gradle if this is root build.gradle
             app_gradle = gradle_file.parent / "app" / "build.gradle"
             if app_gradle.exists() and gradle_file.name == "build.gradle":
                 _, app_libs = self._parse_gradle(app_gradle)
-                libs.extend(app_libs)
+                libs.extend((lib.name, lib.version) for lib in app_libs)
 
         except Exception:
             pass
 
-        return java_version, libs
+        return java_version, models.libs_from(libs)
 
     def _resolve_variable(self, value: str, variables: dict[str, str]) -> str:
         """Resolve Gradle variable references like $var or ${var}."""
@@ -417,6 +413,7 @@ class JavaAnalyzer(BaseAnalyzer):
             return version[2:]  # "1.8" -> "8"
         return version
 
+    @profiled("manifest")
     def _detect_android(self, root: Path) -> None:
         """Detect if this is an Android project and extract Android-specific config."""
 
@@ -3,9 +3,18 @@ import typing as tp
 from pathlib import Path
 from larek.analyzer import BaseAnalyzer
 from larek import models
+from larek.analyzer.profiling import profiled
 
 
 class JavaScriptAnalyzer(BaseAnalyzer):
+    ignored_dirs = frozenset({"dist", "build", "coverage"})
+    ignored_files = frozenset(
+        {"package-lock.json", "yarn.lock", "pnpm-lock.yaml", ".DS_Store"}
+    )
+    manifests = frozenset({"package.json"})
+    lockfiles = ("pnpm-lock.yaml", "yarn.lock", "package-lock.json")
+    reads = frozenset({"package.json"})
+
     def __init__(self) -> None:
         self.is_js_service: bool = False
 
@@ -26,8 +35,8 @@ class JavaScriptAnalyzer(BaseAnalyzer):
         if not package_json_file.exists():
             return None
 
-        self.js_version, self.libs, scripts = self._parse_package_json(
-            package_json_file
+        self.js_version, self.libs, scripts = self._cached(
+            package_json_file, "package.json", self._parse_package_json
         )
         self.is_js_service = True
 
@@ -56,6 +65,7 @@ class JavaScriptAnalyzer(BaseAnalyzer):
             linters=self.linters,
         )
 
+    @profiled("manifest")
     def _detect_package_manager(self, root: Path) -> str:
         if (root / "bun.lockb").exists():
             return "bun"
@@ -75,6 +85,7 @@ class JavaScriptAnalyzer(BaseAnalyzer):
 
         return "npm"
 
+    @profiled("version")
     def _is_typescript(self, root: Path) -> bool:
         if (root / "tsconfig.json").exists():
             return True
@@ -94,33 +105,6 @@ class JavaScriptAnalyzer(BaseAnalyzer):
             return f"{packet_manager} test" if packet_manager != "npm" else "npm test"
         return "echo 'No tests found'"
 
-    def _scan(self, root: Path):
-        for f in root.iterdir():
-            if f.is_file() and self._file_filter(f):
-                self._parse_file(f)
-            elif f.is_dir() and self._dir_filter(f):
-                self._scan(f)
-
-    def _dir_filter(self, dir_path: Path) -> bool:
-        match dir_path.name:
-            case (
-                "node_modules"
-                | ".git"
-                | "dist"
-                | "build"
-                | "coverage"
-                | ".idea"
-                | ".vscode"
-            ):
-                return False
-        return True
-
-    def _file_filter(self, file: Path) -> bool:
-        match file.name:
-            case "package-lock.json" | "yarn.lock" | "pnpm-lock.yaml" | ".DS_Store":
-                return False
-        return True
-
     def _parse_file(self, file: Path):
         match file.name:
             case (
@@ -202,11 +186,12 @@ class JavaScriptAnalyzer(BaseAnalyzer):
                 ):
                     self.compose_file = str(file)
 
+    @profiled("manifest", reads_file=True)
     def _parse_package_json(
         self, package_json_file: Path
     ) -> tuple[str, list[models.Lib], dict[str, str]]:
         version = ""
-        libs: list[models.Lib] = []
+        libs: list[models.LibSpec] = []
         scripts: dict[str, str] = {}
 
         try:
@@ -228,9 +213,9 @@ class JavaScriptAnalyzer(BaseAnalyzer):
                     deps = data.get(dep_type, {})
                     if isinstance(deps, dict):
                         for name, ver in deps.items():
-                            libs.append(models.Lib(name=name, version=str(ver)))
+                            libs.append((name, str(ver)))
 
         except (json.JSONDecodeError, OSError):
             pass
 
-        return version, libs, scripts
+        return version, models.libs_from(libs), scripts
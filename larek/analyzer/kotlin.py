@@ -1,13 +1,24 @@
+import functools
 import typing as tp
 from pathlib import Path
 from larek.analyzer import BaseAnalyzer
 from larek import models
+from larek.analyzer.java import GRADLE_LOCKFILES
+from larek.analyzer.probes import ProbeSet
+from larek.analyzer.profiling import profiled
 import re
 
+KOTLIN_PROBES = ProbeSet(literals={"main_function": [b"fun main("]})
+
 
 class KotlinAnalyzer(BaseAnalyzer):
     """Анализатор Kotlin проектов (Gradle)."""
 
+    ignored_dirs = frozenset({"build", "target", "out"})
+    manifests = frozenset({"build.gradle", "build.gradle.kts"})
+    lockfiles = GRADLE_LOCKFILES
+    reads = frozenset({"*.gradle", "*.gradle.kts", ".editorconfig"})
+
     def __init__(self) -> None:
         self.is_kotlin_service: bool = False
         self.build_tool: str = "gradle"
@@ -30,9 +41,14 @@ class KotlinAnalyzer(BaseAnalyzer):
         gradle_file = root / "build.gradle"
         gradle_kts_file = root / "build.gradle.kts"
 
-        # Check if it's a Kotlin project
+        # Check if it's a Kotlin project; the recursive *.kt lookup is the
+        # expensive part, so it only runs once a Gradle build file is found.
         has_kotlin_src = (root / "src" / "main" / "kotlin").exists()
-        has_kotlin_files = any(root.rglob("*.kt"))
+
+        @functools.cache
+        def has_kotlin_files() -> bool:
+            files = self._file_index(root).walk(root)
+            return any(f.name.endswith(".kt") for f in files)
 
         if gradle_kts_file.exists():
             self.build_tool = "gradle"
@@ -40,7 +56,7 @@ class KotlinAnalyzer(BaseAnalyzer):
                 gradle_kts_file
             )
             self.is_kotlin_service = True
-        elif gradle_file.exists() and (has_kotlin_src or has_kotlin_files):
+        elif gradle_file.exists() and (has_kotlin_src or has_kotlin_files()):
             self.build_tool = "gradle"
             self.kotlin_version, self.java_version, self.libs = self._parse_gradle(
                 gradle_file
@@ -50,7 +66,7 @@ class KotlinAnalyzer(BaseAnalyzer):
             return None
 
         # If we couldn't detect Kotlin, this might be a Java project
-        if not self.kotlin_version and not has_kotlin_src and not has_kotlin_files:
+        if not self.kotlin_version and not has_kotlin_src and not has_kotlin_files():
             return None
 
         if not self.kotlin_version:
@@ -82,32 +98,19 @@ class KotlinAnalyzer(BaseAnalyzer):
             linters=self.linters,
         )
 
+    @profiled("tests")
     def _get_test_command(self, root: Path) -> str:
         if (root / "gradlew").exists():
             return "./gradlew test"
         return "gradle test"
 
-    def _scan(self, root: Path):
-        for f in root.glob("*"):
-            if f.is_file() and self._file_filter(f):
-                self._parse_file(f)
-            elif f.is_dir() and self._dir_filter(f):
-                self._scan(f)
-
-    def _file_filter(self, file: Path) -> bool:
-        return True
-
-    def _dir_filter(self, directory: Path) -> bool:
-        excluded = {
-            ".git",
-            ".idea",
-            ".gradle",
-            "build",
-            "target",
-            "out",
-            "node_modules",
-        }
-        return directory.name not in excluded
+    def source_reads(self, root: Path) -> tp.Iterator[Path]:
+        """Kotlin files probed for a top-level main function."""
+        for file in self._file_index(root).walk(
+            root, self._dir_filter, self._file_filter
+        ):
+            if file.suffix == ".kt":
+                yield file
 
     def _parse_file(self, file: Path):
         match file.name:
@@ -158,12 +161,8 @@ class KotlinAnalyzer(BaseAnalyzer):
             case _:
                 # Check for main function entry points in Kotlin
                 if file.suffix == ".kt":
-                    try:
-                        content = file.read_text(errors="ignore")
-                        if "fun main(" in content or "fun main()" in content:
-                            self.entrypoints.append(str(file))
-                    except Exception:
-                        pass
+                    if self._cached(file, "entrypoint", self._has_main_function):
+                        self.entrypoints.append(str(file))
 
                 # Config files
                 if (
@@ -199,11 +198,17 @@ class KotlinAnalyzer(BaseAnalyzer):
                         )
                     )
 
+    @profiled("entrypoints")
+    def _has_main_function(self, file: Path) -> bool:
+        """Check if a Kotlin source file declares a top-level main function."""
+        return bool(self._sniffer().scan(file, KOTLIN_PROBES, full=True))
+
+    @profiled("manifest", reads_file=True)
     def _parse_gradle_kts(self, gradle_file: Path) -> tuple[str, str, list[models.Lib]]:
         """Parse Gradle build.gradle.kts file (Kotlin DSL)."""
         kotlin_version = ""
         java_version = ""
-        libs: list[models.Lib] = []
+        libs: list[models.LibSpec] = []
 
         try:
             content = gradle_file.read_text(errors="ignore")
@@ -245,23 +250,19 @@ class KotlinAnalyzer(BaseAnalyzer):
             for pattern in dep_patterns:
                 for match in re.finditer(pattern, content):
                     group_id, artifact_id, version = match.groups()
-                    libs.append(
-                        models.Lib(
-                            name=f"{group_id}:{artifact_id}",
-                            version=version,
-                        )
-                    )
+                    libs.append((f"{group_id}:{artifact_id}", version))
 
         except Exception:
             pass
 
-        return kotlin_version, java_version, libs
+        return kotlin_version, java_version, models.libs_from(libs)
 
+    @profiled("manifest", reads_file=True)
     def _parse_gradle(self, gradle_file: Path) -> tuple[str, str, list[models.Lib]]:
         """Parse Gradle build.gradle file (Groovy DSL)."""
         kotlin_version = ""
         java_version = ""
-        libs: list[models.Lib] = []
+        libs: list[models.LibSpec] = []
 
         try:
             content = gradle_file.read_text(errors="ignore")
@@ -300,14 +301,9 @@ class KotlinAnalyzer(BaseAnalyzer):
             for pattern in dep_patterns:
                 for match in re.finditer(pattern, content):
                     group_id, artifact_id, version = match.groups()
-                    libs.append(
-                        models.Lib(
-                            name=f"{group_id}:{artifact_id}",
-                            version=version,
-                        )
-                    )
+                    libs.append((f"{group_id}:{artifact_id}", version))
 
         except Exception:
             pass
 
-        return kotlin_version, java_version, libs
+        return kotlin_version, java_version, models.libs_from(libs)
@@ -0,0 +1,253 @@
+"""Профилирование анализа репозитория по анализаторам и фазам."""
+
+import functools
+import heapq
+import json
+import time
+import tracemalloc
+import typing as tp
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from rich.table import Table
+
+if tp.TYPE_CHECKING:
+    from .sniff import ContentSniffer
+
+F = tp.TypeVar("F", bound=tp.Callable[..., tp.Any])
+
+
+@dataclass
+class ProfileStats:
+    calls: int = 0
+    seconds: float = 0.0
+    files: int = 0
+    bytes_read: int = 0
+    peak_memory: int = 0
+
+    def merge(self, other: dict[str, tp.Any]) -> None:
+        self.calls += other["calls"]
+        self.seconds += other["seconds"]
+        self.files += other["files"]
+        self.bytes_read += other["bytes_read"]
+        self.peak_memory = max(self.peak_memory, other["peak_memory"])
+
+
+class _Frame:
+    __slots__ = (
+        "stats",
+        "start",
+        "files",
+        "bytes",
+        "peak",
+        "child_seconds",
+        "child_files",
+        "child_bytes",
+        "exclusive",
+    )
+
+    def __init__(
+        self, stats: ProfileStats, files: int, nbytes: int, exclusive: bool
+    ) -> None:
+        self.stats = stats
+        self.start = time.perf_counter()
+        self.files = files
+        self.bytes = nbytes
+        self.peak = 0
+        self.child_seconds = 0.0
+        self.child_files = 0
+        self.child_bytes = 0
+        self.exclusive = exclusive
+
+
+class AnalysisProfiler:
+    """Сбор времени, числа файлов, прочитанных байт и пиковой памяти.
+
+    Статистика ведётся по анализаторам и по фазам (``index``, ``discovery``,
+    ``walk``, ``manifest``, ``entrypoints``, ``probes``, ``linters``,
+    ``version``, ``tests``); фазе засчитывается только собственное время,
+    поэтому сумма фаз не превышает общее. Хранятся ``top`` самых медленных
+    файлов; память считается через ``tracemalloc``, пока профилировщик запущен.
+    """
+
+    def __init__(
+        self,
+        top: int = 10,
+        sniffer: tp.Optional["ContentSniffer"] = None,
+        trace_memory: bool = True,
+    ) -> None:
+        self.top = top
+        self.sniffer = sniffer
+        self.trace_memory = trace_memory
+        self.analyzers: dict[str, ProfileStats] = {}
+        self.phases: dict[str, ProfileStats] = {}
+        # min-heap of (seconds, phase, file)
+        self.slowest: list[tuple[float, str, str]] = []
+        self.wall_seconds = 0.0
+        self._stack: list[_Frame] = []
+        self._files = 0
+        self._bytes = 0
+        self._started = 0.0
+        self._owns_tracing = False
+
+    def start(self) -> None:
+        self._started = time.perf_counter()
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracing = True
+
+    def stop(self) -> None:
+        self.wall_seconds += time.perf_counter() - self._started
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+
+    def add_files(self, count: int) -> None:
+        self._files += count
+
+    def add_bytes(self, count: int) -> None:
+        self._bytes += count
+
+    def _read_bytes(self) -> int:
+        return self._bytes + (self.sniffer.bytes_read if self.sniffer else 0)
+
+    def _update_peak(self) -> None:
+        if not tracemalloc.is_tracing():
+            return
+        peak = tracemalloc.get_traced_memory()[1]
+        for frame in self._stack:
+            frame.peak = max(frame.peak, peak)
+        tracemalloc.reset_peak()
+
+    @contextmanager
+    def section(
+        self, kind: str, name: str, file: tp.Optional[Path] = None
+    ) -> tp.Iterator[None]:
+        """Measure a block as an analyzer run (kind="analyzer") or a phase."""
+        table = self.analyzers if kind == "analyzer" else self.phases
+        stats = table.setdefault(name, ProfileStats())
+        self._update_peak()
+        frame = _Frame(stats, self._files, self._read_bytes(), kind != "analyzer")
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            self._update_peak()
+            self._stack.pop()
+            seconds = time.perf_counter() - frame.start
+            files = self._files - frame.files
+            nbytes = self._read_bytes() - frame.bytes
+            stats.calls += 1
+            stats.peak_memory = max(stats.peak_memory, frame.peak)
+            if frame.exclusive:
+                stats.seconds += seconds - frame.child_seconds
+                stats.files += files - frame.child_files
+                stats.bytes_read += nbytes - frame.child_bytes
+                parent = next((f for f in reversed(self._stack) if f.exclusive), None)
+                if parent is not None:
+                    parent.child_seconds += seconds
+                    parent.child_files += files
+                    parent.child_bytes += nbytes
+            else:
+                stats.seconds += seconds
+                stats.files += files
+                stats.bytes_read += nbytes
+            if file is not None:
+                self._record_file((seconds, name, str(file)))
+
+    def _record_file(self, item: tuple[float, str, str]) -> None:
+        if len(self.slowest) < self.top:
+            heapq.heappush(self.slowest, item)
+        elif self.top:
+            heapq.heappushpop(self.slowest, item)
+
+    def report(self) -> dict[str, tp.Any]:
+        """Machine-readable summary, as written by write_json()."""
+        return {
+            "wall_seconds": self.wall_seconds,
+            "analyzers": {k: asdict(v) for k, v in self.analyzers.items()},
+            "phases": {k: asdict(v) for k, v in self.phases.items()},
+            "slowest_files": [
+                {"file": file, "phase": phase, "seconds": seconds}
+                for seconds, phase, file in sorted(self.slowest, reverse=True)
+            ],
+        }
+
+    def merge(self, report: dict[str, tp.Any]) -> None:
+        """Merge a report produced by a worker process."""
+        for table, key in ((self.analyzers, "analyzers"), (self.phases, "phases")):
+            for name, stats in report[key].items():
+                table.setdefault(name, ProfileStats()).merge(stats)
+        for item in report["slowest_files"]:
+            self._record_file((item["seconds"], item["phase"], item["file"]))
+
+    def write_json(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.report(), indent=2), encoding="utf-8")
+
+    def tables(self) -> list[Table]:
+        """Render the report as rich tables: analyzers, phases and slowest files."""
+        result = []
+        for title, table_stats in (
+            ("Анализаторы", self.analyzers),
+            ("Фазы", self.phases),
+        ):
+            table = Table(title=f"{title} (всего {self.wall_seconds:.3f} с)")
+            table.add_column("Имя", style="cyan", no_wrap=True)
+            for column in (
+                "Вызовы",
+                "Время, с",
+                "Файлы",
+                "Прочитано, КБ",
+                "Пик памяти, КБ",
+            ):
+                table.add_column(column, justify="right")
+            for name, stats in sorted(
+                table_stats.items(), key=lambda kv: kv[1].seconds, reverse=True
+            ):
+                table.add_row(
+                    name,
+                    str(stats.calls),
+                    f"{stats.seconds:.3f}",
+                    str(stats.files),
+                    f"{stats.bytes_read / 1024:.1f}",
+                    f"{stats.peak_memory / 1024:.1f}",
+                )
+            result.append(table)
+
+        table = Table(title="Самые медленные файлы")
+        table.add_column("Файл", style="green")
+        table.add_column("Фаза", style="cyan")
+        table.add_column("Время, с", justify="right")
+        for seconds, phase, file in sorted(self.slowest, reverse=True):
+            table.add_row(file, phase, f"{seconds:.4f}")
+        result.append(table)
+        return result
+
+
+def profiled(phase: str, reads_file: bool = False) -> tp.Callable[[F], F]:
+    """Attribute an analyzer method to a profiling phase.
+
+    When the first argument is a file it is also recorded for the slowest
+    files list; reads_file adds its size to the bytes read for methods that
+    parse the whole file without the ContentSniffer.
+    """
+
+    def decorator(method: F) -> F:
+        @functools.wraps(method)
+        def wrapper(self: tp.Any, *args: tp.Any, **kwargs: tp.Any) -> tp.Any:
+            profiler: tp.Optional[AnalysisProfiler] = self.profiler
+            if profiler is None:
+                return method(self, *args, **kwargs)
+            file = args[0] if args and isinstance(args[0], Path) else None
+            if file is not None and not file.is_file():
+                file = None
+            with profiler.section("phase", phase, file):
+                if reads_file and file is not None:
+                    profiler.add_bytes(file.stat().st_size)
+                return method(self, *args, **kwargs)
+
+        return tp.cast(F, wrapper)
+
+    return decorator
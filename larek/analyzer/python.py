@@ -2,14 +2,74 @@ import typing as tp
 from pathlib import Path
 from larek.analyzer import BaseAnalyzer
 from larek import models
+from larek.analyzer.probes import ProbeSet
+from larek.analyzer.profiling import profiled
 import re
 from typing import Tuple
 from rich.console import Console
 
 console = Console()
 
+# Entrypoint markers are probed in the bounded head/tail window; version-specific
+# syntax can sit anywhere in a module, so it is probed over the whole file.
+ENTRYPOINT_PROBES = ProbeSet(
+    literals={
+        "main_guard": [
+            b"if __name__ == '__main__':",
+            b'if __name__ == "__main__":',
+        ],
+        "run_call": [b"app.run(", b"manage.run(", b"application.run("],
+    },
+)
+SYNTAX_PROBES = ProbeSet(
+    literals={
+        "walrus_operator": [b":="],
+        "str_remove_methods": [b"removeprefix", b"removesuffix"],
+        "exception_group": [b"except*"],
+        "dict_name": [b"dict", b"Dict"],
+    },
+    patterns={
+        "match_statement": (rb"\bmatch\b.*\bcase\b", b"case"),
+        "union_operator": (rb"\w\s*\|\s*\w", b"|"),
+        "union_operator_in_types": (
+            rb"def\s+\w+\(.*\)\s*->\s*[^:]+?\s*\|\s*[^:]+?:",
+            b"->",
+        ),
+        "positional_only_args": (rb"def\s+\w+\([^)]*\/[^)]*\)", b"/"),
+    },
+)
+# SYNTAX_PROBES that are version features by themselves; union_operator and
+# dict_name only count together, as dict union operators
+SYNTAX_FEATURES = SYNTAX_PROBES.names - {"union_operator", "dict_name"}
+
 
 class PythonAnalyze(BaseAnalyzer):
+    ignored_dirs = frozenset({"dist", "build"})
+    ignored_files = frozenset({".gitignore", ".DS_Store"})
+    manifests = frozenset(
+        {
+            "requirements.txt",
+            "requirements-dev.txt",
+            "setup.py",
+            "setup.cfg",
+            "pyproject.toml",
+            "Pipfile",
+            "poetry.lock",
+        }
+    )
+    lockfiles = ("poetry.lock", "uv.lock", "Pipfile.lock", "requirements.txt")
+    reads = frozenset(
+        {
+            "setup.py",
+            "*.toml",
+            "*.cfg",
+            "*.ini",
+            "*requirements*.txt",
+            "Pipfile",
+            "Makefile",
+        }
+    )
+
     def __init__(self) -> None:
         super().__init__()
         self.configs: list[models.Config] = []
@@ -24,17 +84,8 @@ class PythonAnalyze(BaseAnalyzer):
             return None
 
         # Check if it's a Python project
-        python_indicators = [
-            "requirements.txt",
-            "requirements-dev.txt",
-            "setup.py",
-            "setup.cfg",
-            "pyproject.toml",
-            "Pipfile",
-            "poetry.lock",
-        ]
         has_python_files = any(
-            (root / indicator).exists() for indicator in python_indicators
+            (root / indicator).exists() for indicator in self.manifests
         )
         # has_py_files = bool(list(root.glob("**/*.py"))[:1])
 
@@ -78,41 +129,15 @@ class PythonAnalyze(BaseAnalyzer):
             linters=self.get_linters(root),
         )
 
-    def _scan(self, root: Path):
-        """Recursively scan directory for files, similar to Go/JS analyzers."""
-        for f in root.iterdir():
-            if f.is_file() and self._file_filter(f):
-                self._parse_file(f)
-            elif f.is_dir() and self._dir_filter(f):
-                self._scan(f)
-
-    def _file_filter(self, file: Path) -> bool:
-        """Filter out files that shouldn't be processed."""
-        match file.name:
-            case ".gitignore" | ".DS_Store" | "__pycache__" | ".pyc" | "*.pyc":
-                return False
-        return True
-
-    def _dir_filter(self, dir_path: Path) -> bool:
-        """Filter out directories that shouldn't be scanned."""
-        match dir_path.name:
-            case (
-                "vendor"
-                | "node_modules"
-                | "__pycache__"
-                | ".git"
-                | ".idea"
-                | ".vscode"
-                | ".pytest_cache"
-                | ".mypy_cache"
-                | ".tox"
-                | "dist"
-                | "build"
-                | "*.egg-info"
-                | ".eggs"
-            ):
-                return False
-        return True
+    def source_reads(self, root: Path) -> tp.Iterator[Path]:
+        """Entrypoint candidates, the files probed for syntax and the first test file."""
+        self.root_path = root
+        index = self._file_index(root)
+        for file in index.walk(root, self._dir_filter, self._file_filter):
+            if file.suffix == ".py" and self._is_potential_entrypoint(file):
+                yield file
+        yield from self._version_files(root)
+        yield from self._test_files(root)[:1]
 
     def _parse_file(self, file: Path):
         """Parse individual files to extract metadata."""
@@ -208,26 +233,25 @@ class PythonAnalyze(BaseAnalyzer):
 
     def _is_entrypoint(self, file: Path) -> bool:
         """Check if a Python file is an entrypoint."""
-        try:
-            content = file.read_text(encoding="utf-8", errors="ignore")
-            # Primary check: has __main__ guard
-            if "if __name__ == '__main__':" in content:
-                return True
-            # Secondary checks for framework-specific patterns
-            if any(
-                keyword in content
-                for keyword in [
-                    "app.run(",
-                    "app.run()",
-                    "manage.run(",
-                    "application.run(",
-                    'if __name__ == "__main__":',
-                ]
-            ):
-                return True
-        except Exception:
-            pass
-        return False
+        # __main__ guards and run() calls live at module level, near the
+        # start or the end of the file, so the bounded window is enough.
+        return bool(self._entrypoint_probes(file))
+
+    def _entrypoint_probes(self, file: Path) -> list[str]:
+        """Names of ENTRYPOINT_PROBES in the window of the file, cached per file."""
+        return self._cached(file, "entrypoint_probes", self._scan_entrypoint_probes)
+
+    @profiled("probes")
+    def _scan_entrypoint_probes(self, file: Path) -> list[str]:
+        return sorted(self._sniffer().scan(file, ENTRYPOINT_PROBES))
+
+    def _syntax_probes(self, file: Path) -> list[str]:
+        """Names of SYNTAX_PROBES found anywhere in the file, cached per file."""
+        return self._cached(file, "syntax_probes", self._scan_syntax_probes)
+
+    @profiled("probes")
+    def _scan_syntax_probes(self, file: Path) -> list[str]:
+        return sorted(self._sniffer().scan(file, SYNTAX_PROBES, full=True))
 
     def _is_config_file(self, file: Path) -> bool:
         """Check if a file is a configuration file."""
@@ -268,6 +292,7 @@ class PythonAnalyze(BaseAnalyzer):
             and file.suffix in [".py", ".yaml", ".yml", ".json"]
         )
 
+    @profiled("manifest")
     def get_packet_managers(self, root: Path) -> tp.Optional[str]:
         package_managers = [
             ("poetry", self._is_poetry_project),
@@ -330,7 +355,7 @@ class PythonAnalyze(BaseAnalyzer):
         return (root / "setup.py").exists() or (root / "setup.cfg").exists()
 
     def _is_requirements_project(self, root: Path) -> bool:
-        requirements_files = list(root.glob("requirements*.txt"))
+        requirements_files = self._file_index(root).files(root, "requirements*.txt")
         return bool(requirements_files and not self._has_modern_package_manager(root))
 
     def _has_modern_package_manager(self, root: Path) -> bool:
@@ -344,14 +369,15 @@ class PythonAnalyze(BaseAnalyzer):
         ]
         return any((root / indicator).exists() for indicator in modern_indicators)
 
+    @profiled("manifest")
     def get_libs(self, root) -> list[models.Lib]:
         """Parse dependencies from requirements.txt and other dependency files."""
-        libraries = []
+        libraries: list[models.LibSpec] = []
         seen = set()
 
         try:
             # Parse requirements.txt files
-            req_files = list(root.glob("**/requirements*.txt"))
+            req_files = self._file_index(root).rglob(root, "requirements*.txt")
             for file in req_files:
                 try:
                     with open(file, "r", encoding="utf-8", errors="ignore") as f:
@@ -367,9 +393,9 @@ class PythonAnalyze(BaseAnalyzer):
                                 and not line.startswith("http")
                             ):
                                 lib = self._parse_requirement_line(line)
-                                if lib and lib.name not in seen:
+                                if lib and lib[0] not in seen:
                                     libraries.append(lib)
-                                    seen.add(lib.name)
+                                    seen.add(lib[0])
                 except Exception as e:
                     console.print(f"[red]Ошибка при чтении {file}: {e}[/red]")
                     continue
@@ -395,9 +421,9 @@ class PythonAnalyze(BaseAnalyzer):
                                     + "="
                                     + line.split("=")[1].strip().strip('"').strip("'")
                                 )
-                                if lib and lib.name not in seen:
+                                if lib and lib[0] not in seen:
                                     libraries.append(lib)
-                                    seen.add(lib.name)
+                                    seen.add(lib[0])
                 except Exception:
                     pass
 
@@ -415,19 +441,19 @@ class PythonAnalyze(BaseAnalyzer):
                             line = line.strip().strip(",").strip('"').strip("'")
                             if line:
                                 lib = self._parse_requirement_line(line)
-                                if lib and lib.name not in seen:
+                                if lib and lib[0] not in seen:
                                     libraries.append(lib)
-                                    seen.add(lib.name)
+                                    seen.add(lib[0])
                 except Exception:
                     pass
 
         except Exception as e:
             console.print(f"[red]Ошибка при анализе зависимостей: {e}[/red]")
 
-        return libraries
+        return models.libs_from(libraries)
 
-    def _parse_requirement_line(self, line: str) -> tp.Optional[models.Lib]:
-        """Parse a single requirement line into a Lib object."""
+    def _parse_requirement_line(self, line: str) -> tp.Optional[models.LibSpec]:
+        """Parse a single requirement line into a (name, version) pair."""
         line = line.strip().strip('"').strip("'")
         if not line or line.startswith("#"):
             return None
@@ -464,8 +490,9 @@ class PythonAnalyze(BaseAnalyzer):
         if not name:
             return None
 
-        return models.Lib(name=name, version=version)
+        return name, version
 
+    @profiled("tests")
     def detected_tests(self, root) -> str:
         test_commands = []
         config_files = {
@@ -517,7 +544,7 @@ class PythonAnalyze(BaseAnalyzer):
             except:
                 pass
 
-        python_files = list(root.glob("**/test_*.py")) + list(root.glob("**/*_test.py"))
+        python_files = self._test_files(root)
         if python_files:
             try:
                 if "unittest" in python_files[0].read_text():
@@ -527,6 +554,7 @@ class PythonAnalyze(BaseAnalyzer):
 
         return test_commands[0] if test_commands else ""
 
+    @profiled("linters")
     def get_linters(self, root: Path) -> list[models.Linter]:
 
         detected_linters = set()
@@ -742,6 +770,7 @@ class PythonAnalyze(BaseAnalyzer):
         # Fallback to default if we can't parse it
         return "3.11"
 
+    @profiled("version")
     def detect_python_version_by_syntax(self, root) -> str:
         version_features = {
             (3, 8): [
@@ -774,33 +803,8 @@ class PythonAnalyze(BaseAnalyzer):
         }
 
         found_features: tp.Set[str] = set()
-        py_files = list(root.glob("**/*.py"))[:30]
-
-        for py_file in py_files:
-            if py_file.is_file():
-                try:
-                    content = py_file.read_text(encoding="utf-8")
-                    if ":=" in content:
-                        found_features.add("walrus_operator")
-                    if re.search(r"\bmatch\b.*\bcase\b", content):
-                        found_features.add("match_statement")
-                    if "removeprefix" in content or "removesuffix" in content:
-                        found_features.add("str_remove_methods")
-                    if re.search(r"\w+\s*\|\s*\w+", content) and any(
-                        word in content for word in ["dict", "Dict", "typing.Dict"]
-                    ):
-                        found_features.add("dict_union_operators")
-                    if re.search(
-                        r"def\s+\w+\(.*\)\s*->\s*[^:]+?\s*\|\s*[^:]+?:", content
-                    ):
-                        found_features.add("union_operator_in_types")
-                    if "except*" in content:
-                        found_features.add("exception_group")
-                    if re.search(r"def\s+\w+\([^)]*\/[^)]*\)", content):
-                        found_features.add("positional_only_args")
-
-                except (UnicodeDecodeError, Exception):
-                    continue
+        for py_file in self._version_files(root):
+            found_features.update(self._syntax_features(py_file))
         min_version: Tuple[int, int] = (3, 7)
         major, minor = min_version
         sorted_versions = sorted(version_features.keys())
@@ -814,6 +818,22 @@ class PythonAnalyze(BaseAnalyzer):
         else:
             return "Python 3.7+"
 
+    def _version_files(self, root: Path) -> list[Path]:
+        """Python files probed for version-specific syntax."""
+        return self._file_index(root).rglob(root, "*.py")[:30]
+
+    def _test_files(self, root: Path) -> list[Path]:
+        index = self._file_index(root)
+        return index.rglob(root, "test_*.py") + index.rglob(root, "*_test.py")
+
+    def _syntax_features(self, py_file: Path) -> set[str]:
+        """Collect version-specific syntax features used in a Python file."""
+        probes = set(self._syntax_probes(py_file))
+        found_features = probes & SYNTAX_FEATURES
+        if {"union_operator", "dict_name"} <= probes:
+            found_features.add("dict_union_operators")
+        return found_features
+
     def _has_test_config(self, config_path: Path) -> bool:
         try:
             content = config_path.read_text()
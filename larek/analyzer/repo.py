@@ -1,67 +1,376 @@
+import json
 import typing as tp
 import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 from larek.analyzer import BaseAnalyzer
+from larek.analyzer import gitobjects
+from larek.analyzer.cache import AnalysisCache
+from larek.analyzer.index import FileIndex, ensure_index, find_repo_root
+from larek.analyzer.profiling import AnalysisProfiler
+from larek.analyzer.sniff import ContentSniffer
 from larek import models
 
+if tp.TYPE_CHECKING:
+    from larek.analyzer.remote import GitLabSource
+
+
+def _analyze_directory(
+    analyzers: list[tp.Callable[[], BaseAnalyzer]],
+    index: tp.Optional[FileIndex],
+    cache: tp.Optional[AnalysisCache],
+    sniffer: ContentSniffer,
+    profiler: tp.Optional[AnalysisProfiler],
+    root: Path,
+) -> tp.Optional[models.Service]:
+    """Run the registered analyzers on root and return the first detected service.
+
+    Analyzers whose ``detect`` rejects the file names of root are never
+    instantiated.
+    """
+    index = ensure_index(index, root)
+    names = {name for name, is_dir in index.listing(root) if not is_dir}
+    for get_analyzer in analyzers:
+        detect = getattr(get_analyzer, "detect", None)
+        if detect is not None and not detect(names):
+            continue
+        analyzer = get_analyzer()
+        analyzer.index = index
+        analyzer.cache = cache
+        analyzer.sniffer = sniffer
+        analyzer.profiler = profiler
+        if profiler is not None:
+            with profiler.section("analyzer", type(analyzer).__name__):
+                service = analyzer.analyze(root)
+        else:
+            service = analyzer.analyze(root)
+        if service is not None:
+            service.lockfiles = _present(index, root, analyzer.lockfiles)
+            return service
+    return None
+
+
+def _present(index: FileIndex, root: Path, names: tp.Iterable[str]) -> list[str]:
+    """The files of names, relative to root, that the index lists."""
+    return [
+        name for name in names if index.files((root / name).parent, Path(name).name)
+    ]
+
+
+def _analyze_directory_job(
+    analyzers: list[tp.Callable[[], BaseAnalyzer]],
+    index: tp.Optional[FileIndex],
+    cache: tp.Optional[AnalysisCache],
+    profile_top: tp.Optional[int],
+    root: Path,
+) -> tuple[
+    tp.Optional[models.Service],
+    dict[str, tp.Any],
+    dict[str, int],
+    tp.Optional[dict[str, tp.Any]],
+]:
+    """Worker-process entry point: also returns cache entries, read counters
+    and, when profiling, the worker's profile report."""
+    sniffer = ContentSniffer()
+    profiler = None
+    if profile_top is not None:
+        profiler = AnalysisProfiler(top=profile_top, sniffer=sniffer)
+        profiler.start()
+    service = _analyze_directory(analyzers, index, cache, sniffer, profiler, root)
+    report = None
+    if profiler is not None:
+        profiler.stop()
+        report = profiler.report()
+    return (
+        service,
+        cache.touched() if cache is not None else {},
+        sniffer.stats(),
+        report,
+    )
+
+
+def _relocate(schema: models.RepoSchema, src: Path, dest: Path) -> models.RepoSchema:
+    """Rewrite every path under src in schema to the same path under dest.
+
+    With dest "." paths become relative, as Path(".") / name would be.
+    """
+    dumped = schema.model_dump_json()
+    # paths are replaced in their JSON-escaped form
+    old = json.dumps(str(src))[1:-1]
+    new = json.dumps(str(dest))[1:-1]
+    dumped = dumped.replace(old + "/", "" if new == "." else new + "/")
+    return models.RepoSchema.model_validate_json(dumped.replace(old, new))
+
 
 class RepoAnalyzer:
-    """Анализатор репозитория, который использует разные анализаторы языков."""
+    """Анализатор репозитория, который использует разные анализаторы языков.
+
+    При ``max_workers > 1`` директории монорепозитория анализируются
+    параллельно в пуле процессов; порядок сервисов в результате совпадает
+    с последовательным режимом. При ``use_cache=True`` факты о файлах
+    сохраняются в ``.larek/cache/`` и переиспользуются при повторном анализе.
+    При ``use_git_index=True`` список файлов берётся из индекса git
+    (только отслеживаемые файлы), а для путей вне git — обходом дерева.
+
+    Если корень не является сервисом, сервисы ищутся на любой глубине:
+    кандидаты — директории с манифестом одного из анализаторов (``go.mod``,
+    ``package.json``, ``pom.xml``, ...), найденные одним проходом по индексу.
+    Сервисом владеет верхняя директория: вложенные манифесты внутри
+    найденного сервиса (например, ``web/package.json`` в Go-сервисе)
+    отдельными сервисами не считаются.
 
-    def __init__(self) -> None:
+    При ``profile=True`` собирается профиль анализа (``self.profiler``):
+    время, число файлов, прочитанные байты и пик памяти по анализаторам
+    и фазам, а также ``profile_top`` самых медленных файлов.
+
+    ``analyze_git`` анализирует коммит напрямую из объектов git (в том
+    числе в bare- и частичном клоне) без checkout, а ``analyze_gitlab`` —
+    проект GitLab через API репозитория без клонирования. На диск
+    выводится только дерево, а содержимое — лишь у файлов, которые могут
+    прочитать анализаторы (``BaseAnalyzer.reads``).
+    """
+
+    def __init__(
+        self,
+        max_workers: tp.Optional[int] = None,
+        use_cache: bool = False,
+        use_git_index: bool = False,
+        profile: bool = False,
+        profile_top: int = 10,
+    ) -> None:
         self.analyzers: list[tp.Callable[[], BaseAnalyzer]] = []
+        self.index: tp.Optional[FileIndex] = None
+        self.cache: tp.Optional[AnalysisCache] = None
+        self.sniffer = ContentSniffer()  # read counters of the last analyze() run
+        self.max_workers = max_workers
+        self.use_cache = use_cache
+        self.use_git_index = use_git_index
+        self.profile = profile
+        self.profile_top = profile_top
+        self.profiler: tp.Optional[AnalysisProfiler] = None
 
     def register_analyzer(self, analyzer: tp.Callable[[], BaseAnalyzer]) -> None:
         """Регистрация нового анализатора языка."""
         self.analyzers.append(analyzer)
 
-    def analyze(self, root: Path) -> models.RepoSchema:
-        """Анализ репозитория и сбор информации о сервисах."""
+    def analyze(
+        self, root: Path, index: tp.Optional[FileIndex] = None
+    ) -> models.RepoSchema:
+        """Анализ репозитория и сбор информации о сервисах.
+
+        A prebuilt index of root replaces the usual tree walk.
+        """
+
+        self.sniffer = ContentSniffer()
+        self.profiler = None
+        if self.profile:
+            self.profiler = AnalysisProfiler(top=self.profile_top, sniffer=self.sniffer)
+            self.profiler.start()
+
+        self.index = index
+        if index is None:
+            with self._phase("index"):
+                self.index = FileIndex.collect(root, use_git=self.use_git_index)
+        self.cache = AnalysisCache.load(root) if self.use_cache else None
 
         deployment = self._find_deployment_info(root, self._find_environment_vars(root))
 
-        dirs = [d for d in root.iterdir() if d.is_dir() and self._file_filter(d)]
         services: list[models.Service] = []
 
         is_monorepo = False
-        for get_analyzer in self.analyzers:
-            analyzer = get_analyzer()
-            service = analyzer.analyze(root)
-            if service is not None:
-                services.append(service)
-                break
+        service = _analyze_directory(
+            self.analyzers, self.index, self.cache, self.sniffer, self.profiler, root
+        )
+        if service is not None:
+            services.append(service)
         else:
-            for d in dirs:
-                for get_analyzer in self.analyzers:
-                    analyzer = get_analyzer()
-                    service = analyzer.analyze(d)
-                    if service is not None:
-                        services.append(service)
-                        break
+            services = self._discover_services(root)
             if len(services) > 1:
                 is_monorepo = True
 
+        if self.cache is not None:
+            self.cache.save()
+        if self.profiler is not None:
+            self.profiler.stop()
 
         return models.RepoSchema(
             is_monorepo=is_monorepo,
             services=services,
             deployment=deployment,
+            root=find_repo_root(root) or root,
+        )
+
+    def analyze_git(self, repo: Path, rev: str = "HEAD") -> models.RepoSchema:
+        """Analyze commit rev of the git repository at repo without a checkout.
+
+        Paths in the result point into repo as if it were a checkout of rev.
+        """
+        return self._analyze_tree(
+            gitobjects.checkout_name(repo),
+            repo,
+            lambda dest, reads, select: gitobjects.materialize(
+                repo, rev, dest, reads, select=select
+            ),
+        )
+
+    def analyze_gitlab(
+        self, source: "GitLabSource", root: tp.Optional[Path] = None
+    ) -> models.RepoSchema:
+        """Analyze a GitLab project over its repository API without cloning.
+
+        Paths in the result point into root, by default the directory a
+        clone of the project would get.
+        """
+        root = root if root is not None else Path(source.name)
+        return self._analyze_tree(
+            source.name,
+            root,
+            lambda dest, reads, select: gitobjects.write_tree(
+                source.list_tree(), dest, reads, source.fetch, select
+            ),
         )
 
-    def _file_filter(self, file: Path) -> bool:
-        match file.name:
-            case (
-                ".gitignore"
-                | ".git"
-                | "vendor/"
-                | "node_modules/"
-                | "__pycache__/"
-                | ".idea/"
-                | ".vscode/"
-                | ".venv/"
-            ):
-                return False
-        return True
+    def _analyze_tree(
+        self,
+        name: str,
+        root: Path,
+        lay_out: tp.Callable[
+            [Path, tp.Optional[set[str]], gitobjects.Selector], FileIndex
+        ],
+    ) -> models.RepoSchema:
+        """Analyze a tree that lay_out writes into a temporary directory.
+
+        Only files the registered analyzers may open get their content:
+        manifests by name (BaseAnalyzer.reads) and, in every candidate
+        service directory, the sources the analyzer picks from the listing
+        (BaseAnalyzer.source_reads). The per-file cache is not used here.
+        """
+        reads: tp.Optional[set[str]] = set()
+        for analyzer in self.analyzers:
+            patterns = getattr(analyzer, "reads", None)
+            if patterns is None:
+                reads = None
+                break
+            reads.update(patterns)
+
+        use_cache = self.use_cache
+        self.use_cache = False
+        try:
+            with tempfile.TemporaryDirectory(prefix="larek-tree-") as tmp:
+                dest = Path(tmp) / name
+                index = lay_out(
+                    dest, reads, lambda index: self._source_reads(index, dest)
+                )
+                schema = self.analyze(dest, index)
+                self.index = None
+                return _relocate(schema, dest, root)
+        finally:
+            self.use_cache = use_cache
+
+    def _source_reads(self, index: FileIndex, root: Path) -> tp.Iterator[Path]:
+        """Sources the analyzers may open in root and every candidate directory."""
+        analyzers = [get_analyzer() for get_analyzer in self.analyzers]
+        manifests: set[str] = set()
+        for analyzer in analyzers:
+            manifests.update(analyzer.manifests)
+        for d in dict.fromkeys([root, *index.find_dirs(root, manifests)]):
+            names = {name for name, is_dir in index.listing(d) if not is_dir}
+            for analyzer in analyzers:
+                if type(analyzer).detect(names):
+                    analyzer.index = index
+                    yield from analyzer.source_reads(d)
+
+    def _discover_services(self, root: Path) -> list[models.Service]:
+        """Find services below root at any depth, the topmost one owning its subtree."""
+        manifests: set[str] = set()
+        for analyzer in self.analyzers:
+            manifests.update(getattr(analyzer, "manifests", ()))
+        # ignored directories (vendor, node_modules, .venv, ...) are already pruned
+        with self._phase("discovery"):
+            # sorted paths keep parents ahead of their subdirectories, so the
+            # topmost service wins and names are deduplicated in a stable order
+            candidates = sorted(self._file_index(root).find_dirs(root, manifests))
+
+        # directories inside a detected service come back as None
+        services = [s for s in self._analyze_dirs(candidates) if s is not None]
+        self._deduplicate_names(services, root)
+        return services
+
+    @staticmethod
+    def _deduplicate_names(services: list[models.Service], root: Path) -> None:
+        """Name services that share a directory name after their path, e.g. billing-api."""
+        counts: dict[str, int] = {}
+        for service in services:
+            counts[service.name] = counts.get(service.name, 0) + 1
+        for service in services:
+            if counts[service.name] > 1:
+                service.name = "-".join(service.path.relative_to(root).parts)
+
+    def _analyze_dirs(self, dirs: list[Path]) -> list[tp.Optional[models.Service]]:
+        """Analyze candidate directories, in a process pool when max_workers > 1.
+
+        Dirs are expected parents first. Directories inside an already
+        detected service are skipped. The pool runs in waves by depth: the
+        topmost pending directories first, then the nested ones that are not
+        inside a service found by an earlier wave. Each worker receives only
+        the part of the index and cache below its directory. Results are
+        returned in the order of dirs regardless of completion order.
+        """
+        workers = min(self.max_workers or 1, len(dirs))
+        results: dict[Path, tp.Optional[models.Service]] = {}
+        owners: list[Path] = []
+        if workers <= 1:
+            for d in dirs:
+                if any(owner in d.parents for owner in owners):
+                    continue
+                service = _analyze_directory(
+                    self.analyzers,
+                    self.index,
+                    self.cache,
+                    self.sniffer,
+                    self.profiler,
+                    d,
+                )
+                if service is not None:
+                    owners.append(d)
+                results[d] = service
+            return [results.get(d) for d in dirs]
+
+        pending = list(dirs)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            while pending:
+                waiting = set(pending)
+                wave = [d for d in pending if waiting.isdisjoint(d.parents)]
+                futures = [
+                    pool.submit(
+                        _analyze_directory_job,
+                        self.analyzers,
+                        self.index.subtree(d) if self.index else None,
+                        self.cache.subset(d) if self.cache else None,
+                        self.profile_top if self.profiler is not None else None,
+                        d,
+                    )
+                    for d in wave
+                ]
+                for d, future in zip(wave, futures):
+                    service, cache_entries, sniff_stats, report = future.result()
+                    if self.cache is not None:
+                        self.cache.merge(cache_entries)
+                    self.sniffer.merge(sniff_stats)
+                    if self.profiler is not None and report is not None:
+                        self.profiler.merge(report)
+                    if service is not None:
+                        owners.append(d)
+                    results[d] = service
+                done = set(wave)
+                pending = [
+                    d
+                    for d in pending
+                    if d not in done and not any(o in d.parents for o in owners)
+                ]
+        return [results.get(d) for d in dirs]
 
     def _find_deployment_info(
         self, root: Path, env: list[models.Environment]
@@ -81,31 +390,43 @@ class RepoAnalyzer:
                 environment=env,
             )
         else:
-            for d in root.iterdir():
-                if d.is_dir():
-                    for chart in d.glob("Chart.y*ml"):
-                        return models.Deployment(
-                            type="helm",
-                            path=str(chart),
-                            environment=env,
-                        )
+            index = self._file_index(root)
+            for d in index.dirs(root):
+                for chart in index.files(d, "Chart.y*ml"):
+                    return models.Deployment(
+                        type="helm",
+                        path=str(chart),
+                        environment=env,
+                    )
         return None
 
     def _find_environment_vars(self, root: Path) -> list[models.Environment]:
         env_vars: list[models.Environment] = []
-        env_files = root.glob("*.env")
+        index = self._file_index(root)
+        env_files = index.files(root, "*.env")
         for env_file in env_files:
             environment = models.Environment(
                 name=env_file.name,
                 path=str(env_file),
             )
             env_vars.append(environment)
-        for d in root.iterdir():
-            if d.is_dir():
-                for values_file in d.glob("values.y*ml"):
-                    environment = models.Environment(
-                        name=values_file.name,
-                        path=str(values_file),
-                    )
-                    env_vars.append(environment)
+        for d in index.dirs(root):
+            for values_file in index.files(d, "values.y*ml"):
+                environment = models.Environment(
+                    name=values_file.name,
+                    path=str(values_file),
+                )
+                env_vars.append(environment)
         return env_vars
+
+    @contextmanager
+    def _phase(self, name: str) -> tp.Iterator[None]:
+        if self.profiler is None:
+            yield
+            return
+        with self.profiler.section("phase", name):
+            yield
+
+    def _file_index(self, root: Path) -> FileIndex:
+        self.index = ensure_index(self.index, root)
+        return self.index
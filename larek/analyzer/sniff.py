@@ -0,0 +1,139 @@
+"""Ограниченное чтение содержимого файлов для эвристических проверок."""
+
+import mmap
+import os
+import typing as tp
+from contextlib import contextmanager
+from pathlib import Path
+
+if tp.TYPE_CHECKING:
+    from .probes import ProbeSet
+
+# Files with a NUL byte in the first BINARY_PROBE bytes are treated as binary.
+BINARY_PROBE = 8192
+# Default window: most markers (imports, __main__ guards, run calls) sit near
+# the start or the end of a source file.
+HEAD_BYTES = 64 * 1024
+TAIL_BYTES = 16 * 1024
+# Full reads of files above this size go through mmap instead of read().
+MMAP_THRESHOLD = 1024 * 1024
+
+Buffer = tp.Union[bytes, mmap.mmap]
+
+
+def is_binary(chunk: tp.Union[bytes, Buffer]) -> bool:
+    """Check a leading chunk of a file for NUL bytes."""
+    return b"\0" in chunk[:BINARY_PROBE]
+
+
+class ContentSniffer:
+    """Чтение содержимого файлов без декодирования и с ограничением объёма.
+
+    В режиме окна читаются только начало и конец файла (``head`` и
+    ``tail`` байт), в полном режиме большие файлы отображаются через
+    ``mmap``. Бинарные файлы пропускаются. Счётчики ``bytes_read``,
+    ``bytes_mapped``, ``files_read`` и ``binary_skipped`` позволяют оценить
+    объём прочитанных данных.
+    """
+
+    def __init__(
+        self,
+        head: int = HEAD_BYTES,
+        tail: int = TAIL_BYTES,
+        mmap_threshold: int = MMAP_THRESHOLD,
+    ) -> None:
+        self.head = head
+        self.tail = tail
+        self.mmap_threshold = mmap_threshold
+        self.files_read = 0
+        self.bytes_read = 0
+        self.bytes_mapped = 0
+        self.binary_skipped = 0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "files_read": self.files_read,
+            "bytes_read": self.bytes_read,
+            "bytes_mapped": self.bytes_mapped,
+            "binary_skipped": self.binary_skipped,
+        }
+
+    def merge(self, stats: dict[str, int]) -> None:
+        """Add counters reported by a worker process."""
+        self.files_read += stats.get("files_read", 0)
+        self.bytes_read += stats.get("bytes_read", 0)
+        self.bytes_mapped += stats.get("bytes_mapped", 0)
+        self.binary_skipped += stats.get("binary_skipped", 0)
+
+    def window(self, path: Path) -> tp.Optional[bytes]:
+        """Return the head and tail of a text file joined by a newline.
+
+        Files no larger than head + tail are returned whole. Returns None
+        for binary or unreadable files.
+        """
+        try:
+            with open(path, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                if size <= self.head + self.tail:
+                    data = f.read()
+                else:
+                    data = f.read(self.head)
+                    if not is_binary(data):
+                        f.seek(size - self.tail)
+                        data += b"\n" + f.read(self.tail)
+        except OSError:
+            return None
+        return self._accept(data, len(data))
+
+    @contextmanager
+    def full(self, path: Path) -> tp.Iterator[tp.Optional[Buffer]]:
+        """Yield the whole content of a text file, memory-mapped when it is large.
+
+        Yields None for binary or unreadable files. The buffer is only valid
+        inside the with block.
+        """
+        try:
+            f = open(path, "rb")
+        except OSError:
+            yield None
+            return
+        with f:
+            try:
+                size = os.fstat(f.fileno()).st_size
+                if size < self.mmap_threshold:
+                    yield self._accept(f.read(), size)
+                    return
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                yield None
+                return
+            with mm:
+                if self._accept(mm, 0) is None:
+                    yield None
+                    return
+                self.bytes_mapped += size
+                yield mm
+
+    def contains(self, path: Path, *needles: bytes, full: bool = False) -> bool:
+        """Check whether any of needles occurs in the file."""
+        if not full:
+            data = self.window(path)
+            return data is not None and any(n in data for n in needles)
+        with self.full(path) as buf:
+            return buf is not None and any(buf.find(n) != -1 for n in needles)
+
+    def scan(self, path: Path, probes: "ProbeSet", full: bool = False) -> set[str]:
+        """Run all probes over the file content at once."""
+        if not full:
+            data = self.window(path)
+            return probes.scan(data) if data is not None else set()
+        with self.full(path) as buf:
+            return probes.scan(buf) if buf is not None else set()
+
+    def _accept(self, data: Buffer, nbytes: int) -> tp.Optional[Buffer]:
+        if is_binary(data):
+            self.binary_skipped += 1
+            return None
+        self.files_read += 1
+        self.bytes_read += nbytes
+        return data
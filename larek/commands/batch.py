@@ -0,0 +1,276 @@
+"""Команда пакетного анализа множества репозиториев в одном процессе."""
+
+import json
+import os
+import pathlib
+import time
+import typing as tp
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from larek.analyzer import repo, go, java, kotlin, javascript, python
+from larek.models.serialize import write_yaml_file
+
+console = Console()
+
+CHECKPOINT_FILE = "checkpoint.jsonl"
+SUMMARY_FILE = "summary.json"
+
+
+def parse_shard(raw: tp.Optional[str]) -> tuple[int, int]:
+    """Parse "i/N" into a zero-based shard index and a shard count."""
+    if raw is None:
+        return 0, 1
+    try:
+        index, count = (int(part) for part in raw.split("/"))
+    except ValueError:
+        raise typer.BadParameter("ожидается формат i/N, например 0/4")
+    if count < 1 or not 0 <= index < count:
+        raise typer.BadParameter("ожидается 0 <= i < N")
+    return index, count
+
+
+def collect_repos(source: pathlib.Path) -> list[tuple[str, pathlib.Path]]:
+    """Return (name, path) pairs from a directory of repositories or a list file.
+
+    A directory contributes each of its subdirectories. A file lists one
+    repository path per line; blank lines and lines starting with # are
+    skipped. Names are the directory names, prefixed with the parent
+    directory when two repositories share a name.
+    """
+    if source.is_dir():
+        paths = sorted(
+            p for p in source.iterdir() if p.is_dir() and not p.name.startswith(".")
+        )
+    else:
+        paths = []
+        for line in source.read_text(encoding="utf-8").splitlines():
+            line = line.strip()
+            if line and not line.startswith("#"):
+                paths.append(pathlib.Path(line))
+
+    counts: dict[str, int] = {}
+    for p in paths:
+        counts[p.name] = counts.get(p.name, 0) + 1
+    return [
+        (p.name if counts[p.name] == 1 else f"{p.parent.name}__{p.name}", p)
+        for p in paths
+    ]
+
+
+def in_shard(name: str, index: int, count: int) -> bool:
+    """Stable shard membership: a repository keeps its shard when the list changes."""
+    return zlib.crc32(name.encode()) % count == index
+
+
+def load_checkpoint(path: pathlib.Path) -> dict[str, dict[str, tp.Any]]:
+    """Latest recorded result per repository; a torn last line is ignored."""
+    done: dict[str, dict[str, tp.Any]] = {}
+    if not path.exists():
+        return done
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            done[entry["repo"]] = entry
+    return done
+
+
+def analyze_repo(
+    name: str,
+    repo_path: str,
+    output_dir: str,
+    use_cache: bool,
+    use_git_index: bool,
+    rev: tp.Optional[str] = None,
+) -> dict[str, tp.Any]:
+    """Analyze one repository and write <output_dir>/<name>.build.yaml.
+
+    Runs inside worker processes; errors are reported in the result
+    instead of being raised so one broken repository does not stop the batch.
+    """
+    started = time.perf_counter()
+    result: dict[str, tp.Any] = {"repo": name, "path": repo_path}
+    try:
+        repo_analyzer = repo.RepoAnalyzer(
+            use_cache=use_cache, use_git_index=use_git_index
+        )
+        repo_analyzer.register_analyzer(go.GoAnalyzer)
+        repo_analyzer.register_analyzer(java.JavaAnalyzer)
+        repo_analyzer.register_analyzer(kotlin.KotlinAnalyzer)
+        repo_analyzer.register_analyzer(javascript.JavaScriptAnalyzer)
+        repo_analyzer.register_analyzer(python.PythonAnalyze)
+        if rev is not None:
+            repo_schema = repo_analyzer.analyze_git(pathlib.Path(repo_path), rev)
+        else:
+            repo_schema = repo_analyzer.analyze(pathlib.Path(repo_path))
+
+        build_path = pathlib.Path(output_dir) / f"{name}.build.yaml"
+        write_yaml_file(build_path, repo_schema)
+        result.update(
+            status="ok",
+            output=str(build_path),
+            is_monorepo=repo_schema.is_monorepo,
+            services=len(repo_schema.services),
+            languages=sorted({s.lang.name for s in repo_schema.services}),
+        )
+    except Exception as e:
+        result.update(status="error", error=f"{type(e).__name__}: {e}")
+    result["seconds"] = time.perf_counter() - started
+    return result
+
+
+def write_summary(
+    path: pathlib.Path, results: list[dict[str, tp.Any]], seconds: float
+) -> dict[str, tp.Any]:
+    languages: dict[str, int] = {}
+    for r in results:
+        for lang in r.get("languages", []):
+            languages[lang] = languages.get(lang, 0) + 1
+    ok = [r for r in results if r["status"] == "ok"]
+    summary = {
+        "repos": len(results),
+        "ok": len(ok),
+        "failed": len(results) - len(ok),
+        "monorepos": sum(1 for r in ok if r.get("is_monorepo")),
+        "services": sum(r.get("services", 0) for r in ok),
+        "languages": dict(sorted(languages.items())),
+        "analysis_seconds": sum(r["seconds"] for r in results),
+        "wall_seconds": seconds,
+        "results": sorted(results, key=lambda r: r["repo"]),
+    }
+    path.write_text(
+        json.dumps(summary, indent=2, ensure_ascii=False), encoding="utf-8"
+    )
+    return summary
+
+
+def analyze_batch(
+    source: str = typer.Argument(
+        ...,
+        help="Директория с репозиториями или файл со списком путей "
+        "(по одному на строку)",
+    ),
+    output: str = typer.Option(
+        "results/batch",
+        "--output",
+        "-o",
+        help="Директория для build-файлов, чекпоинта и сводки",
+    ),
+    jobs: int = typer.Option(
+        os.cpu_count() or 1,
+        "--jobs",
+        "-j",
+        min=1,
+        help="Количество процессов для анализа репозиториев",
+    ),
+    shard: tp.Optional[str] = typer.Option(
+        None,
+        "--shard",
+        help="Обработать только часть репозиториев: i/N (i от 0)",
+    ),
+    resume: bool = typer.Option(
+        True,
+        "--resume/--no-resume",
+        help="Пропускать репозитории, успешно обработанные в прошлых запусках",
+    ),
+    use_cache: bool = typer.Option(
+        False,
+        "--cache/--no-cache",
+        help="Использовать кэш анализа файлов в .larek/cache/ каждого репозитория",
+    ),
+    git_index: bool = typer.Option(
+        False,
+        "--git-index",
+        help="Брать список файлов из индекса git вместо обхода директорий",
+    ),
+    rev: tp.Optional[str] = typer.Option(
+        None,
+        "--rev",
+        help="Анализировать коммит прямо из объектов git, без checkout",
+    ),
+):
+    """
+    Пакетный анализ множества репозиториев в одном процессе.
+
+    Для каждого репозитория пишется <output>/<repo>.build.yaml, по мере
+    готовности результаты дописываются в <output>/checkpoint.jsonl, а в
+    конце формируется <output>/summary.json.
+
+    Пример использования:
+        larek analyze-batch sample/go --output results/go --jobs 8
+        larek analyze-batch repos.txt --shard 0/4
+        larek analyze-batch bare-clones/ --rev HEAD
+    """
+    shard_index, shard_count = parse_shard(shard)
+    source_path = pathlib.Path(source)
+    if not source_path.exists():
+        console.print(f"[red]Ошибка: не найден путь {source_path}[/red]")
+        raise typer.Exit(code=1)
+
+    output_dir = pathlib.Path(output)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    checkpoint_path = output_dir / CHECKPOINT_FILE
+    if not resume and checkpoint_path.exists():
+        checkpoint_path.unlink()
+
+    repos = [
+        (name, path)
+        for name, path in collect_repos(source_path)
+        if in_shard(name, shard_index, shard_count)
+    ]
+    done = load_checkpoint(checkpoint_path)
+    pending = [(n, p) for n, p in repos if done.get(n, {}).get("status") != "ok"]
+    console.print(
+        f"[green]▶️ Репозиториев в шарде {shard_index}/{shard_count}:[/green] "
+        f"{len(repos)}, [blue]к анализу:[/blue] {len(pending)}"
+    )
+
+    started = time.perf_counter()
+    with open(checkpoint_path, "a", encoding="utf-8") as checkpoint:
+
+        def record(result: dict[str, tp.Any]) -> None:
+            done[result["repo"]] = result
+            checkpoint.write(json.dumps(result, ensure_ascii=False) + "\n")
+            checkpoint.flush()
+            if result["status"] == "ok":
+                console.print(
+                    f"[green]✔[/green] {result['repo']}: "
+                    f"сервисов {result['services']} ({result['seconds']:.2f} с)"
+                )
+            else:
+                console.print(f"[red]✖[/red] {result['repo']}: {result['error']}")
+
+        args = [
+            (n, str(p), str(output_dir), use_cache, git_index, rev)
+            for n, p in pending
+        ]
+        if jobs <= 1:
+            for a in args:
+                record(analyze_repo(*a))
+        else:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                futures = [pool.submit(analyze_repo, *a) for a in args]
+                for future in as_completed(futures):
+                    record(future.result())
+
+    results = [done[name] for name, _ in repos if name in done]
+    summary = write_summary(
+        output_dir / SUMMARY_FILE, results, time.perf_counter() - started
+    )
+
+    table = Table(title="Сводка пакетного анализа")
+    table.add_column("Показатель", style="cyan")
+    table.add_column("Значение", justify="right")
+    for key in ("repos", "ok", "failed", "monorepos", "services"):
+        table.add_row(key, str(summary[key]))
+    table.add_row("analysis_seconds", f"{summary['analysis_seconds']:.2f}")
+    table.add_row("wall_seconds", f"{summary['wall_seconds']:.2f}")
+    console.print(table)
+    console.print(f"[blue]Сводка записана в файл:[/blue] {output_dir / SUMMARY_FILE}")
@@ -3,6 +3,8 @@ import shutil
 import subprocess
 from rich.console import Console
 
+from larek.models.serialize import SIDECAR_DIR, clear_sidecars
+
 console = Console()
 
 
@@ -59,3 +61,6 @@ def clear():
             )
         except OSError as e:
             console.print(f"[red]Error removing volume {vol}:[/red] {e}")
+
+    console.print(f"[yellow]Removing build.yaml sidecars:[/yellow] {SIDECAR_DIR}")
+    clear_sidecars()
@@ -1,42 +1,20 @@
 import typer
 import pathlib
-import pydantic_yaml
-import yaml
 import os
-import pathlib
+import typing as tp
+from gitlab.exceptions import GitlabError
 from rich.console import Console
 from larek.analyzer import repo, go, java, kotlin, javascript, python
+from larek.analyzer.gitobjects import GitError
+from larek.analyzer.remote import GitLabSource
+from larek.models.serialize import write_yaml_file
+from larek.utils.gitlab_auth import get_authenticated_client
 
 
 app = typer.Typer(help="Дебаг анализа репозитория")
 console = Console()
 
 
-def write_yaml_file(path: pathlib.Path, model) -> None:
-    """Write pydantic model to YAML file with wide line width to prevent wrapping."""
-    yaml_str = pydantic_yaml.to_yaml_str(model)
-    # Re-dump with wider line width
-    data = yaml.safe_load(yaml_str)
-    with open(path, "w", encoding="utf-8") as f:
-        yaml.dump(
-            data,
-            f,
-            default_flow_style=False,
-            width=10000,
-            allow_unicode=True,
-            sort_keys=False,
-        )
-
-
-def to_yaml_str_wide(model) -> str:
-    """Convert pydantic model to YAML string with wide line width."""
-    yaml_str = pydantic_yaml.to_yaml_str(model)
-    data = yaml.safe_load(yaml_str)
-    return yaml.dump(
-        data, default_flow_style=False, width=10000, allow_unicode=True, sort_keys=False
-    )
-
-
 @app.callback(invoke_without_command=True)
 def debug(
     repo_path_raw: str = typer.Argument(
@@ -49,12 +27,61 @@ def debug(
         "-b",
         help="Ветка для анализа",
     ),
+    jobs: int = typer.Option(
+        1,
+        "--jobs",
+        "-j",
+        min=1,
+        help="Количество процессов для параллельного анализа сервисов монорепозитория",
+    ),
+    use_cache: bool = typer.Option(
+        False,
+        "--cache/--no-cache",
+        help="Использовать кэш анализа файлов в .larek/cache/",
+    ),
+    git_index: bool = typer.Option(
+        False,
+        "--git-index",
+        help="Брать список файлов из индекса git вместо обхода директорий",
+    ),
+    rev: tp.Optional[str] = typer.Option(
+        None,
+        "--rev",
+        help="Анализировать коммит прямо из объектов git, без checkout "
+        "(подходит для bare- и частичных клонов)",
+    ),
+    remote: bool = typer.Option(
+        False,
+        "--gitlab",
+        help="Анализировать проект GitLab (путь или ID) через API, без клонирования; "
+        "ревизия берётся из --branch",
+    ),
+    profile: bool = typer.Option(
+        False,
+        "--profile",
+        help="Профилировать анализ: время, файлы, байты и память по анализаторам и фазам",
+    ),
+    profile_top: int = typer.Option(
+        10,
+        "--profile-top",
+        min=0,
+        help="Сколько самых медленных файлов показать в профиле",
+    ),
+    profile_output: str = typer.Option(
+        ".larek/profile.json",
+        "--profile-output",
+        help="Файл для сохранения профиля в формате JSON",
+    ),
 ):
     """
     Инициализация нового проекта из локального репозитория для отладки анализа.
 
     Пример использования:
         larek debug ./repo/backend
+        larek debug ./repo/monorepo --jobs 8
+        larek debug ./repo/monorepo --profile
+        larek debug ./repo/backend.git --rev main
+        larek debug --gitlab group/backend --branch main
     """
     console.print(
         f"[green]▶️ Инициализация проекта из репозитория (debug):[/green] {repo_path_raw}"
@@ -62,18 +89,48 @@ def debug(
     console.print(f"[blue]Ветка:[/blue] {branch}")
 
     repo_path = pathlib.Path(repo_path_raw)
-    repo_analyzer = repo.RepoAnalyzer()
+    repo_analyzer = repo.RepoAnalyzer(
+        max_workers=jobs,
+        use_cache=use_cache,
+        use_git_index=git_index,
+        profile=profile,
+        profile_top=profile_top,
+    )
     repo_analyzer.register_analyzer(go.GoAnalyzer)
     repo_analyzer.register_analyzer(java.JavaAnalyzer)
     repo_analyzer.register_analyzer(kotlin.KotlinAnalyzer)
     repo_analyzer.register_analyzer(javascript.JavaScriptAnalyzer)
     repo_analyzer.register_analyzer(python.PythonAnalyze)
 
-    repo_schema = repo_analyzer.analyze(repo_path)
+    try:
+        if remote:
+            source = GitLabSource(get_authenticated_client(), repo_path_raw, branch)
+            repo_schema = repo_analyzer.analyze_gitlab(source)
+            console.print(
+                f"[blue]Скачано блобов:[/blue] {source.blobs_fetched} "
+                f"({source.bytes_fetched / 1024:.1f} КБ), "
+                f"[blue]из кэша:[/blue] {source.blobs_cached}"
+            )
+        elif rev is not None:
+            repo_schema = repo_analyzer.analyze_git(repo_path, rev)
+        else:
+            repo_schema = repo_analyzer.analyze(repo_path)
+    except GitError as e:
+        console.print(f"[red]Ошибка git: {e}[/red]")
+        raise typer.Exit(code=1)
+    except (GitlabError, RuntimeError) as e:
+        console.print(f"[red]Ошибка GitLab: {e}[/red]")
+        raise typer.Exit(code=1)
+
+    if repo_analyzer.profiler is not None:
+        for table in repo_analyzer.profiler.tables():
+            console.print(table)
+        profile_path = pathlib.Path(profile_output)
+        repo_analyzer.profiler.write_json(profile_path)
+        console.print(f"[blue]Профиль записан в файл:[/blue] {profile_path}")
 
     build_path = pathlib.Path(".larek/build.yaml")
 
     console.print(f"[blue]Запись результата в файл:[/blue] {build_path}")
     os.makedirs(build_path.parent, exist_ok=True)
-    write_yaml_file(build_path, repo_schema)
-    print(to_yaml_str_wide(repo_schema))
+    print(write_yaml_file(build_path, repo_schema))
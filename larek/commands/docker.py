@@ -1,15 +1,14 @@
 import os
+import pathlib
 import typer
 from larek.composer import builder
-from larek.models import RepoSchema
+from larek.models.serialize import read_build_file
 
 from rich.progress import Progress
 from rich.panel import Panel
 from rich.table import Table
 from rich import print as rprint
 
-from pydantic_yaml import parse_yaml_raw_as
-
 
 def docker(
     build_file: str = typer.Argument(
@@ -24,10 +23,7 @@ def docker(
         rprint(f"[yellow]Текущая директория: {os.getcwd()}[/yellow]")
         raise typer.Exit(code=1)
 
-    with open(build_file, "r", encoding="utf-8") as f:
-        yml = f.read()
-
-    config = parse_yaml_raw_as(RepoSchema, yml)
+    config = read_build_file(pathlib.Path(build_file))
     composer = builder.Composer()
     for srv in config.services:
         dockerfile = composer.get_dockerfile(srv)
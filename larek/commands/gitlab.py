@@ -1,10 +1,10 @@
 import os
+import pathlib
 import typer
 from rich import print as rprint
-from pydantic_yaml import parse_yaml_raw_as
 
 from larek.pipeliner import builder
-from larek.models import RepoSchema
+from larek.models.serialize import read_build_file
 
 
 def gitlab(
@@ -20,10 +20,7 @@ def gitlab(
         rprint(f"[yellow]Current working directory: {os.getcwd()}[/yellow]")
         raise typer.Exit(code=1)
 
-    with open(build_file, "r", encoding="utf-8") as f:
-        yml = f.read()
-
-    config = parse_yaml_raw_as(RepoSchema, yml)
+    config = read_build_file(pathlib.Path(build_file))
     composer = builder.PipelineComposer()
 
     pipeline = composer.generate_from_schema(config)
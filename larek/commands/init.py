@@ -7,10 +7,6 @@ import re
 import random
 import string
 
-
-import pydantic_yaml
-import yaml
-
 import typer
 from rich.console import Console
 from rich import print as rprint
@@ -19,31 +15,18 @@ from rich.panel import Panel
 from larek.composer.builder import Composer
 from larek.pipeliner.builder import PipelineComposer
 from larek.models import RepoSchema
+from larek.models.serialize import write_yaml_file
 from larek.analyzer import repo, go, java, kotlin, javascript, python
 from larek import utils
 from larek.utils import git_ops
 from larek.utils.gitlab_auth import get_authenticated_client
+from larek.utils.stages import Stage, StageGraph
 
 
 app = typer.Typer(help="Инициализация нового проекта")
 console = Console()
 
 
-def write_yaml_file(path: pathlib.Path, model) -> None:
-    """Write pydantic model to YAML file with wide line width to prevent wrapping."""
-    yaml_str = pydantic_yaml.to_yaml_str(model)
-    data = yaml.safe_load(yaml_str)
-    with open(path, "w", encoding="utf-8") as f:
-        yaml.dump(
-            data,
-            f,
-            default_flow_style=False,
-            width=10000,
-            allow_unicode=True,
-            sort_keys=False,
-        )
-
-
 def clone_step(repo_path: str, branch: str) -> str:
     repo_name = repo_path.split("/")[-1].split(".")[0]
 
@@ -81,37 +64,23 @@ def clone_step(repo_path: str, branch: str) -> str:
     return repo_name
 
 
-def analyze(repo_path_raw: str):
-    # переходим в директорию с репозиторием и генерируем отчет + build.yaml
-    repo_path = pathlib.Path(repo_path_raw)
-    repo_analyzer = repo.RepoAnalyzer()
+def analyze(repo_path: pathlib.Path) -> RepoSchema:
+    # анализируем репозиторий; build.yaml пишется на этапе write.
+    # Кэш не нужен: клон свежий, а всё записанное в репозиторий уходит в push
+    repo_analyzer = repo.RepoAnalyzer(use_git_index=True)
 
     repo_analyzer.register_analyzer(go.GoAnalyzer)
     repo_analyzer.register_analyzer(java.JavaAnalyzer)
     repo_analyzer.register_analyzer(kotlin.KotlinAnalyzer)
     repo_analyzer.register_analyzer(javascript.JavaScriptAnalyzer)
     repo_analyzer.register_analyzer(python.PythonAnalyze)
-    repo_schema = repo_analyzer.analyze(repo_path)
-
-    build_path = repo_path / ".larek/build.yaml"
-    os.makedirs(build_path.parent, exist_ok=True)
-    write_yaml_file(build_path, repo_schema)
-
+    return repo_analyzer.analyze(repo_path)
 
-def docker(repo_path_raw: str):
-    repo_path = pathlib.Path(repo_path_raw)
-    build_file = repo_path / ".larek" / "build.yaml"
 
-    if not os.path.exists(build_file):
-        rprint(f"[red]Ошибка: файл не найден: {build_file}[/red]")
-        rprint(f"[yellow]Текущая директория: {os.getcwd()}[/yellow]")
-        raise typer.Exit(code=1)
-
-    with open(build_file, "r", encoding="utf-8") as f:
-        yml = f.read()
-
-    config = pydantic_yaml.parse_yaml_raw_as(RepoSchema, yml)
+def docker(config: RepoSchema) -> dict[str, str]:
+    """Render the Dockerfile of every service, keyed by service name."""
     composer = Composer()
+    dockerfiles = {}
     for srv in config.services:
         dockerfile = composer.get_dockerfile(srv)
         if dockerfile is None:
@@ -120,36 +89,37 @@ def docker(repo_path_raw: str):
             )
             rprint("\n")
             continue
+        dockerfiles[srv.name] = dockerfile
+    return dockerfiles
 
-        dockerfile_path = repo_path / f".larek/{srv.name}.Dockerfile"
-        with open(dockerfile_path, "w", encoding="utf-8") as f:
-            f.write(dockerfile)
-
-        rprint(f"Dockerfile сгенерирован: {dockerfile_path} для сервиса: {srv.name}")
-        rprint("\n")
 
+def gitlab_step(config: RepoSchema) -> str:
+    return PipelineComposer().generate_from_schema(config)
 
-def gitlab_step(repo_path_raw: str):
-    repo_path = pathlib.Path(repo_path_raw)
-    build_file = repo_path / ".larek" / "build.yaml"
-    if not os.path.exists(build_file):
-        rprint(f"[red]Ошибка: файл не найден: {build_file}[/red]")
-        rprint(f"[yellow]Текущая директория: {os.getcwd()}[/yellow]")
-        raise typer.Exit(code=1)
 
-    with open(build_file, "r", encoding="utf-8") as f:
-        yml = f.read()
+def write_step(
+    repo_path: pathlib.Path,
+    config: RepoSchema,
+    dockerfiles: dict[str, str],
+    pipeline: str,
+) -> None:
+    """Write build.yaml and every generated file once all of them are ready."""
+    larek_dir = repo_path / ".larek"
+    os.makedirs(larek_dir, exist_ok=True)
+    write_yaml_file(larek_dir / "build.yaml", config)
 
-    config = pydantic_yaml.parse_yaml_raw_as(RepoSchema, yml)
-    composer = PipelineComposer()
+    for name, dockerfile in dockerfiles.items():
+        dockerfile_path = larek_dir / f"{name}.Dockerfile"
+        with open(dockerfile_path, "w", encoding="utf-8") as f:
+            f.write(dockerfile)
+        rprint(f"Dockerfile сгенерирован: {dockerfile_path} для сервиса: {name}")
+        rprint("\n")
 
-    pipeline = composer.generate_from_schema(config)
-    pipeline_file = ".gitlab-ci.yml"
+    pipeline_file = repo_path / ".gitlab-ci.yml"
     with open(pipeline_file, "w", encoding="utf-8") as f:
         f.write(pipeline)
-
     service_names = ", ".join(srv.name for srv in config.services)
-    rprint(f"Файл pipeline {pipeline_file} сгенерирован для: {service_names}")
+    rprint(f"Файл pipeline {pipeline_file.name} сгенерирован для: {service_names}")
     rprint("\n")
 
 
@@ -308,15 +278,22 @@ def init(
     console.print(f"[green]▶️ Инициализация проекта из репозитория:[/green] {repo_url}")
     console.print(f"[blue]Ветка:[/blue] {branch}")
 
-    git_directory = clone_step(repo_url, branch)
-
-    analyze(git_directory)
-
-    docker(git_directory)
-
-    os.chdir(git_directory)
-    git_directory = "."
-
-    gitlab_step(git_directory)
-
-    push_to_gitlab(git_directory)
+    def push(repo_path: pathlib.Path, _: None) -> None:
+        os.chdir(repo_path)
+        push_to_gitlab(".")
+
+    graph = StageGraph(
+        [
+            Stage("clone", lambda: pathlib.Path(clone_step(repo_url, branch))),
+            Stage("analyze", analyze, needs=("clone",)),
+            # независимы друг от друга и выполняются одновременно
+            Stage("docker", docker, needs=("analyze",)),
+            Stage("gitlab", gitlab_step, needs=("analyze",)),
+            Stage("write", write_step, needs=("clone", "analyze", "docker", "gitlab")),
+            Stage("push", push, needs=("clone", "write")),
+        ]
+    )
+    try:
+        graph.run()
+    finally:
+        console.print(graph.table())
@@ -1,17 +1,15 @@
-import os
 from abc import ABC, abstractmethod
-from typing import Any, Dict
-
-from jinja2 import Environment, FileSystemLoader
+from typing import Any, Dict, Optional
 
 from larek.models.repo import Service
+from larek.utils.templates import template_environment
 
 
 class DockerfileBuilder(ABC):
     """Base class for Dockerfile builders."""
 
-    def __init__(self, template_dir: str):
-        self.env = Environment(loader=FileSystemLoader(template_dir))
+    def __init__(self, template_dir: Optional[str] = None):
+        self.env = template_environment(template_dir)
 
     @abstractmethod
     def generate(self, service: Service) -> str:
@@ -72,13 +70,11 @@ class NodeBuilder(DockerfileBuilder):
 
 class Composer:
     def __init__(self):
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        template_dir = os.path.join(current_dir, "templates")
         self.builders = {
-            "go": GoBuilder(template_dir),
-            "python": PythonBuilder(template_dir),
-            "javascript": NodeBuilder(template_dir),
-            "typescript": NodeBuilder(template_dir),
+            "go": GoBuilder(),
+            "python": PythonBuilder(),
+            "javascript": NodeBuilder(),
+            "typescript": NodeBuilder(),
         }
 
     def get_dockerfile(self, service: Service) -> str | None:
@@ -3,7 +3,17 @@
 import typer
 from rich.console import Console
 
-from larek.commands import init, status, debug, clear, docker, gitlab, clone, login
+from larek.commands import (
+    init,
+    status,
+    debug,
+    clear,
+    docker,
+    gitlab,
+    clone,
+    login,
+    batch,
+)
 
 app = typer.Typer(
     name="larek",
@@ -22,6 +32,7 @@ app.command()(status.status)
 app.command()(clear.clear)
 app.command()(docker.docker)
 app.command()(gitlab.gitlab)
+app.command("analyze-batch")(batch.analyze_batch)
 
 
 @app.callback()
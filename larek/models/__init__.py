@@ -14,4 +14,6 @@ __all__ = [
     "Deployment",
     "Environment",
     "AndroidConfig",
+    "LibSpec",
+    "libs_from",
 ]
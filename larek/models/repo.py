@@ -1,7 +1,7 @@
 import pathlib
-from typing import Literal, Optional, Any
+from typing import Iterable, Literal, Optional, Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 
 
 class Lib(BaseModel):
@@ -11,6 +11,19 @@ class Lib(BaseModel):
     version: Optional[str] = Field(None, description="Версия библиотеки")
 
 
+# (name, version) pairs as manifest parsers produce them
+LibSpec = tuple[str, Optional[str]]
+_LIB_LIST = TypeAdapter(list[Lib])
+
+
+def libs_from(specs: Iterable[LibSpec]) -> list[Lib]:
+    """Validate parsed (name, version) pairs into Lib models in one call.
+
+    A single list validation is cheaper than a Lib(...) call per dependency.
+    """
+    return _LIB_LIST.validate_python({"name": n, "version": v} for n, v in specs)
+
+
 class Dependencies(BaseModel):
     """Зависимости проекта (библиотека)."""
 
@@ -93,6 +106,10 @@ class Service(BaseModel):
     linters: list[Linter] = Field(
         default_factory=list, description="Настроенные линтеры"
     )
+    lockfiles: list[str] = Field(
+        default_factory=list,
+        description="Файлы, фиксирующие зависимости, относительно сервиса",
+    )
     android: Optional[AndroidConfig] = Field(
         None, description="Android-специфичная конфигурация (только для Android проектов)"
     )
@@ -122,3 +139,6 @@ class RepoSchema(BaseModel):
     deployment: Optional[Deployment] = Field(
         ..., description="Информация о деплое сервиса"
     )
+    root: Optional[pathlib.Path] = Field(
+        None, description="Корень репозитория, в который ляжет .gitlab-ci.yml"
+    )
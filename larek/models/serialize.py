@@ -0,0 +1,132 @@
+"""Сериализация моделей в YAML (``build.yaml``, вывод ``larek debug``).
+
+Модель один раз превращается в JSON-совместимый словарь и сразу
+выводится в YAML. Если PyYAML собран с LibYAML, используется его
+C-эмиттер; формат тот же, что раньше давали ``pydantic_yaml`` и
+повторный ``yaml.dump``: блочный стиль, ключи по алфавиту, без переноса
+длинных строк.
+
+Для каждого YAML-файла пишется компактный JSON с SHA-256 YAML в первой
+строке. ``read_build_file`` берёт схему из него, пока хэш совпадает, и
+разбирает YAML, только если файл правили вручную или JSON отсутствует.
+JSON лежит вне репозитория, в ``~/.larek/build/``, и не попадает в
+коммиты вместе с ``build.yaml``. Там хранится не больше ``SIDECAR_LIMIT``
+файлов: при записи самые старые удаляются, ``larek clear`` удаляет все.
+"""
+
+import hashlib
+import os
+import pathlib
+import shutil
+import typing as tp
+
+import pydantic_yaml
+import yaml
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from larek.models.repo import RepoSchema
+
+try:
+    from yaml import CSafeDumper as _FastDumper
+except ImportError:  # PyYAML built without LibYAML
+    from yaml import SafeDumper as _FastDumper
+
+DUMP_OPTIONS: dict[str, tp.Any] = {
+    "default_flow_style": False,
+    "width": 10000,
+    "allow_unicode": True,
+    "sort_keys": True,
+}
+# LibYAML escapes characters outside the BMP (emoji) as \U0001F680 even
+# with allow_unicode; the pure Python emitter writes them as is.
+_ASTRAL_ESCAPE = "\\U"
+# validates sidecar JSON directly, without building Python dicts first
+_SCHEMA_ADAPTER = TypeAdapter(RepoSchema)
+SIDECAR_DIR = pathlib.Path.home() / ".larek" / "build"
+# sidecars kept in SIDECAR_DIR; the least recently written go first
+SIDECAR_LIMIT = 256
+
+
+def to_yaml_str(model: BaseModel) -> str:
+    """Serialize a model to YAML in the build.yaml format."""
+    data = model.model_dump(mode="json")
+    text = yaml.dump(data, Dumper=_FastDumper, **DUMP_OPTIONS)
+    if _FastDumper is not yaml.SafeDumper and _ASTRAL_ESCAPE in text:
+        text = yaml.dump(data, Dumper=yaml.SafeDumper, **DUMP_OPTIONS)
+    return text
+
+
+def sidecar_path(path: pathlib.Path) -> pathlib.Path:
+    """JSON copy of a YAML file, named after its absolute path."""
+    key = hashlib.sha256(str(path.resolve()).encode("utf-8")).hexdigest()
+    return SIDECAR_DIR / f"{key[:32]}.json"
+
+
+def write_yaml_file(path: pathlib.Path, model: BaseModel) -> str:
+    """Write a model to a YAML file plus its JSON sidecar; returns the YAML text."""
+    text = to_yaml_str(model)
+    data = text.encode("utf-8")
+    path.write_bytes(data)
+    _write_sidecar(path, data, model)
+    return text
+
+
+def read_build_file(path: pathlib.Path) -> RepoSchema:
+    """Load a build.yaml written by write_yaml_file, preferring its JSON sidecar.
+
+    The sidecar is used only when its hash matches the YAML content;
+    otherwise the YAML is parsed and validated and the sidecar refreshed.
+    """
+    data = path.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    try:
+        header, _, body = sidecar_path(path).read_bytes().partition(b"\n")
+    except OSError:
+        pass
+    else:
+        if header.decode("ascii", "replace") == digest:
+            try:
+                return _SCHEMA_ADAPTER.validate_json(body)
+            except ValidationError:
+                pass  # written by a larek with a different schema
+
+    schema = pydantic_yaml.parse_yaml_raw_as(RepoSchema, data.decode("utf-8"))
+    _write_sidecar(path, data, schema)
+    return schema
+
+
+def _write_sidecar(path: pathlib.Path, data: bytes, model: BaseModel) -> None:
+    sidecar = sidecar_path(path)
+    tmp = sidecar.with_name(f".{sidecar.name}.tmp")
+    try:
+        sidecar.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_bytes(
+            hashlib.sha256(data).hexdigest().encode()
+            + b"\n"
+            + model.model_dump_json().encode("utf-8")
+        )
+        tmp.replace(sidecar)
+        _evict_sidecars(sidecar.parent, SIDECAR_LIMIT)
+    except OSError:
+        # the sidecar only speeds up loading; read-only homes do without
+        pass
+
+
+def _evict_sidecars(directory: pathlib.Path, keep: int) -> None:
+    """Remove all but the keep most recently written sidecars in directory."""
+    with os.scandir(directory) as it:
+        written = sorted(
+            (entry.stat().st_mtime_ns, entry.path)
+            for entry in it
+            if entry.name.endswith(".json")
+        )
+    for _, stale in written[: max(len(written) - keep, 0)]:
+        try:
+            os.unlink(stale)
+        except FileNotFoundError:
+            pass  # evicted by a concurrent writer
+
+
+def clear_sidecars() -> None:
+    """Remove every sidecar written by write_yaml_file and read_build_file."""
+    shutil.rmtree(SIDECAR_DIR, ignore_errors=True)
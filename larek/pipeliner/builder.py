@@ -1,12 +1,11 @@
 import os
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 import re
 from pathlib import Path
 
-from jinja2 import Environment, FileSystemLoader
-
 from larek.models.repo import Service, Deployment, RepoSchema
+from larek.utils.templates import template_environment
 
 
 def _strip_leading_repo_component(path_str: str, service) -> str:
@@ -53,11 +52,104 @@ def _repo_relative(path_str: str, service) -> str:
     return s
 
 
+def _pipeline_root(
+    services: List[Service], common_prefix: Optional[str], root: Optional[Path]
+) -> str:
+    """Directory the generated .gitlab-ci.yml belongs to, as services see it.
+
+    The repository root recorded by the analysis wins; for schemas without
+    one the leading component shared by relative service paths is taken,
+    as for display paths, then the plain common path.
+    """
+    if root is not None:
+        return "" if str(root) == "." else str(root)
+    paths = [str(s.path) for s in services]
+    try:
+        common = os.path.commonpath(paths)
+    except ValueError:
+        # absolute and relative service paths mixed
+        return ""
+    return common_prefix or common
+
+
+def _root_relative(path: str, root: str) -> Optional[str]:
+    """POSIX path relative to the pipeline root, None if outside of it."""
+    rel = os.path.relpath(path, root or ".")
+    if rel == ".." or rel.startswith(".." + os.path.sep):
+        return None
+    return Path(rel).as_posix()
+
+
+def _change_paths(service: Service, root: str) -> List[str]:
+    """Glob patterns of rules:changes for a service, relative to root.
+
+    The service directory plus its Dockerfiles and configs that live
+    outside it; the pipeline file itself changes every service.
+    """
+
+    def relative(path: str) -> Optional[str]:
+        return _root_relative(path, root)
+
+    service_dir = relative(str(service.path))
+    paths = []
+    if service_dir == ".":
+        paths.append("**/*")
+    elif service_dir is not None:
+        paths.append(f"{service_dir}/**/*")
+
+    extra = list(service.docker.dockerfiles) + [cfg.path for cfg in service.configs]
+    for raw in extra:
+        path = str(raw)
+        if not (os.path.isabs(path) or "/" in path or os.path.sep in path):
+            path = str(service.path.joinpath(path))
+        rel = relative(path)
+        if rel is None or (
+            service_dir is not None
+            and (service_dir == "." or rel.startswith(service_dir + "/"))
+        ):
+            continue
+        paths.append(rel)
+
+    paths.append(".gitlab-ci.yml")
+    return list(dict.fromkeys(paths))
+
+
+def _job_needs(config: Dict[str, Any]) -> Dict[str, List[str]]:
+    """needs: of each job of a monorepo service, by stage.
+
+    Each service forms its own chain test -> build -> docker, so a slow
+    job only holds back the later jobs of the same service; lint and
+    test start right away.
+    """
+    name = config["service"].name
+    needs: Dict[str, List[str]] = {"lint": [], "test": []}
+    upstream: List[str] = []
+    if config.get("has_test"):
+        upstream = [f"{name}:test"]
+    needs["build"] = upstream
+    if config.get("has_build"):
+        upstream = [f"{name}:build"]
+    needs["docker"] = upstream
+    return needs
+
+
+def _cache_push_job(config: Dict[str, Any]) -> str:
+    """Stage of the monorepo job that uploads the dependency cache.
+
+    The first job installing dependencies fills the cache, the other
+    jobs of the service only download it.
+    """
+    for stage in ("test", "build"):
+        if config.get(f"has_{stage}"):
+            return stage
+    return "lint"
+
+
 class PipelineBuilder(ABC):
     """Base class for GitLab CI pipeline builders."""
 
-    def __init__(self, template_dir: str):
-        self.env = Environment(loader=FileSystemLoader(template_dir))
+    def __init__(self, template_dir: Optional[str] = None):
+        self.env = template_environment(template_dir)
 
     @abstractmethod
     def generate(
@@ -116,6 +208,34 @@ class PipelineBuilder(ABC):
 
         return stages
 
+    def get_cache_key(
+        self, service: Service, prefix: str, root: Optional[str] = None
+    ) -> Union[str, Dict[str, Any]]:
+        """cache:key of the dependency cache of the service.
+
+        Keyed on the lockfiles the analysis found in the service directory
+        (GitLab takes at most two), so every branch reuses the cache until
+        the dependencies change. Paths are relative to root when given, else
+        to the repository as in the job scripts. Without lockfiles the
+        per-branch key is kept.
+        """
+        files: List[str] = []
+        for name in service.lockfiles:
+            path = service.path / name
+            if root is None:
+                rel: Optional[str] = _repo_relative(str(path), service)
+                rel = name if os.path.isabs(rel) else rel.removeprefix("./")
+            else:
+                rel = _root_relative(str(path), root)
+            if rel is None:
+                continue
+            files.append(rel)
+            if len(files) == 2:
+                break
+        if not files:
+            return f"${{CI_COMMIT_REF_SLUG}}-{prefix}"
+        return {"files": files, "prefix": prefix}
+
     def get_docker_context(self, service: Service) -> Dict[str, Any]:
         """Get Docker build context for the service."""
         raw = getattr(service.docker, "dockerfiles", []) or []
@@ -191,6 +311,7 @@ class GoPipelineBuilder(PipelineBuilder):
                 if service.entrypoints
                 else [f"go build -o bin/{service.name} {_repo_relative(str(service.path) + '/...', service)}"]
             ),
+            "cache_key": self.get_cache_key(service, "go"),
             **self.get_docker_context(service),
         }
         return self.render_template("go.gitlab-ci.yml.j2", context)
@@ -283,6 +404,7 @@ class PythonPipelineBuilder(PipelineBuilder):
             "test_command": test_cmd,
             "has_lint": has_lint,
             "has_test": has_test,
+            "cache_key": self.get_cache_key(service, "python"),
             **self.get_docker_context(service),
         }
         return self.render_template("python.gitlab-ci.yml.j2", context)
@@ -471,6 +593,7 @@ class NodePipelineBuilder(PipelineBuilder):
             "is_spa": is_spa,
             "has_deploy": has_deploy,
             "deploy_target": deploy_target,
+            "cache_key": self.get_cache_key(service, "node"),
             **self.get_docker_context(service),
         }
         template_name = (
@@ -618,6 +741,7 @@ class JavaPipelineBuilder(PipelineBuilder):
             "build_command": build_cmd,
             "has_lint": has_lint,
             "has_test": has_test,
+            "cache_key": self.get_cache_key(service, "java"),
             **self.get_docker_context(service),
         }
         return self.render_template("java.gitlab-ci.yml.j2", context)
@@ -709,6 +833,7 @@ class KotlinPipelineBuilder(PipelineBuilder):
             "build_command": build_cmd,
             "has_lint": has_lint,
             "has_test": has_test,
+            "cache_key": self.get_cache_key(service, "kotlin"),
             **self.get_docker_context(service),
         }
         return self.render_template("kotlin.gitlab-ci.yml.j2", context)
@@ -814,6 +939,7 @@ class AndroidPipelineBuilder(PipelineBuilder):
             "has_lint": has_lint,
             "has_test": has_test,
             "has_signing": android.has_signing_config,
+            "cache_key": self.get_cache_key(service, "android"),
             **self.get_docker_context(service),
         }
         return self.render_template("android.gitlab-ci.yml.j2", context)
@@ -870,17 +996,15 @@ class PipelineComposer:
     """Composer for generating GitLab CI pipelines"""
 
     def __init__(self):
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        self.template_dir = os.path.join(current_dir, "templates")
-        self.env = Environment(loader=FileSystemLoader(self.template_dir))
+        self.env = template_environment()
         self.builders: Dict[str, PipelineBuilder] = {
-            "go": GoPipelineBuilder(self.template_dir),
-            "python": PythonPipelineBuilder(self.template_dir),
-            "javascript": NodePipelineBuilder(self.template_dir),
-            "typescript": NodePipelineBuilder(self.template_dir),
-            "java": JavaPipelineBuilder(self.template_dir),
-            "kotlin": KotlinPipelineBuilder(self.template_dir),
-            "android": AndroidPipelineBuilder(self.template_dir),
+            "go": GoPipelineBuilder(),
+            "python": PythonPipelineBuilder(),
+            "javascript": NodePipelineBuilder(),
+            "typescript": NodePipelineBuilder(),
+            "java": JavaPipelineBuilder(),
+            "kotlin": KotlinPipelineBuilder(),
+            "android": AndroidPipelineBuilder(),
         }
 
     def get_pipeline(self, service: Service) -> str:
@@ -902,14 +1026,17 @@ class PipelineComposer:
             return self.get_pipeline(schema.services[0])
 
         return self.get_multi_service_pipeline(
-            schema.services, deployment or schema.deployment
+            schema.services, deployment or schema.deployment, schema.root
         )
 
     def _convert_leading_underscore_keys_to_dot(self, yaml_str: str) -> str:
         return re.sub(r"(?m)^_([A-Za-z0-9_-]+)(\s*:)", r".\1\2", yaml_str)
 
     def get_multi_service_pipeline(
-            self, services: List[Service], deployment: Optional[Deployment] = None
+            self,
+            services: List[Service],
+            deployment: Optional[Deployment] = None,
+            root: Optional[Path] = None,
         ) -> str:
 
         all_stages: List[str] = []
@@ -983,6 +1110,18 @@ class PipelineComposer:
                     adjusted.append({"dockerfile": df_path_adj, "context": ctx_adj})
                 cfg["dockerfiles"] = adjusted
 
+        pipeline_root = _pipeline_root(
+            [cfg["service"] for cfg in service_configs], common_prefix, root
+        )
+        for cfg in service_configs:
+            svc = cfg["service"]
+            cfg["changes"] = _change_paths(svc, pipeline_root)
+            cfg["needs"] = _job_needs(cfg)
+            cfg["cache_key"] = self.builders[svc.lang.name].get_cache_key(
+                svc, svc.name, pipeline_root
+            )
+            cfg["cache_push"] = _cache_push_job(cfg)
+
         for cfg in service_configs:
             for st in cfg.get("stages", []):
                 if st not in all_stages:
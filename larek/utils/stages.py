@@ -0,0 +1,86 @@
+"""Граф этапов команды: результаты передаются в памяти, время замеряется.
+
+Каждый этап получает результаты этапов из ``needs`` позиционными
+аргументами и запускается, как только они готовы, поэтому независимые
+этапы выполняются одновременно в пуле потоков.
+"""
+
+import time
+import typing as tp
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+
+from rich.table import Table
+
+
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    run: tp.Callable[..., tp.Any]
+    needs: tuple[str, ...] = ()
+
+
+class StageGraph:
+    """Этапы в порядке объявления; зависимость должна быть объявлена раньше."""
+
+    def __init__(self, stages: tp.Iterable[Stage]) -> None:
+        self.stages: dict[str, Stage] = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"duplicate stage {stage.name!r}")
+            unknown = [n for n in stage.needs if n not in self.stages]
+            if unknown:
+                raise ValueError(f"stage {stage.name!r} needs undeclared {unknown}")
+            self.stages[stage.name] = stage
+        self.timings: dict[str, float] = {}
+        self.wall_seconds = 0.0
+
+    def run(self, jobs: int = 2) -> dict[str, tp.Any]:
+        """Run every stage and return their results by name.
+
+        The first failing stage stops the graph: stages that have not
+        started are dropped and its exception is raised once running
+        ones finish.
+        """
+        results: dict[str, tp.Any] = {}
+        pending = dict(self.stages)
+        running: dict[Future, str] = {}
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            while pending or running:
+                for name, stage in list(pending.items()):
+                    if all(n in results for n in stage.needs):
+                        del pending[name]
+                        args = [results[n] for n in stage.needs]
+                        running[pool.submit(self._timed, stage, args)] = name
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    if future.exception() is not None:
+                        pending.clear()
+                        wait(running)
+                        self.wall_seconds = time.perf_counter() - started
+                        raise tp.cast(BaseException, future.exception())
+                    results[name] = future.result()
+        self.wall_seconds = time.perf_counter() - started
+        return results
+
+    def _timed(self, stage: Stage, args: list[tp.Any]) -> tp.Any:
+        start = time.perf_counter()
+        try:
+            return stage.run(*args)
+        finally:
+            self.timings[stage.name] = time.perf_counter() - start
+
+    def table(self) -> Table:
+        """Stage timings in declaration order as a rich table."""
+        table = Table(title=f"Этапы (всего {self.wall_seconds:.3f} с)")
+        table.add_column("Этап", style="cyan", no_wrap=True)
+        table.add_column("Зависит от")
+        table.add_column("Время, с", justify="right")
+        for name, stage in self.stages.items():
+            if name in self.timings:
+                table.add_row(
+                    name, ", ".join(stage.needs), f"{self.timings[name]:.3f}"
+                )
+        return table
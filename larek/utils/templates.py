@@ -0,0 +1,45 @@
+"""Общее окружение Jinja для генераторов Dockerfile и пайплайнов.
+
+Все построители берут одно окружение на процесс, поэтому каждый шаблон
+компилируется не больше одного раза за запуск и загружается только при
+первом обращении. Скомпилированный байткод сохраняется в
+``~/.larek/jinja`` и переиспользуется следующими запусками, пока исходник
+шаблона не изменится.
+"""
+
+import functools
+import typing as tp
+from pathlib import Path
+
+from jinja2 import BytecodeCache, Environment, FileSystemBytecodeCache, FileSystemLoader
+
+PACKAGE_DIR = Path(__file__).resolve().parent.parent
+TEMPLATE_DIRS = (
+    PACKAGE_DIR / "composer" / "templates",
+    PACKAGE_DIR / "pipeliner" / "templates",
+)
+BYTECODE_CACHE_DIR = Path.home() / ".larek" / "jinja"
+
+
+def template_environment(template_dir: tp.Optional[str] = None) -> Environment:
+    """Shared environment for the package templates, or for template_dir if given."""
+    if template_dir is None:
+        return _environment(tuple(str(d) for d in TEMPLATE_DIRS))
+    return _environment((str(Path(template_dir).resolve()),))
+
+
+@functools.cache
+def _environment(search_path: tuple[str, ...]) -> Environment:
+    return Environment(
+        loader=FileSystemLoader(list(search_path)),
+        bytecode_cache=_bytecode_cache(),
+    )
+
+
+def _bytecode_cache() -> tp.Optional[BytecodeCache]:
+    try:
+        BYTECODE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        # templates still work, they are just compiled on every run
+        return None
+    return FileSystemBytecodeCache(str(BYTECODE_CACHE_DIR))
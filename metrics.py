@@ -1,16 +1,34 @@
-from larek.commands import analyze
-from larek import models
+"""Метрики качества и скорости анализа на выборке репозиториев.
+
+Репозитории лежат в ``sample/<язык>/<репозиторий>``. Для каждого
+репозитория ожидаемые множества (Dockerfile, конфиги, точки входа)
+собираются за один обход файлов, репозитории анализируются параллельно,
+а precision/recall/f1 усредняются по языкам и категориям средствами
+pandas. Рядом с точностью сохраняется время анализа каждого репозитория.
+
+Запуск:
+    python metrics.py
+    python metrics.py --jobs 8 --output results/metrics.csv
+"""
+
+import argparse
+import os
+import time
+import typing as tp
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from dataclasses import dataclass
 
+import numpy as np
+import pandas as pd
 
-@dataclass
-class Metrics:
-    def __init__(self):
-        self.language_metrics = {}
-        self.dockerfile_metrics = {}
-        self.config_metrics = {}
-        self.entrypoint_metrics = {}
+from larek import models
+from larek.commands import analyze
+
+CATEGORIES = ("language", "dockerfile", "config", "entrypoint")
+CONFIG_SUFFIXES = {".yaml", ".yml", ".json", ".ini", ".cfg", ".conf"}
+ENTRYPOINT_MARKERS = ("main", "app", "index")
+# Written into every repository by analyze.analyze itself
+REPORT_FILE = "report.yaml"
 
 
 def calculate_metrics(expected: set, actual: set) -> dict:
@@ -35,98 +53,190 @@ def calculate_metrics(expected: set, actual: set) -> dict:
     return {"precision": precision, "recall": recall, "f1": f1}
 
 
-def compare(repo_path: Path, res: models.RepoSchema) -> Metrics:
-    """Сравнить результаты анализа с ожидаемыми значениями и вернуть метрики."""
-
-    metrics = Metrics()
-
-    expected_langs = {repo_path.parent.name}
-    actual_langs = {lang.name for service in res.services for lang in [service.lang]}
-    metrics.language_metrics = calculate_metrics(expected_langs, actual_langs)
-
-    expected_dockerfiles = {
-        f"sample/{repo_path.parent.name}/" + str(file.relative_to(repo_path.parent))
-        for file in repo_path.rglob("*")
-        if file.is_file() and "Dockerfile" in file.name
+def expected_sets(repo_path: Path) -> dict[str, set[str]]:
+    """Collect the expected files of every category in a single walk."""
+    expected: dict[str, set[str]] = {
+        "language": {repo_path.parent.name},
+        "dockerfile": set(),
+        "config": set(),
+        "entrypoint": set(),
     }
-    actual_dockerfiles = {
-        df for service in res.services for df in service.docker.dockerfiles
+    for dirpath, _, filenames in os.walk(repo_path):
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            if "Dockerfile" in name:
+                expected["dockerfile"].add(path)
+            if os.path.splitext(name)[1] in CONFIG_SUFFIXES and name != REPORT_FILE:
+                expected["config"].add(path)
+            lower = name.lower()
+            if any(marker in lower for marker in ENTRYPOINT_MARKERS):
+                expected["entrypoint"].add(path)
+    return expected
+
+
+def actual_sets(res: models.RepoSchema) -> dict[str, set[str]]:
+    return {
+        "language": {service.lang.name for service in res.services},
+        "dockerfile": {
+            df for service in res.services for df in service.docker.dockerfiles
+        },
+        "config": {cfg.path for service in res.services for cfg in service.configs},
+        "entrypoint": {ep for service in res.services for ep in service.entrypoints},
     }
-    if len(expected_dockerfiles) > 0:
-        print(expected_dockerfiles)
-        print(actual_dockerfiles)
-    metrics.dockerfile_metrics = calculate_metrics(
-        expected_dockerfiles, actual_dockerfiles
-    )
 
-    expected_configs = {
-        f"sample/{repo_path.parent.name}/" + str(file.relative_to(repo_path.parent))
-        for file in repo_path.rglob("*")
-        if file.is_file()
-        and file.suffix in {".yaml", ".yml", ".json", ".ini", ".cfg", ".conf"}
-        and file.name != "report.yaml"
+
+def compare(repo_path: Path, res: models.RepoSchema) -> dict[str, dict]:
+    """Сравнить результаты анализа с ожидаемыми значениями и вернуть метрики."""
+    expected = expected_sets(repo_path)
+    actual = actual_sets(res)
+    return {
+        category: calculate_metrics(expected[category], actual[category])
+        for category in CATEGORIES
     }
-    actual_configs = {cfg.path for service in res.services for cfg in service.configs}
-    metrics.config_metrics = calculate_metrics(expected_configs, actual_configs)
-
-    expected_entrypoints = {
-        f"sample/{repo_path.parent.name}/" + str(file.relative_to(repo_path.parent))
-        for file in repo_path.rglob("*")
-        if file.is_file()
-        and (
-            "main" in file.name.lower()
-            or "app" in file.name.lower()
-            or "index" in file.name.lower()
+
+
+def evaluate(repo_dir: Path) -> list[dict[str, tp.Any]]:
+    """Analyze one repository and return a row per category.
+
+    Rows carry the tp/fp/fn counts and the analysis time; a failed
+    analysis yields a single row with the error and no counts.
+    """
+    row = {"lang": repo_dir.parent.name, "repo": repo_dir.name}
+    started = time.perf_counter()
+    try:
+        res = analyze.analyze(str(repo_dir))
+    except Exception as e:
+        return [{**row, "error": f"{type(e).__name__}: {e}"}]
+    seconds = time.perf_counter() - started
+
+    expected = expected_sets(repo_dir)
+    actual = actual_sets(res)
+    return [
+        {
+            **row,
+            "category": category,
+            "tp": len(expected[category] & actual[category]),
+            "fp": len(actual[category] - expected[category]),
+            "fn": len(expected[category] - actual[category]),
+            "seconds": seconds,
+        }
+        for category in CATEGORIES
+    ]
+
+
+def score(df: pd.DataFrame) -> pd.DataFrame:
+    """Add per-repository precision, recall and f1 columns to tp/fp/fn rows.
+
+    Same rules as calculate_metrics: empty expected and actual sets score
+    1.0, an empty denominator otherwise scores 0.0.
+    """
+    tp_, fp, fn = (df[c].to_numpy(dtype=float) for c in ("tp", "fp", "fn"))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        precision = np.where(tp_ + fp > 0, tp_ / (tp_ + fp), 0.0)
+        recall = np.where(tp_ + fn > 0, tp_ / (tp_ + fn), 0.0)
+        f1 = np.where(
+            precision + recall > 0,
+            2 * precision * recall / (precision + recall),
+            0.0,
         )
-    }
-    actual_entrypoints = {ep for service in res.services for ep in service.entrypoints}
-    metrics.entrypoint_metrics = calculate_metrics(
-        expected_entrypoints, actual_entrypoints
+    empty = (tp_ + fp + fn) == 0
+    return df.assign(
+        precision=np.where(empty, 1.0, precision),
+        recall=np.where(empty, 1.0, recall),
+        f1=np.where(empty, 1.0, f1),
     )
 
-    return metrics
+
+def summarize(df: pd.DataFrame) -> dict[str, pd.DataFrame]:
+    """Average scored rows per language and category, plus latency per language."""
+    scores = ["precision", "recall", "f1"]
+    by_lang = df.groupby(["lang", "category"])[scores].mean().unstack("category")
+    overall = df.groupby("category")[scores].mean()
+
+    per_repo = df.drop_duplicates(["lang", "repo"])
+    latency = per_repo.groupby("lang")["seconds"].agg(
+        repos="count",
+        total="sum",
+        mean="mean",
+        p50="median",
+        p95=lambda s: s.quantile(0.95),
+        max="max",
+    )
+    return {
+        "overall": overall.round(3),
+        "by_lang": by_lang.round(3),
+        "latency": latency.round(3),
+    }
+
+
+def find_repos(base_path: Path) -> list[Path]:
+    return [
+        repo_dir
+        for lang_dir in sorted(base_path.iterdir())
+        if lang_dir.is_dir()
+        for repo_dir in sorted(lang_dir.iterdir())
+        # hidden ones are interrupted clones left by clone.py
+        if repo_dir.is_dir() and not repo_dir.name.startswith(".")
+    ]
+
+
+def run(base_path: Path, jobs: int) -> tuple[pd.DataFrame, list[dict[str, tp.Any]]]:
+    """Evaluate every repository under base_path; returns scores and failures."""
+    repos = find_repos(base_path)
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(evaluate, repos))
+    else:
+        results = [evaluate(repo_dir) for repo_dir in repos]
+
+    rows = [row for rows in results for row in rows]
+    errors = [row for row in rows if "error" in row]
+    df = pd.DataFrame(
+        [row for row in rows if "error" not in row],
+        columns=["lang", "repo", "category", "tp", "fp", "fn", "seconds"],
+    )
+    return score(df), errors
 
 
 def main():
-    repos_base_path = Path("sample/")
-    metrics = []
-    for lang_dir in repos_base_path.iterdir():
-        if lang_dir.is_dir():
-            for repo_dir in lang_dir.iterdir():
-                if repo_dir.is_dir():
-                    print(f"Анализируем репозиторий {repo_dir}.")
-                    try:
-                        res = analyze.analyze(str(repo_dir))
-                    except Exception as e:
-                        print(f"Ошибка при анализе репозитория {repo_dir}: {e}")
-                        continue
-                    metrics.append(compare(repo_dir, res))
-
-    res = Metrics()
-    n = len(metrics)
-    for m in metrics:
-        for key, value in m.language_metrics.items():
-            res.language_metrics[key] = round(
-                res.language_metrics.get(key, 0) + value / n, 3
-            )
-        for key, value in m.dockerfile_metrics.items():
-            res.dockerfile_metrics[key] = round(
-                res.dockerfile_metrics.get(key, 0) + value / n, 3
-            )
-        for key, value in m.config_metrics.items():
-            res.config_metrics[key] = round(
-                res.config_metrics.get(key, 0) + value / n, 3
-            )
-        for key, value in m.entrypoint_metrics.items():
-            res.entrypoint_metrics[key] = round(
-                res.entrypoint_metrics.get(key, 0) + value / n, 3
-            )
-
-    print("Средние метрики по всем репозиториям:")
-    print("Языки программирования:", res.language_metrics)
-    print("Dockerfile:", res.dockerfile_metrics)
-    print("Конфигурационные файлы:", res.config_metrics)
-    print("Точки входа:", res.entrypoint_metrics)
+    parser = argparse.ArgumentParser(description="Метрики анализа репозиториев")
+    parser.add_argument("--base", type=Path, default=Path("sample/"))
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1)
+    parser.add_argument(
+        "--output", type=Path, default=None, help="CSV с метриками по репозиториям"
+    )
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    df, errors = run(args.base, args.jobs)
+    wall = time.perf_counter() - started
+
+    for error in errors:
+        print(
+            f"Ошибка при анализе репозитория {error['lang']}/{error['repo']}: "
+            f"{error['error']}"
+        )
+    if df.empty:
+        print("Нет успешно проанализированных репозиториев.")
+        return
+
+    if args.output is not None:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        df.to_csv(args.output, index=False)
+
+    tables = summarize(df)
+    with pd.option_context("display.width", 200, "display.max_columns", None):
+        print("Средние метрики по всем репозиториям:")
+        print(tables["overall"].to_string())
+        print("\nМетрики по языкам:")
+        print(tables["by_lang"].to_string())
+        print("\nВремя анализа, с:")
+        print(tables["latency"].to_string())
+    repos = len(df.drop_duplicates(["lang", "repo"])) + len(errors)
+    print(
+        f"\nРепозиториев: {repos}, "
+        f"ошибок: {len(errors)}, общее время: {wall:.2f} с"
+    )
 
 
 if __name__ == "__main__":
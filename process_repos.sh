@@ -50,36 +50,15 @@ echo "Cloning to: $CLONE_DIR"
 echo "Results in: $RESULTS_DIR"
 echo "---"
 
-# Read the CSV file line by line, skipping the header
-while IFS=, read -r name full_name language stars forks size url; do
-    # Skip the header line
-    if [ "$name" == "name" ]; then
-        continue
-    fi
+# Clone the repositories concurrently; ones already in $CLONE_DIR are skipped
+# and the outcome of every clone is recorded in sample/manifest.json
+python clone.py --lang "$(basename "$CLONE_DIR")" --max-size 0 --max-repos 0
 
-    # Extract the repository name
-    REPO_NAME=$(basename "$full_name")
-
-    # Clone the repository
-    REPO_PATH="$CLONE_DIR/$REPO_NAME"
-    if [ ! -d "$REPO_PATH" ]; then
-        echo "Cloning $url into $REPO_PATH..."
-        git clone --depth 1 "$url" "$REPO_PATH" 2>/dev/null
-        if [ $? -ne 0 ]; then
-            echo "Failed to clone $url. Skipping..."
-            continue
-        fi
-    else
-        echo "Repository $REPO_NAME already cloned. Skipping..."
-    fi
-
-    # Run larek debug and save the result
-    OUTPUT_FILE="$RESULTS_DIR/$REPO_NAME.build.yaml"
-    echo "Running larek debug on $REPO_PATH..."
-    larek debug "$REPO_PATH" > "$OUTPUT_FILE" 2>&1
-
-    echo "Saved result to $OUTPUT_FILE"
-done < "$CSV_FILE"
+# Analyze all cloned repositories in a single process; reruns resume from
+# $RESULTS_DIR/checkpoint.jsonl and retry only failed repositories
+echo "---"
+echo "Running larek analyze-batch on $CLONE_DIR..."
+larek analyze-batch --output "$RESULTS_DIR" "$CLONE_DIR"
 
 echo "---"
 echo "Done processing $LANGUAGE repositories"
\ No newline at end of file
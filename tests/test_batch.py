@@ -0,0 +1,70 @@
+import json
+
+from larek.commands.batch import (
+    CHECKPOINT_FILE,
+    SUMMARY_FILE,
+    analyze_batch,
+    collect_repos,
+    in_shard,
+    load_checkpoint,
+)
+from larek.models import serialize
+
+
+def _make_repos(root):
+    go = root / "svc-go"
+    go.mkdir()
+    (go / "go.mod").write_text("module example.com/svc\n\ngo 1.22\n")
+    (go / "main.go").write_text("package main\n\nfunc main() {}\n")
+    py = root / "svc-py"
+    py.mkdir()
+    (py / "requirements.txt").write_text("flask\n")
+    (py / "main.py").write_text('if __name__ == "__main__":\n    pass\n')
+
+
+def _run(source, output, **kwargs):
+    options = dict(
+        jobs=1, shard=None, resume=True, use_cache=False, git_index=False, rev=None
+    )
+    options.update(kwargs)
+    analyze_batch(str(source), str(output), **options)
+
+
+def test_analyze_batch_writes_results_and_resumes(tmp_path, monkeypatch):
+    monkeypatch.setattr(serialize, "SIDECAR_DIR", tmp_path / "sidecars")
+    source = tmp_path / "repos"
+    source.mkdir()
+    _make_repos(source)
+    output = tmp_path / "out"
+
+    _run(source, output)
+
+    summary = json.loads((output / SUMMARY_FILE).read_text())
+    assert summary["repos"] == summary["ok"] == 2
+    assert summary["languages"] == {"go": 1, "python": 1}
+    assert (output / "svc-go.build.yaml").exists()
+    assert (output / "svc-py.build.yaml").exists()
+
+    _run(source, output)
+
+    # the second run finds both repositories in the checkpoint
+    lines = (output / CHECKPOINT_FILE).read_text().splitlines()
+    assert len(lines) == 2
+    assert set(load_checkpoint(output / CHECKPOINT_FILE)) == {"svc-go", "svc-py"}
+
+
+def test_collect_repos_and_shards(tmp_path):
+    for parent in ("a", "b"):
+        (tmp_path / parent / "api").mkdir(parents=True)
+    (tmp_path / "web").mkdir()
+    listing = tmp_path / "repos.txt"
+    listing.write_text(
+        f"# corpus\n{tmp_path / 'a' / 'api'}\n\n"
+        f"{tmp_path / 'b' / 'api'}\n{tmp_path / 'web'}\n"
+    )
+
+    names = [name for name, _ in collect_repos(listing)]
+
+    assert names == ["a__api", "b__api", "web"]
+    for name in names:
+        assert sum(in_shard(name, i, 3) for i in range(3)) == 1
@@ -0,0 +1,18 @@
+from benchmarks.run import _repo_analyzer
+from benchmarks.synthetic import SCALES, generate
+
+
+def test_synthetic_repository_is_deterministic(tmp_path):
+    files = generate(tmp_path / "a", "deep", SCALES["small"], seed=1)
+    generate(tmp_path / "b", "deep", SCALES["small"], seed=1)
+
+    a = sorted(p.relative_to(tmp_path / "a") for p in (tmp_path / "a").rglob("*"))
+    b = sorted(p.relative_to(tmp_path / "b") for p in (tmp_path / "b").rglob("*"))
+    assert a == b
+    assert len([p for p in a if (tmp_path / "a" / p).is_file()]) == files
+    assert (tmp_path / "a" / "group0/domain0/svc0-go/go.mod").read_text() == (
+        tmp_path / "b" / "group0/domain0/svc0-go/go.mod"
+    ).read_text()
+
+    schema = _repo_analyzer().analyze(tmp_path / "a")
+    assert len(schema.services) == SCALES["small"].services
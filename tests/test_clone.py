@@ -0,0 +1,42 @@
+import json
+import subprocess
+
+import clone
+
+
+def _make_origin(path):
+    path.mkdir()
+    (path / "go.mod").write_text("module example.com/svc\n")
+    for args in (
+        ["init", "-q", "-b", "main"],
+        ["add", "."],
+        ["-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qm", "init"],
+    ):
+        subprocess.run(["git", *args], cwd=path, check=True)
+
+
+def test_clone_many_records_manifest_and_resumes(tmp_path):
+    _make_origin(tmp_path / "svc")
+    urls = {
+        "go": [
+            (tmp_path / "svc").as_uri(),
+            (tmp_path / "missing").as_uri(),
+        ]
+    }
+    manifest_path = tmp_path / "sample" / "manifest.json"
+
+    manifest = clone.clone_many(
+        urls, tmp_path / "sample", manifest_path, jobs=2, retries=1, backoff=0
+    )
+
+    assert manifest["go/svc"]["status"] == "cloned"
+    assert (tmp_path / "sample" / "go" / "svc" / "go.mod").exists()
+    assert manifest["go/missing"]["status"] == "failed"
+    assert manifest["go/missing"]["attempts"] == 2
+    assert not list((tmp_path / "sample" / "go").glob(".*.partial"))
+
+    clone.clone_many(urls, tmp_path / "sample", manifest_path, retries=0, backoff=0)
+
+    saved = json.loads(manifest_path.read_text())
+    assert saved["go/svc"]["status"] == "cloned"
+    assert saved["go/missing"]["attempts"] == 1
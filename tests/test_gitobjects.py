@@ -0,0 +1,82 @@
+import subprocess
+
+from larek.analyzer import python, repo
+from larek.analyzer.gitobjects import GitObjectReader, materialize
+
+
+def _git(cwd, *args):
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+
+def _make_repo(path):
+    (path / "api").mkdir(parents=True)
+    (path / "api" / "requirements.txt").write_text("flask==3.0\n")
+    (path / "api" / "main.py").write_text('if __name__ == "__main__":\n    run()\n')
+    (path / "api" / "model.bin").write_bytes(b"\0" * 4096)
+    (path / "api" / "node_modules" / "x").mkdir(parents=True)
+    (path / "api" / "node_modules" / "x" / "index.js").write_text("")
+    _git(path, "init", "-q", "-b", "main")
+    _git(path, "add", ".")
+    _git(path, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qm", "init")
+
+
+def test_materialize_reads_only_requested_blobs(tmp_path):
+    _make_repo(tmp_path / "src")
+    dest = tmp_path / "tree"
+
+    with GitObjectReader(tmp_path / "src") as reader:
+        index = materialize(tmp_path / "src", "HEAD", dest, {"*.py", "*.txt"}, reader)
+
+    assert reader.blobs_read == 2
+    assert (dest / "api" / "main.py").read_text().startswith("if __name__")
+    assert (dest / "api" / "model.bin").stat().st_size == 0
+    assert not (dest / "api" / "node_modules").exists()
+    assert index.files(dest / "api") == [
+        dest / "api" / name for name in ("main.py", "model.bin", "requirements.txt")
+    ]
+
+
+def test_analyze_git_matches_checkout(tmp_path):
+    _make_repo(tmp_path / "svc")
+    _git(tmp_path, "clone", "-q", "--bare", "svc", "svc.git")
+    analyzer = repo.RepoAnalyzer(use_git_index=True)
+    analyzer.register_analyzer(python.PythonAnalyze)
+
+    from_checkout = analyzer.analyze(tmp_path / "svc")
+    from_objects = analyzer.analyze_git(tmp_path / "svc.git", "main")
+
+    assert from_objects.model_dump_json() == from_checkout.model_dump_json().replace(
+        str(tmp_path / "svc"), str(tmp_path / "svc.git")
+    )
+    assert from_objects.services[0].entrypoints == [
+        str(tmp_path / "svc.git" / "api" / "main.py")
+    ]
+    assert from_objects.services[0].lockfiles == ["requirements.txt"]
+    # the pipeline root is known without a checkout
+    assert from_objects.root == tmp_path / "svc.git"
+
+
+def test_analyze_git_reads_only_sources_the_analyzer_probes(tmp_path, monkeypatch):
+    src = tmp_path / "svc"
+    (src / "api" / "pkg").mkdir(parents=True)
+    (src / "api" / "requirements.txt").write_text("flask==3.0\n")
+    (src / "api" / "main.py").write_text('if __name__ == "__main__":\n    run()\n')
+    for i in range(40):
+        (src / "api" / "pkg" / f"m{i:02}.py").write_text(f"x{i} = {i}\n")
+    _git(src, "init", "-q", "-b", "main")
+    _git(src, "add", ".")
+    _git(src, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qm", "init")
+    read = GitObjectReader.read
+    oids = []
+    monkeypatch.setattr(
+        GitObjectReader, "read", lambda self, oid: oids.append(oid) or read(self, oid)
+    )
+    analyzer = repo.RepoAnalyzer(use_git_index=True)
+    analyzer.register_analyzer(python.PythonAnalyze)
+
+    schema = analyzer.analyze_git(src, "main")
+
+    assert schema.model_dump_json() == analyzer.analyze(src).model_dump_json()
+    # requirements.txt plus the 30 files probed for syntax, main.py among them;
+    # the remaining modules are neither entrypoint candidates nor probed
+    assert len(oids) == 31
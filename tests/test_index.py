@@ -0,0 +1,104 @@
+import subprocess
+from pathlib import Path
+
+from larek.analyzer.index import FileIndex
+from larek.analyzer.go import GoAnalyzer
+
+
+def _make_tree(root: Path) -> None:
+    (root / "cmd").mkdir(parents=True)
+    (root / "vendor" / "lib").mkdir(parents=True)
+    (root / "node_modules" / "pkg").mkdir(parents=True)
+    (root / "go.mod").write_text("module x\n\ngo 1.21\n")
+    (root / "cmd" / "main.go").write_text("package main\n")
+    (root / "vendor" / "lib" / "main.go").write_text("package lib\n")
+    (root / "node_modules" / "pkg" / "index.js").write_text("")
+
+
+def test_index_single_walk(tmp_path):
+    _make_tree(tmp_path)
+    (tmp_path / "internal").mkdir()
+    (tmp_path / "internal" / "db.go").write_text("package internal\n")
+    index = FileIndex.build(tmp_path)
+
+    assert index.files(tmp_path) == [tmp_path / "go.mod"]
+    # vendor and node_modules are pruned by the default ignore rules
+    assert {d.name for d in index.dirs(tmp_path)} == {"cmd", "internal"}
+    assert not index.covers(tmp_path / "node_modules")
+    assert sorted(index.rglob(tmp_path, "*.go")) == [
+        tmp_path / "cmd" / "main.go",
+        tmp_path / "internal" / "db.go",
+    ]
+    walked = list(index.walk(tmp_path, dir_filter=lambda d: d.name != "internal"))
+    assert sorted(walked) == [tmp_path / "cmd" / "main.go", tmp_path / "go.mod"]
+
+
+def test_index_prunes_gitignored_dirs(tmp_path):
+    _make_tree(tmp_path)
+    (tmp_path / ".gitignore").write_text("/cmd/gen*/\n*.log\n")
+    (tmp_path / ".larekignore").write_text("fixtures/\n")
+    for d in ("cmd/generated", "cmd/api", "testdata/fixtures", "app/gen"):
+        (tmp_path / d).mkdir(parents=True)
+        (tmp_path / d / "main.go").write_text("package main\n")
+    (tmp_path / "app" / ".gitignore").write_text("*\n!gen/\n")
+    (tmp_path / "app" / "debug.log").write_text("")
+
+    index = FileIndex.build(tmp_path)
+
+    assert index.covers(tmp_path / "cmd" / "api")
+    assert not index.covers(tmp_path / "cmd" / "generated")
+    assert not index.covers(tmp_path / "testdata" / "fixtures")
+    assert index.covers(tmp_path / "app" / "gen")
+    # file-level rules never hide files such as .env or logs from analyzers
+    assert tmp_path / "app" / "debug.log" in index.files(tmp_path / "app")
+
+
+def test_analyzer_uses_shared_index(tmp_path):
+    _make_tree(tmp_path)
+    index = FileIndex.build(tmp_path)
+    analyzer = GoAnalyzer()
+    analyzer.index = index
+
+    service = analyzer.analyze(tmp_path)
+
+    assert analyzer.index is index
+    assert service is not None
+    assert service.entrypoints == [str(tmp_path / "cmd" / "main.go")]
+
+
+def test_index_from_git_lists_only_tracked_files(tmp_path):
+    _make_tree(tmp_path)
+    subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)
+    subprocess.run(["git", "-C", str(tmp_path), "add", "go.mod", "cmd"], check=True)
+    (tmp_path / "cmd" / "generated.go").write_text("package main\n")
+
+    index = FileIndex.from_git(tmp_path)
+
+    assert index is not None
+    assert sorted(index.walk(tmp_path)) == [
+        tmp_path / "cmd" / "main.go",
+        tmp_path / "go.mod",
+    ]
+    assert FileIndex.collect(tmp_path / "vendor", use_git=True).files(
+        tmp_path / "vendor" / "lib"
+    ) == [tmp_path / "vendor" / "lib" / "main.go"]
+
+
+def test_index_order_is_the_same_for_walk_and_git(tmp_path):
+    for rel in ("a0/x.go", "a.txt", "a/y.go", "B/z.go", "go.mod"):
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text("")
+    tracked = [
+        (tuple(p.split("/")), False)
+        for p in sorted(["a0/x.go", "a.txt", "a/y.go", "B/z.go", "go.mod"])
+    ]
+
+    walked = list(FileIndex.build(tmp_path).walk(tmp_path))
+    assert walked == list(FileIndex.from_tracked(tmp_path, tracked).walk(tmp_path))
+    assert [p.relative_to(tmp_path).as_posix() for p in walked] == [
+        "B/z.go",
+        "a/y.go",
+        "a.txt",
+        "a0/x.go",
+        "go.mod",
+    ]
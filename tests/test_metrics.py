@@ -0,0 +1,38 @@
+import itertools
+
+import pandas as pd
+
+import metrics
+
+
+def test_score_matches_calculate_metrics():
+    rows = [
+        {"tp": tp, "fp": fp, "fn": fn}
+        for tp, fp, fn in itertools.product(range(3), repeat=3)
+    ]
+
+    scored = metrics.score(pd.DataFrame(rows))
+
+    for row, (_, got) in zip(rows, scored.iterrows()):
+        expected = metrics.calculate_metrics(
+            set(range(row["tp"] + row["fn"])),
+            set(range(row["fn"], row["fn"] + row["tp"] + row["fp"])),
+        )
+        for key, value in expected.items():
+            assert got[key] == value
+
+
+def test_expected_sets_single_walk(tmp_path):
+    repo = tmp_path / "go" / "svc"
+    (repo / "cmd").mkdir(parents=True)
+    (repo / "Dockerfile").write_text("FROM scratch\n")
+    (repo / "config.yaml").write_text("a: 1\n")
+    (repo / "report.yaml").write_text("")
+    (repo / "cmd" / "main.go").write_text("package main\n")
+
+    expected = metrics.expected_sets(repo)
+
+    assert expected["language"] == {"go"}
+    assert expected["dockerfile"] == {str(repo / "Dockerfile")}
+    assert expected["config"] == {str(repo / "config.yaml")}
+    assert expected["entrypoint"] == {str(repo / "cmd" / "main.go")}
@@ -0,0 +1,114 @@
+import os
+from pathlib import Path
+
+import pydantic_yaml
+import yaml
+
+from larek.models import (
+    Config,
+    Dependencies,
+    Docker,
+    Environment,
+    Language,
+    Lib,
+    RepoSchema,
+    Service,
+    libs_from,
+)
+from larek.models import serialize
+from larek.models.serialize import (
+    read_build_file,
+    sidecar_path,
+    to_yaml_str,
+    write_yaml_file,
+)
+
+
+def test_libs_from_matches_validated_models():
+    specs = [("a", "1.0"), ("b", None)]
+    libs = libs_from(specs)
+    assert libs == [Lib(name=n, version=v) for n, v in specs]
+    assert all(lib.model_fields_set == {"name", "version"} for lib in libs)
+
+    deps = Dependencies(packet_manager="pip", libs=libs_from(iter([("a", None)])))
+    assert deps.model_dump() == {
+        "packet_manager": "pip",
+        "libs": [{"name": "a", "version": None}],
+    }
+
+
+def _schema() -> RepoSchema:
+    return RepoSchema(
+        is_monorepo=False,
+        deployment=None,
+        services=[
+            Service(
+                path=Path("svc"),
+                name="svc",
+                lang=Language(name="python", version="3.11"),
+                dependencies=Dependencies(
+                    packet_manager="pip",
+                    libs=[
+                        Lib(name="ёж 🚀", version="1.0"),
+                        Lib(name="x" * 200, version=None),
+                    ],
+                ),
+                configs=[Config(name="a: b", path="svc/#c.yaml")],
+                docker=Docker(
+                    dockerfiles=["svc/Dockerfile"],
+                    environment=[Environment(name=".env", path="svc/.env")],
+                ),
+                tests="pytest",
+            )
+        ],
+    )
+
+
+def test_yaml_matches_pydantic_yaml_round_trip():
+    schema = _schema()
+    legacy = yaml.dump(
+        yaml.safe_load(pydantic_yaml.to_yaml_str(schema)),
+        default_flow_style=False,
+        width=10000,
+        allow_unicode=True,
+        sort_keys=False,
+    )
+    assert to_yaml_str(schema) == legacy
+
+
+def test_build_file_loads_from_matching_sidecar(tmp_path, monkeypatch):
+    monkeypatch.setattr(serialize, "SIDECAR_DIR", tmp_path / "sidecars")
+    schema = _schema()
+    build = tmp_path / "repo" / "build.yaml"
+    build.parent.mkdir()
+    write_yaml_file(build, schema)
+    # nothing but build.yaml lands in the repository
+    assert [p.name for p in build.parent.iterdir()] == ["build.yaml"]
+    assert sidecar_path(build).parent == tmp_path / "sidecars"
+    assert read_build_file(build) == schema
+
+    # a sidecar whose hash matches is trusted as is
+    header, _, body = sidecar_path(build).read_bytes().partition(b"\n")
+    sidecar_path(build).write_bytes(header + b"\n" + body.replace(b'"svc"', b'"other"'))
+    assert read_build_file(build).services[0].name == "other"
+
+    # editing the YAML invalidates it
+    build.write_text(build.read_text().replace("name: svc", "name: edited"))
+    assert read_build_file(build).services[0].name == "edited"
+    assert b'"edited"' in sidecar_path(build).read_bytes()
+
+
+def test_sidecars_beyond_the_limit_are_evicted(tmp_path, monkeypatch):
+    monkeypatch.setattr(serialize, "SIDECAR_DIR", tmp_path / "sidecars")
+    monkeypatch.setattr(serialize, "SIDECAR_LIMIT", 2)
+    builds = [tmp_path / f"{name}.build.yaml" for name in ("a", "b", "c")]
+    for age, build in enumerate(builds[:2]):
+        write_yaml_file(build, _schema())
+        os.utime(sidecar_path(build), ns=(age, age))
+    write_yaml_file(builds[2], _schema())
+
+    assert not sidecar_path(builds[0]).exists()
+    assert sidecar_path(builds[1]).exists() and sidecar_path(builds[2]).exists()
+
+    serialize.clear_sidecars()
+    assert not (tmp_path / "sidecars").exists()
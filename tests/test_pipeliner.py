@@ -1,5 +1,18 @@
+import os
+import subprocess
 from pathlib import Path
-from larek.models.repo import Service, Language, Dependencies, Lib
+
+import yaml
+
+from larek.models.repo import (
+    Config,
+    Dependencies,
+    Docker,
+    Language,
+    Lib,
+    RepoSchema,
+    Service,
+)
 from larek.pipeliner import PipelineComposer
 
 
@@ -244,6 +257,162 @@ def test_node_pipeline_with_docker():
     assert "express-app" in pipeline
 
 
+def _monorepo_schema(tmp_path):
+    def service(name, lang, **kwargs):
+        return Service(
+            path=tmp_path / name,
+            name=name,
+            lang=Language(name=lang, version="3.11" if lang == "python" else "20"),
+            dependencies=Dependencies(packet_manager="pip", libs=[]),
+            docker=Docker(environment=[], **kwargs.pop("docker", {})),
+            tests="pytest",
+            **kwargs,
+        )
+
+    return RepoSchema(
+        is_monorepo=True,
+        deployment=None,
+        root=tmp_path,
+        services=[
+            service(
+                "api",
+                "python",
+                configs=[
+                    Config(name="app.yaml", path=str(tmp_path / "shared/app.yaml"))
+                ],
+                docker={"dockerfiles": [str(tmp_path / "docker/api.Dockerfile")]},
+            ),
+            service("web", "javascript"),
+        ],
+    )
+
+
+def test_monorepo_jobs_run_on_service_changes(tmp_path):
+    schema = _monorepo_schema(tmp_path)
+    pipeline = yaml.safe_load(PipelineComposer().generate_from_schema(schema))
+
+    assert pipeline[".api-changes"]["rules"] == [
+        {"if": "$CI_COMMIT_TAG"},
+        {"if": "$CI_COMMIT_BRANCH == $CI_DEFAULT_BRANCH"},
+        {
+            "changes": [
+                "api/**/*",
+                "docker/api.Dockerfile",
+                "shared/app.yaml",
+                ".gitlab-ci.yml",
+            ]
+        },
+    ]
+    assert pipeline[".web-changes"]["rules"][2] == {
+        "changes": ["web/**/*", ".gitlab-ci.yml"]
+    }
+    assert pipeline["api:test"]["rules"] == pipeline[".api-changes"]["rules"]
+
+
+def test_monorepo_jobs_chain_within_service(tmp_path):
+    schema = _monorepo_schema(tmp_path)
+    pipeline = yaml.safe_load(PipelineComposer().generate_from_schema(schema))
+    jobs = {name: job for name, job in pipeline.items() if ":" in name}
+
+    assert jobs["api:test"]["needs"] == []
+    # python services have no build job, their image waits for tests
+    assert jobs["api:docker"]["needs"] == ["api:test"]
+    assert jobs["web:build"]["needs"] == ["web:test"]
+    for name, job in jobs.items():
+        service = name.split(":")[0]
+        for need in job["needs"]:
+            assert need in jobs and need.startswith(f"{service}:")
+
+
+def test_monorepo_caches_keyed_on_lockfiles(tmp_path):
+    schema = _monorepo_schema(tmp_path)
+    schema.services[0].lockfiles = ["requirements.txt"]
+    pipeline = yaml.safe_load(PipelineComposer().generate_from_schema(schema))
+
+    assert pipeline["api:lint"]["cache"]["key"] == {
+        "files": ["api/requirements.txt"],
+        "prefix": "api",
+    }
+    assert pipeline["api:lint"]["cache"]["policy"] == "pull"
+    assert pipeline["api:test"]["cache"]["policy"] == "pull-push"
+    # no lockfile yet: the branch key stays
+    assert pipeline["web:test"]["cache"]["key"] == "${CI_COMMIT_REF_SLUG}-web"
+    assert pipeline["web:build"]["cache"]["policy"] == "pull"
+
+
+def test_single_service_cache_keyed_on_lockfile(tmp_path):
+    service = Service(
+        path=tmp_path,
+        name="python-service",
+        lang=Language(name="python", version="3.11"),
+        dependencies=Dependencies(packet_manager="poetry", libs=[]),
+        docker=Docker(environment=[]),
+        tests="pytest",
+        lockfiles=["poetry.lock"],
+    )
+    pipeline = yaml.safe_load(PipelineComposer().get_pipeline(service))
+
+    cache = pipeline[".python-cache"]["cache"]
+    assert cache["key"] == {"files": ["poetry.lock"], "prefix": "python"}
+    assert cache["policy"] == "pull"
+    assert pipeline[".python-cache-push"]["cache"]["policy"] == "pull-push"
+    assert pipeline["test"]["cache"]["policy"] == "pull-push"
+    assert pipeline["lint"]["cache"]["policy"] == "pull"
+
+
+def test_monorepo_docker_jobs_use_registry_layer_cache(tmp_path):
+    schema = _monorepo_schema(tmp_path)
+    pipeline = yaml.safe_load(PipelineComposer().generate_from_schema(schema))
+    script = "\n".join(pipeline["api:docker"]["script"])
+
+    assert "docker buildx build" in script
+    assert 'CACHE="${NEXUS_REGISTRY}/api-cache"' in script
+    assert "type=registry,ref=${CACHE}:${CI_COMMIT_REF_SLUG},mode=max" in script
+    # branches fall back to the cache of the default branch
+    assert "--cache-from \"type=registry,ref=${CACHE}:${DEFAULT_REF_SLUG}\"" in script
+
+
+def test_docker_registry_is_insecure_only_on_request(tmp_path):
+    service = Service(
+        path=tmp_path,
+        name="api",
+        lang=Language(name="python", version="3.11"),
+        dependencies=Dependencies(packet_manager="pip", libs=[]),
+        docker=Docker(environment=[], dockerfiles=["Dockerfile"]),
+        tests="pytest",
+    )
+    pipeline = yaml.safe_load(PipelineComposer().get_pipeline(service))
+    setup = next(
+        line
+        for line in pipeline[".docker-build"]["before_script"]
+        if "buildx create" in line
+    )
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    (bin_dir / "docker").write_text('#!/bin/sh\necho "$@" > docker.args\n')
+    (bin_dir / "docker").chmod(0o755)
+
+    def run(**env):
+        for name in ("docker.args", "buildkitd.toml"):
+            (tmp_path / name).unlink(missing_ok=True)
+        env = {
+            "PATH": f"{bin_dir}{os.pathsep}{os.environ['PATH']}",
+            "NEXUS_REGISTRY": "nexus.local:8443",
+            **env,
+        }
+        subprocess.run(["sh", "-c", setup], cwd=tmp_path, env=env, check=True)
+        return (tmp_path / "docker.args").read_text()
+
+    # TLS is verified unless the registry is explicitly marked insecure
+    assert "--config" not in run()
+    assert not (tmp_path / "buildkitd.toml").exists()
+
+    assert "--config buildkitd.toml" in run(NEXUS_INSECURE="true")
+    assert (tmp_path / "buildkitd.toml").read_text() == (
+        '[registry."nexus.local:8443"]\n  http = true\n  insecure = true\n'
+    )
+
+
 if __name__ == "__main__":
     try:
         test_go_pipeline()
@@ -0,0 +1,110 @@
+import json
+import subprocess
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import gitlab
+
+from larek.analyzer import python, remote, repo
+
+
+def _git(cwd, *args):
+    res = subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+    return res.stdout
+
+
+def _make_repo(path):
+    (path / "api").mkdir(parents=True)
+    (path / "api" / "requirements.txt").write_text("flask==3.0\n")
+    (path / "api" / "main.py").write_text('if __name__ == "__main__":\n    run()\n')
+    (path / "api" / "model.bin").write_bytes(b"\0" * 4096)
+    (path / "Dockerfile").write_text("FROM python:3.12\n")
+    _git(path, "init", "-q", "-b", "main")
+    _git(path, "add", ".")
+    _git(path, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qm", "init")
+
+
+def _serve(checkout):
+    """A stand-in for the GitLab API serving the HEAD tree of checkout."""
+    tree = []
+    for line in _git(checkout, "ls-tree", "-r", "-t", "HEAD").decode().splitlines():
+        meta, path = line.split("\t")
+        mode, kind, sha = meta.split()
+        tree.append(
+            {
+                "id": sha,
+                "name": path.split("/")[-1],
+                "type": kind,
+                "path": path,
+                "mode": mode,
+            }
+        )
+    raw_requests = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _send(self, body, headers=()):
+            self.send_response(200)
+            for key, value in headers:
+                self.send_header(key, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = parse_qs(url.query)
+            if url.path == "/api/v4/projects/1":
+                project = {"id": 1, "path": "svc", "default_branch": "main"}
+                self._send(
+                    json.dumps(project).encode(),
+                    [("Content-Type", "application/json")],
+                )
+            elif url.path == "/api/v4/projects/1/repository/tree":
+                per_page = int(query["per_page"][0])
+                page = int(query.get("page", ["1"])[0])
+                items = tree[(page - 1) * per_page : page * per_page]
+                headers = [("Content-Type", "application/json")]
+                if page * per_page < len(tree):
+                    next_url = (
+                        f"http://{self.headers['Host']}{url.path}?recursive=True"
+                        f"&ref=main&per_page={per_page}&page={page + 1}"
+                    )
+                    headers.append(("Link", f'<{next_url}>; rel="next"'))
+                self._send(json.dumps(items).encode(), headers)
+            elif url.path.endswith("/raw"):
+                sha = url.path.split("/")[-2]
+                raw_requests.append(sha)
+                self._send(_git(checkout, "cat-file", "blob", sha))
+            else:
+                self.send_error(404)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, raw_requests
+
+
+def test_analyze_gitlab_fetches_needed_blobs_once(tmp_path, monkeypatch):
+    _make_repo(tmp_path / "svc")
+    server, raw_requests = _serve(tmp_path / "svc")
+    monkeypatch.setattr(remote, "TREE_PAGE_SIZE", 2)
+    gl = gitlab.Gitlab(f"http://127.0.0.1:{server.server_port}", private_token="t")
+    analyzer = repo.RepoAnalyzer(use_git_index=True)
+    analyzer.register_analyzer(python.PythonAnalyze)
+    cache = remote.BlobCache(tmp_path / "blobs")
+
+    try:
+        source = remote.GitLabSource(gl, 1, cache=cache)
+        schema = analyzer.analyze_gitlab(source, tmp_path / "svc")
+        again = remote.GitLabSource(gl, 1, cache=cache)
+        analyzer.analyze_gitlab(again, tmp_path / "svc")
+    finally:
+        server.shutdown()
+
+    assert schema == analyzer.analyze(tmp_path / "svc")
+    # main.py and requirements.txt; model.bin and the Dockerfile are never read
+    assert source.blobs_fetched == len(raw_requests) == 2
+    assert again.blobs_fetched == 0 and again.blobs_cached == 2
@@ -0,0 +1,166 @@
+from pathlib import Path
+
+from larek.analyzer import go, javascript, kotlin, python
+from larek.analyzer.repo import RepoAnalyzer
+
+
+def _make_monorepo(root: Path) -> None:
+    for name in ("billing", "auth", "gateway"):
+        svc = root / name
+        (svc / "cmd").mkdir(parents=True)
+        (svc / "go.mod").write_text(f"module {name}\n\ngo 1.22\n")
+        (svc / "cmd" / "main.go").write_text("package main\n")
+    web = root / "web"
+    web.mkdir()
+    (web / "package.json").write_text('{"scripts": {"test": "jest"}}')
+    tools = root / "tools"
+    tools.mkdir()
+    (tools / "requirements.txt").write_text("requests==2.0\n")
+
+
+def _analyzer(max_workers=None) -> RepoAnalyzer:
+    repo_analyzer = RepoAnalyzer(max_workers=max_workers)
+    repo_analyzer.register_analyzer(go.GoAnalyzer)
+    repo_analyzer.register_analyzer(javascript.JavaScriptAnalyzer)
+    repo_analyzer.register_analyzer(python.PythonAnalyze)
+    return repo_analyzer
+
+
+def test_parallel_analysis_matches_serial(tmp_path):
+    _make_monorepo(tmp_path)
+
+    serial = _analyzer().analyze(tmp_path)
+    parallel = _analyzer(max_workers=4).analyze(tmp_path)
+
+    assert serial.is_monorepo
+    assert len(serial.services) == 5
+    assert parallel.model_dump() == serial.model_dump()
+
+
+def test_analysis_cache_reuses_unchanged_files(tmp_path):
+    _make_monorepo(tmp_path)
+    (tmp_path / "tools" / "main.py").write_text("if __name__ == '__main__':\n    pass\n")
+
+    first = _analyzer()
+    first.use_cache = True
+    cold = first.analyze(tmp_path)
+    assert (tmp_path / ".larek" / "cache" / "analysis.json").exists()
+    assert (tmp_path / ".larek" / "cache" / ".gitignore").read_text() == "*\n"
+    assert first.cache.misses > 0
+
+    second = _analyzer()
+    second.use_cache = True
+    warm = second.analyze(tmp_path)
+    assert second.cache.misses == 0
+    assert warm.model_dump() == cold.model_dump()
+    assert warm.model_dump() == _analyzer().analyze(tmp_path).model_dump()
+
+    (tmp_path / "tools" / "main.py").write_text("print('no longer an entrypoint')\n")
+    third = _analyzer()
+    third.use_cache = True
+    edited = third.analyze(tmp_path)
+    # only the edited file is re-read: its window for the entrypoint
+    # probes and its whole text for the syntax probes
+    assert third.cache.misses == 2
+    tools = next(s for s in edited.services if s.name == "tools")
+    assert tools.entrypoints == []
+
+
+def test_services_record_their_lockfiles(tmp_path):
+    _make_monorepo(tmp_path)
+    (tmp_path / "billing" / "go.sum").write_text("")
+
+    schema = _analyzer().analyze(tmp_path)
+
+    # in order of preference, for the cache keys of the generated pipeline
+    assert {s.name: s.lockfiles for s in schema.services} == {
+        "billing": ["go.sum", "go.mod"],
+        "auth": ["go.mod"],
+        "gateway": ["go.mod"],
+        "web": [],
+        "tools": ["requirements.txt"],
+    }
+
+
+def test_detect_skips_analyzers_without_manifest(tmp_path):
+    _make_monorepo(tmp_path)
+    created = []
+
+    class TrackingKotlin(kotlin.KotlinAnalyzer):
+        def __init__(self) -> None:
+            created.append(self)
+            super().__init__()
+
+    repo_analyzer = _analyzer()
+    repo_analyzer.register_analyzer(TrackingKotlin)
+    schema = repo_analyzer.analyze(tmp_path)
+
+    assert len(schema.services) == 5
+    assert created == []
+
+
+def test_nested_services_are_discovered_at_any_depth(tmp_path):
+    for name in ("billing", "auth"):
+        api = tmp_path / "services" / name / "api"
+        api.mkdir(parents=True)
+        (api / "go.mod").write_text(f"module {name}\n\ngo 1.22\n")
+        (api / "main.go").write_text("package main\n")
+    web = tmp_path / "apps" / "web"
+    (web / "e2e").mkdir(parents=True)
+    (web / "package.json").write_text('{"scripts": {"test": "jest"}}')
+    (web / "e2e" / "package.json").write_text('{"scripts": {"test": "playwright"}}')
+
+    schema = _analyzer().analyze(tmp_path)
+
+    assert schema.is_monorepo
+    # the topmost manifest owns its subtree: apps/web/e2e is part of web
+    assert {s.name: s.path for s in schema.services} == {
+        "services-billing-api": tmp_path / "services" / "billing" / "api",
+        "services-auth-api": tmp_path / "services" / "auth" / "api",
+        "web": web,
+    }
+    # services come in path order whatever order the filesystem lists them in
+    assert [s.name for s in schema.services] == [
+        "web",
+        "services-auth-api",
+        "services-billing-api",
+    ]
+    parallel = _analyzer(max_workers=3).analyze(tmp_path)
+    assert parallel.model_dump() == schema.model_dump()
+
+
+def test_parallel_analysis_skips_manifests_inside_services(tmp_path):
+    svc = tmp_path / "svc"
+    (svc / "testdata" / "mod").mkdir(parents=True)
+    (svc / "go.mod").write_text("module svc\n\ngo 1.22\n")
+    (svc / "main.go").write_text("package main\n")
+    # a fixture manifest the Go analyzer rejects: never analyzed inside svc
+    (svc / "testdata" / "mod" / "go.mod").write_text("module broken\n")
+    other = tmp_path / "other"
+    other.mkdir()
+    (other / "go.mod").write_text("module other\n\ngo 1.22\n")
+    (other / "main.go").write_text("package main\n")
+
+    serial = _analyzer().analyze(tmp_path)
+    parallel = _analyzer(max_workers=4).analyze(tmp_path)
+
+    assert [s.name for s in serial.services] == ["other", "svc"]
+    assert parallel.model_dump() == serial.model_dump()
+
+
+def test_profile_reports_analyzers_phases_and_files(tmp_path):
+    _make_monorepo(tmp_path)
+    (tmp_path / "tools" / "main.py").write_text("if __name__ == '__main__':\n    pass\n")
+    repo_analyzer = _analyzer()
+    repo_analyzer.profile = True
+
+    repo_analyzer.analyze(tmp_path)
+    report = repo_analyzer.profiler.report()
+
+    assert report["analyzers"]["GoAnalyzer"]["calls"] == 3
+    assert {"index", "walk", "manifest", "probes", "version"} <= set(report["phases"])
+    assert report["phases"]["walk"]["files"] > 0
+    assert report["analyzers"]["PythonAnalyze"]["bytes_read"] > 0
+    assert report["slowest_files"]
+    repo_analyzer.profiler.write_json(tmp_path / "profile.json")
+    assert (tmp_path / "profile.json").exists()
@@ -0,0 +1,72 @@
+from larek.analyzer.probes import ProbeSet
+from larek.analyzer.python import SYNTAX_PROBES, PythonAnalyze
+from larek.analyzer.sniff import ContentSniffer
+
+
+def test_sniffer_reads_bounded_window(tmp_path):
+    big = tmp_path / "generated_pb2.py"
+    big.write_bytes(
+        b"import x\n" + b"# padding\n" * 100_000 + b"if __name__ == '__main__':\n"
+    )
+    sniffer = ContentSniffer(head=1024, tail=1024)
+
+    data = sniffer.window(big)
+
+    assert data is not None and data.startswith(b"import x")
+    assert b"__main__" in data
+    assert sniffer.bytes_read == len(data) < big.stat().st_size // 100
+
+
+def test_sniffer_skips_binary_and_maps_large_files(tmp_path):
+    blob = tmp_path / "model.bin"
+    blob.write_bytes(b"public static void main\0" * 10)
+    source = tmp_path / "Main.java"
+    source.write_bytes(
+        b"class Main {\n" + b"  // x\n" * 50_000 + b"  public static void main() {}\n}"
+    )
+    sniffer = ContentSniffer(mmap_threshold=4096)
+
+    assert not sniffer.contains(blob, b"public static void main", full=True)
+    assert sniffer.contains(source, b"public static void main", full=True)
+    assert sniffer.binary_skipped == 1
+    assert sniffer.bytes_mapped == source.stat().st_size
+    assert sniffer.bytes_read == 0
+
+
+def test_python_entrypoint_uses_sniffer(tmp_path):
+    (tmp_path / "requirements.txt").write_text("")
+    (tmp_path / "main.py").write_text('if __name__ == "__main__":\n    run()\n')
+    (tmp_path / "lib.py").write_text("def helper():\n    pass\n")
+    analyzer = PythonAnalyze()
+
+    service = analyzer.analyze(tmp_path)
+
+    assert service.entrypoints == [str(tmp_path / "main.py")]
+    assert analyzer.sniffer.files_read > 0
+
+
+def test_probe_set_reports_all_hits():
+    probes = ProbeSet(
+        literals={"walrus": [b":="], "guard": [b"__main__"]},
+        patterns={
+            "union": (rb"\w\s*\|\s*\w", b"|"),
+            "match": (rb"\bmatch\b", b"match"),
+        },
+    )
+
+    assert probes.scan(b"if (n := x | y):\n    pass\n") == {"walrus", "union"}
+    assert probes.scan(b"x = a || b  # __main__") == {"guard"}
+
+
+def test_python_syntax_features_are_found_past_the_window(tmp_path):
+    module = tmp_path / "big.py"
+    module.write_bytes(
+        b"import x\n"
+        + b"# padding\n" * 20_000
+        + b"try:\n    pass\nexcept* ValueError:\n    pass\n"
+        + b"# padding\n" * 20_000
+    )
+    analyzer = PythonAnalyze()
+
+    assert analyzer._sniffer().scan(module, SYNTAX_PROBES) == set()
+    assert analyzer._syntax_features(module) == {"exception_group"}
@@ -0,0 +1,45 @@
+import threading
+
+import pytest
+
+from larek.utils.stages import Stage, StageGraph
+
+
+def test_independent_stages_overlap_and_pass_results():
+    # both branches must be inside their stage at once to get past the barrier
+    barrier = threading.Barrier(2, timeout=5)
+
+    def branch(value):
+        barrier.wait()
+        return value
+
+    graph = StageGraph(
+        [
+            Stage("source", lambda: 2),
+            Stage("double", lambda x: branch(x * 2), needs=("source",)),
+            Stage("square", lambda x: branch(x * x), needs=("source",)),
+            Stage("sum", lambda a, b: a + b, needs=("double", "square")),
+        ]
+    )
+    assert graph.run()["sum"] == 8
+    assert set(graph.timings) == {"source", "double", "square", "sum"}
+
+
+def test_failed_stage_stops_dependents():
+    ran = []
+
+    def fail():
+        raise RuntimeError("boom")
+
+    graph = StageGraph(
+        [
+            Stage("fail", fail),
+            Stage("after", lambda _: ran.append("after"), needs=("fail",)),
+        ]
+    )
+    with pytest.raises(RuntimeError, match="boom"):
+        graph.run()
+    assert ran == []
+
+    with pytest.raises(ValueError):
+        StageGraph([Stage("a", lambda _: None, needs=("b",))])
@@ -0,0 +1,21 @@
+from larek.composer.builder import Composer
+from larek.pipeliner.builder import PipelineComposer
+from larek.utils import templates
+
+
+def test_generators_share_one_environment_with_bytecode_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(templates, "BYTECODE_CACHE_DIR", tmp_path / "jinja")
+    templates._environment.cache_clear()
+    try:
+        pipeliner = PipelineComposer()
+        composer = Composer()
+        envs = {id(pipeliner.env)}
+        envs |= {id(b.env) for b in pipeliner.builders.values()}
+        envs |= {id(b.env) for b in composer.builders.values()}
+        assert len(envs) == 1
+
+        pipeliner.env.get_template("python.gitlab-ci.yml.j2")
+        composer.builders["go"].env.get_template("go.dockerfile.j2")
+        assert len(list((tmp_path / "jinja").iterdir())) == 2
+    finally:
+        templates._environment.cache_clear()